@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
 
+from sqlalchemy import Select, and_, case, func, select
+
+from .logic import as_utc
 from .models import Todo, TodoPriority, TodoStatus
 
+# Espacios que str.strip() saca y que replicamos en SQL con trim()
+_SQL_WHITESPACE = " \t\n\r\x0b\x0c"
+
 
 def _normalize_title(title: str) -> str:
     """Normalización simple para clasificar por longitud."""
@@ -38,7 +44,7 @@ def classify_title_length(title: str) -> str:
     return "long"
 
 
-def compute_advanced_stats(todos: Iterable[Todo]) -> Dict[str, int]:
+def compute_advanced_stats(todos: Iterable[Todo], now: Optional[datetime] = None) -> Dict[str, int]:
     """
     Calcula estadísticas avanzadas a partir de una colección de Todo.
 
@@ -56,8 +62,10 @@ def compute_advanced_stats(todos: Iterable[Todo]) -> Dict[str, int]:
     - title_long
     - high_priority
     - overdue (tiene due_date pasada y NO está done)
+
+    `now` fija el corte de overdue (por defecto, la hora actual).
     """
-    now = datetime.now(timezone.utc)
+    now = as_utc(now) if now is not None else datetime.now(timezone.utc)
 
     total = 0
     pending = 0
@@ -107,10 +115,7 @@ def compute_advanced_stats(todos: Iterable[Todo]) -> Dict[str, int]:
         # Overdue: due_date pasada y no done
         if todo.due_date is not None and todo.status != TodoStatus.done:
             # due_date podría no tener tz; lo normalizamos para comparar
-            due_date = todo.due_date
-            if due_date.tzinfo is None:
-                due_date = due_date.replace(tzinfo=timezone.utc)
-            if due_date < now:
+            if as_utc(todo.due_date) < now:
                 overdue += 1
 
     return {
@@ -126,3 +131,85 @@ def compute_advanced_stats(todos: Iterable[Todo]) -> Dict[str, int]:
         "high_priority": high_priority,
         "overdue": overdue,
     }
+
+
+# --- Versión SQL ---
+#
+# Mismas reglas que compute_advanced_stats, pero resueltas por la DB en un
+# único SELECT agregado. compute_advanced_stats queda como referencia y los
+# tests comparan ambos resultados.
+
+
+def _sql_strip(expr):
+    return func.trim(func.coalesce(expr, ""), _SQL_WHITESPACE)
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def title_length_bucket_sql(title):
+    """Equivalente SQL de classify_title_length sobre una columna de título."""
+    normalized = _sql_strip(title)
+    length = func.length(normalized)
+    non_space_len = func.length(func.replace(normalized, " ", ""))
+    return case(
+        (length == 0, "short"),
+        # Tiene espacios internos y pocos caracteres "reales"
+        (and_(non_space_len < length, non_space_len <= 11), "short"),
+        (length <= 10, "short"),
+        (length <= 25, "medium"),
+        else_="long",
+    )
+
+
+def overdue_condition(now: datetime):
+    """due_date anterior a `now` y no done. Las due_date sin tz se comparan como UTC.
+
+    Con otro `now` sirve para "vence antes de". Usa el índice parcial
+    ix_todos_open_due_date.
+    """
+    return and_(
+        Todo.due_date.is_not(None),
+        Todo.status != TodoStatus.done,
+        # SQLite guarda la fecha sin tz: el parámetro tiene que ir en UTC
+        Todo.due_date < as_utc(now),
+    )
+
+
+def advanced_stats_query(now: datetime) -> Select:
+    """SELECT que devuelve una fila con las mismas claves que compute_advanced_stats.
+
+    `now` se pasa como parámetro para que el corte de overdue sea el mismo
+    instante que usaría la versión en Python. Las due_date sin tz se
+    comparan como UTC (SQLite las guarda así).
+    """
+    bucket = title_length_bucket_sql(Todo.title)
+    has_description = _sql_strip(Todo.description) != ""
+    return select(
+        func.count().label("total"),
+        _count_if(Todo.status == TodoStatus.pending).label("pending"),
+        _count_if(Todo.status == TodoStatus.in_progress).label("in_progress"),
+        _count_if(Todo.status == TodoStatus.done).label("done"),
+        _count_if(has_description).label("with_description"),
+        _count_if(~has_description).label("without_description"),
+        _count_if(bucket == "short").label("title_short"),
+        _count_if(bucket == "medium").label("title_medium"),
+        _count_if(bucket == "long").label("title_long"),
+        _count_if(Todo.priority == TodoPriority.high).label("high_priority"),
+        _count_if(overdue_condition(now)).label("overdue"),
+    ).select_from(Todo)
+
+
+def compute_advanced_stats_sql(db, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Ejecuta advanced_stats_query sobre una Session o Connection."""
+    now = now or datetime.now(timezone.utc)
+    row = db.execute(advanced_stats_query(now)).mappings().one()
+    return {key: int(value) for key, value in row.items()}
+
+
+def count_overdue(db, now: Optional[datetime] = None) -> int:
+    """Cantidad de TODOs overdue, con el mismo criterio que compute_advanced_stats."""
+    now = now or datetime.now(timezone.utc)
+    stmt = select(func.count()).select_from(Todo).where(overdue_condition(now))
+    return int(db.execute(stmt).scalar())
@@ -0,0 +1,160 @@
+"""Piezas compartidas por las rutas de TODOs.
+
+Las usan tanto las rutas sync de `main.py` como las async de
+`async_routes.py`, para que ambas respondan exactamente igual.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Literal, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from .advanced_stats import as_utc
+from .schemas import TODO_FIELDS, BatchUpdateIn
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Tope de `limit` en los endpoints paginados
+MAX_PAGE_SIZE = 500
+# Tope de items por request en POST /api/todos/bulk
+MAX_BULK_SIZE = 1000
+# Filas por lote al leer para /api/todos/export
+EXPORT_BATCH_SIZE = 1000
+# Registros por commit en /api/todos/import (default)
+IMPORT_CHUNK_SIZE = 500
+
+# Valores de `sort` en /api/todos/search (ver logic.SEARCH_SORTS)
+SearchSort = Literal["relevance", "id", "-id", "due_date", "-due_date"]
+
+# Respuestas de listados que no pasan por response_model. Sin orjson se
+# usa el JSONResponse de siempre: mismo JSON, sólo que más lento.
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+_todo_values = attrgetter(*TODO_FIELDS)
+
+_TITLE_ERRORS = {
+    "empty": "title must not be empty",
+    "duplicate": "title must be unique",
+}
+
+
+def title_error(error: ValueError) -> HTTPException:
+    """Traduce los códigos de las reglas de alta ("empty"/"duplicate") a un 400."""
+    detail = _TITLE_ERRORS.get(str(error))
+    if detail is None:
+        raise error
+    return HTTPException(status_code=400, detail=detail)
+
+
+def parse_fields(fields: str | None) -> list[str] | None:
+    """Parsea `fields=id,title` validando contra los campos de TodoOut."""
+    if fields is None:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(TODO_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown fields: {', '.join(sorted(unknown))}",
+        )
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must not be empty")
+    return [f for f in TODO_FIELDS if f in requested]
+
+
+def projection_columns(selected: list[str]) -> list[str]:
+    """Columnas a leer para una proyección: siempre incluye id (para el cursor)."""
+    return selected if "id" in selected else ["id", *selected]
+
+
+def _id_cursor(row: Any) -> str:
+    return str(row["id"] if isinstance(row, dict) else row.id)
+
+
+def split_page(
+    rows: Sequence[Any], limit: int | None, cursor: Callable[[Any], str] = _id_cursor
+) -> tuple[Sequence[Any], dict[str, str]]:
+    """Recorta la fila extra pedida para detectar si hay página siguiente.
+
+    Devuelve las filas de la página y los headers de paginación; `cursor`
+    arma el valor de X-Next-Cursor a partir de la última fila.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, {}
+    rows = rows[:limit]
+    return rows, {"X-Next-Cursor": cursor(rows[-1])}
+
+
+def check_since(since: int | None, after: int | None, limit: int | None) -> None:
+    """`since` devuelve el cambio completo: no se combina con la paginación."""
+    if since is not None and (after is not None or limit is not None):
+        raise HTTPException(status_code=400, detail="since cannot be combined with after or limit")
+
+
+def due_cursor(row: Any) -> str:
+    """Cursor de los listados por vencimiento: "<due_date ISO>,<id>"."""
+    return f"{row.due_date.isoformat()},{row.id}"
+
+
+def parse_due_cursor(value: str | None) -> tuple[datetime, int] | None:
+    if value is None:
+        return None
+    try:
+        due_date, todo_id = value.rsplit(",", 1)
+        return as_utc(datetime.fromisoformat(due_date)), int(todo_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def todos_response(todos: Iterable[Any], headers: dict[str, str] | None = None) -> JSONResponse:
+    """Serializa filas (o objetos) con los campos de TodoOut, sin pasar por Pydantic.
+
+    Para los listados de sólo lectura: las filas vienen de un select() de
+    Core con tipos ya correctos, así que validarlas contra TodoOut y
+    pasarlas por jsonable_encoder sólo agrega costo por fila.
+    """
+    body = [dict(zip(TODO_FIELDS, _todo_values(todo))) for todo in todos]
+    return FastJSONResponse(body, headers=headers)
+
+
+def projected_response(rows: Sequence[dict], selected: list[str], headers: dict[str, str]) -> JSONResponse:
+    """La proyección no cumple TodoOut completo: serializamos a mano."""
+    body = [{f: row[f] for f in selected} for row in rows]
+    return FastJSONResponse(body, headers=headers)
+
+
+def check_bulk_size(count: int) -> None:
+    if count > MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"at most {MAX_BULK_SIZE} todos per request",
+        )
+
+
+def batch_values(payload: BatchUpdateIn) -> dict[str, Any]:
+    """Columnas a asignar en PATCH /api/todos/batch (vacío para toggle)."""
+    check_bulk_size(len(payload.ids))
+    values = payload.model_dump(include={"done", "status", "priority"}, exclude_none=True)
+    if payload.op == "toggle":
+        if values:
+            raise HTTPException(status_code=400, detail="toggle does not take values")
+        return {}
+    if not values:
+        raise HTTPException(status_code=400, detail="nothing to update")
+    return values
+
+
+def bulk_response(results: Sequence[tuple[str, Any]]) -> dict:
+    return {
+        "created": sum(1 for code, _ in results if code == "created"),
+        "results": [
+            {"index": i, "status": code, "todo": todo}
+            for i, (code, todo) in enumerate(results)
+        ],
+    }
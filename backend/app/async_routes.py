@@ -0,0 +1,173 @@
+"""Rutas async de TODOs, sobre AsyncStore.
+
+Mismo contrato que las rutas sync de `main.py` (parámetros, headers de
+paginación y errores), bajo el prefijo /api/async/todos. Los handlers son
+`async def`: con muchas conexiones concurrentes no ocupan un worker del
+threadpool mientras esperan a la DB.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from .api_common import (
+    SearchSort,
+    MAX_PAGE_SIZE,
+    batch_values,
+    bulk_response,
+    check_bulk_size,
+    check_since,
+    due_cursor,
+    parse_due_cursor,
+    parse_fields,
+    projected_response,
+    projection_columns,
+    split_page,
+    title_error,
+    todos_response,
+)
+from .async_store import AsyncStore, get_async_store
+from .logic import is_empty_title, normalize_title
+from .models import TodoPriority, TodoStatus
+from .schemas import BatchUpdateIn, BatchUpdateOut, BulkCreateOut, TodoDueOut, TodoIn, TodoOut
+
+PREFIX = "/api/async/todos"
+
+router = APIRouter(prefix=PREFIX)
+
+
+@router.get("", response_model=list[TodoOut])
+async def list_todos(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(default=None, ge=0),
+    since: int | None = Query(default=None, ge=0),
+    fields: str | None = None,
+    store: AsyncStore = Depends(get_async_store),
+):
+    """Versión async de GET /api/todos."""
+    selected = parse_fields(fields)
+    check_since(since, after, limit)
+    sync = {"X-Sync-Version": str(await store.row_version())}
+    fetch = limit + 1 if limit is not None else None
+
+    if selected is None:
+        rows, headers = split_page(await store.list(after=after, limit=fetch, since=since), limit)
+        return todos_response(rows, {**sync, **headers})
+
+    rows = await store.list_fields(projection_columns(selected), after=after, limit=fetch, since=since)
+    rows, headers = split_page(rows, limit)
+    return projected_response(rows, selected, {**sync, **headers})
+
+
+@router.get("/stats")
+async def todos_stats(store: AsyncStore = Depends(get_async_store)):
+    return await store.stats()
+
+
+@router.get("/stats/advanced")
+async def todos_advanced_stats(store: AsyncStore = Depends(get_async_store)):
+    return await store.advanced_stats()
+
+
+@router.get("/search", response_model=list[TodoOut])
+async def search_todos(
+    q: str | None = None,
+    done: bool | None = None,
+    status: TodoStatus | None = None,
+    priority: TodoPriority | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    sort: SearchSort | None = None,
+    mode: Literal["fts", "substring"] = "substring",
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    store: AsyncStore = Depends(get_async_store),
+):
+    """Versión async de GET /api/todos/search."""
+    fetch = limit + 1 if limit is not None else None
+    todos = await store.search(
+        q=q,
+        done=done,
+        status=status,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after,
+        sort=sort,
+        mode=mode,
+        limit=fetch,
+        offset=offset,
+    )
+    headers = {}
+    if limit is not None and len(todos) > limit:
+        todos = todos[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    return todos_response(todos, headers)
+
+
+@router.get("/overdue", response_model=list[TodoDueOut])
+async def list_overdue(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    store: AsyncStore = Depends(get_async_store),
+):
+    """Versión async de GET /api/todos/overdue."""
+    return await list_due(response, datetime.now(timezone.utc), limit, after, store)
+
+
+@router.get("/due", response_model=list[TodoDueOut])
+async def list_due(
+    response: Response,
+    before: datetime,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    store: AsyncStore = Depends(get_async_store),
+):
+    """Versión async de GET /api/todos/due."""
+    fetch = limit + 1 if limit is not None else None
+    rows = await store.due(before, after=parse_due_cursor(after), limit=fetch)
+    rows, headers = split_page(rows, limit, due_cursor)
+    response.headers.update(headers)
+    return rows
+
+
+@router.patch("/batch", response_model=BatchUpdateOut)
+async def update_todos_batch(payload: BatchUpdateIn, store: AsyncStore = Depends(get_async_store)):
+    values = batch_values(payload)
+    updated, missing = await store.update_many(payload.ids, toggle=payload.op == "toggle", values=values)
+    return {"updated": updated, "missing": missing}
+
+
+@router.patch("/{todo_id}/toggle", response_model=TodoOut)
+async def toggle_todo(todo_id: int, store: AsyncStore = Depends(get_async_store)):
+    todo = await store.toggle(todo_id)
+    if todo is None:
+        raise HTTPException(status_code=404, detail="todo not found")
+    return todo
+
+
+@router.post("", response_model=TodoOut, status_code=201)
+async def create_todo(payload: TodoIn, store: AsyncStore = Depends(get_async_store)):
+    normalized = normalize_title(payload.title)
+    try:
+        if is_empty_title(normalized):
+            raise ValueError("empty")
+        if await store.title_exists(normalized):
+            raise ValueError("duplicate")
+        todo = await store.add(title=normalized, description=payload.description)
+    except ValueError as e:
+        raise title_error(e)
+    return todo
+
+
+@router.post("/bulk", response_model=BulkCreateOut)
+async def create_todos_bulk(payload: list[TodoIn], store: AsyncStore = Depends(get_async_store)):
+    check_bulk_size(len(payload))
+    items = [(normalize_title(item.title), item.description) for item in payload]
+    try:
+        results = await store.add_many(items)
+    except ValueError as e:
+        raise title_error(e)
+    return bulk_response(results)
@@ -0,0 +1,70 @@
+"""Versión async del Store, sobre el engine async de `db.py`.
+
+Expone los mismos métodos que `deps.Store`, pero como corutinas. Para no
+duplicar las consultas, cada método corre el Store sync dentro de
+`AsyncSession.run_sync`: el código es el mismo y el I/O contra la DB lo
+hace el driver async (aiosqlite / asyncpg), sin ocupar un worker del
+threadpool por request.
+
+La exportación en streaming no tiene versión async: ya abre su propia
+conexión y no retiene un worker durante el envío.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db import get_async_sessionmaker
+from .deps import Store
+
+
+class AsyncStore:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return await self.db.run_sync(
+            lambda session: getattr(Store(session), method)(*args, **kwargs)
+        )
+
+    async def list(self, *, after: int | None = None, limit: int | None = None, since: int | None = None):
+        return await self._run("list", after=after, limit=limit, since=since)
+
+    async def list_fields(self, fields: list[str], **page: Any):
+        return await self._run("list_fields", fields, **page)
+
+    async def row_version(self) -> int:
+        return await self._run("row_version")
+
+    async def due(self, before, **kwargs: Any):
+        return await self._run("due", before, **kwargs)
+
+    async def search(self, **filters: Any):
+        return await self._run("search", **filters)
+
+    async def stats(self) -> dict[str, int]:
+        return await self._run("stats")
+
+    async def advanced_stats(self) -> dict[str, int]:
+        return await self._run("advanced_stats")
+
+    async def title_exists(self, title: str) -> bool:
+        return await self._run("title_exists", title)
+
+    async def add(self, title: str, description: str | None = None):
+        return await self._run("add", title=title, description=description)
+
+    async def add_many(self, items: list[tuple[str, str | None]]):
+        return await self._run("add_many", items)
+
+    async def toggle(self, todo_id: int):
+        return await self._run("toggle", todo_id)
+
+    async def update_many(self, ids: list[int], **changes: Any):
+        return await self._run("update_many", ids, **changes)
+
+
+async def get_async_store() -> AsyncGenerator[AsyncStore, None]:
+    async with get_async_sessionmaker()() as db:
+        yield AsyncStore(db)
@@ -0,0 +1,303 @@
+"""Cache de respuestas para los endpoints de lectura.
+
+Las entradas se guardan por endpoint + parámetros declarados + versión de
+datos. Los parámetros que el endpoint no declara no cuentan para la clave
+(si no, `?x=1`, `?x=2`, ... llenarían la cache con copias de la misma
+respuesta), y las respuestas de más de CACHE_MAX_BODY_BYTES no se guardan:
+el LRU limita la cantidad de entradas, no su tamaño.
+Cada escritura (Store.add/add_many/toggle, seed) llama a `bump_version()`
+después del commit: las claves cambian y lo viejo deja de usarse (el LRU
+o el TTL lo terminan de sacar). El TTL además acota cuánto puede quedar
+desactualizado algo que no pasa por el Store (p. ej. otro worker con la
+cache en memoria, o `overdue`, que depende de la hora).
+
+Backends (settings.CACHE_BACKEND):
+- "memory": LRU en proceso con TTL (default).
+- "redis":  Redis (o compatible) compartido entre workers; requiere el
+            paquete `redis`. Si no está, se usa "memory".
+- "none":   sin cache (igual se calculan ETags).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Protocol
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi.dependencies.utils import get_flat_dependant
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from .config import settings
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[CachedResponse]:
+        ...
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        ...
+
+    def version(self) -> str:
+        ...
+
+    def bump(self) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class NullCache:
+    """No guarda nada."""
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        pass
+
+    def version(self) -> str:
+        return "0"
+
+    def bump(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache:
+    """LRU en memoria con TTL, seguro entre threads."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # El epoch evita que, tras un reinicio, una versión repetida
+        # coincida con claves de antes
+        self._epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self) -> str:
+        return f"{self._epoch}.{self._version}"
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Cache en Redis: la versión es un INCR compartido por todos los workers."""
+
+    def __init__(self, url: str, ttl: float = 30.0, prefix: str = "todos-cache:"):
+        import redis  # dependencia opcional
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(body=data["body"].encode(), etag=data["etag"], headers=data["headers"])
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        data = {"body": value.body.decode(), "etag": value.etag, "headers": value.headers}
+        self._client.set(self.prefix + key, json.dumps(data), px=int(self.ttl * 1000))
+
+    def version(self) -> str:
+        return (self._client.get(self.prefix + "version") or b"0").decode()
+
+    def bump(self) -> None:
+        self._client.incr(self.prefix + "version")
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+
+def build_cache(backend: str) -> CacheBackend:
+    backend = backend.lower()
+    if backend == "none":
+        return NullCache()
+    if backend == "redis":
+        try:
+            return RedisCache(settings.CACHE_REDIS_URL, ttl=settings.CACHE_TTL_SECONDS)
+        except ImportError:
+            print("[WARN] CACHE_BACKEND=redis but the redis package is missing, using memory")
+    return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+
+
+_cache: CacheBackend = build_cache(settings.CACHE_BACKEND)
+
+
+def get_cache() -> CacheBackend:
+    return _cache
+
+
+def set_cache(cache: CacheBackend) -> None:
+    """Reemplaza el backend activo (tests / configuración en caliente)."""
+    global _cache
+    _cache = cache
+
+
+def bump_version() -> None:
+    """Invalida lo cacheado: llamar después de commitear una escritura."""
+    _cache.bump()
+
+
+def cache_key(version: str, path: str, query: str, params: Optional[Iterable[str]] = None) -> str:
+    """Clave de una respuesta. Con `params`, sólo cuentan esos parámetros del query string."""
+    pairs = parse_qsl(query, keep_blank_values=True)
+    if params is not None:
+        allowed = set(params)
+        pairs = [(name, value) for name, value in pairs if name in allowed]
+    # Ordenamos los parámetros para que ?a=1&b=2 y ?b=2&a=1 compartan entrada
+    return f"{version}:{path}?{urlencode(sorted(pairs))}"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evalúa If-None-Match (lista de ETags, débiles o fuertes, o "*")."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def declared_query_params(app: Any, path: str) -> frozenset[str]:
+    """Nombres de los parámetros de query que declara la ruta GET `path` de `app`."""
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        if getattr(route, "path", None) == path and "GET" in getattr(route, "methods", ()):
+            return frozenset(param.alias for param in get_flat_dependant(route.dependant).query_params)
+    return frozenset()
+
+
+class ResponseCacheMiddleware:
+    """Cache de respuestas GET + ETag / If-None-Match, para los `paths` dados.
+
+    ASGI puro: el resto de los requests (incluidos los streams de export
+    y de /api/todos/changes) pasan directo, sin envolver la respuesta.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_body_bytes: Optional[int] = None) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_body_bytes = settings.CACHE_MAX_BODY_BYTES if max_body_bytes is None else max_body_bytes
+        self._params: dict[str, frozenset[str]] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path not in self._params:
+            self._params[path] = declared_query_params(scope.get("app"), path)
+        cache = get_cache()
+        # La versión se lee antes de consultar la DB: si hay una escritura en
+        # el medio, la respuesta queda bajo la versión vieja y no se reutiliza
+        key = cache_key(cache.version(), path, scope["query_string"].decode("latin-1"), self._params[path])
+        entry = cache.get(key)
+        status = "hit"
+        if entry is None:
+            status = "miss"
+            entry = await self._fill(scope, receive, send)
+            if entry is None:
+                # Ya respondido: error o body demasiado grande para guardar
+                return
+            cache.set(key, entry)
+
+        # no-cache: el navegador guarda la respuesta pero revalida siempre con
+        # If-None-Match, así el front recibe 304 si nada cambió
+        validators = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": status}
+        if etag_matches(Headers(scope=scope).get("if-none-match"), entry.etag):
+            response = Response(status_code=304, headers=validators)
+        else:
+            response = Response(content=entry.body, headers={**entry.headers, **validators})
+        await response(scope, receive, send)
+
+    async def _fill(self, scope, receive, send) -> Optional[CachedResponse]:
+        """Corre el endpoint y arma la entrada. None si la respuesta ya se mandó tal cual."""
+        start: dict = {}
+        chunks: list[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def capture(message) -> None:
+            nonlocal size, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start.update(message)
+                if message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+                if size > self.max_body_bytes:
+                    # Demasiado grande para guardarla: se manda sin cachear
+                    passthrough = True
+                    MutableHeaders(scope=start)["X-Cache"] = "skip"
+                    await send(start)
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": b"".join(chunks),
+                            "more_body": message.get("more_body", False),
+                        }
+                    )
+                    chunks.clear()
+
+        await self.app(scope, receive, capture)
+        if passthrough:
+            return None
+        body = b"".join(chunks)
+        headers = {k: v for k, v in Headers(raw=start["headers"]).items() if k != "content-length"}
+        return CachedResponse(body=body, etag=make_etag(body), headers=headers)
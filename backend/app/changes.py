@@ -0,0 +1,198 @@
+"""Feed de cambios de TODOs para GET /api/todos/changes (Server-Sent Events).
+
+Cada escritura del Store (add, add_many, toggle, update_many) publica,
+después del commit, un evento por TODO afectado con un número de
+secuencia creciente. Los clientes abiertos lo reciben por SSE y aplican
+el delta a su lista y a sus stats, en lugar de volver a pedir todo.
+
+Los últimos `CHANGE_FEED_BUFFER` eventos quedan en memoria para poder
+retomar: el `id` de cada evento es "<epoch>.<seq>" y el navegador lo
+manda como Last-Event-ID al reconectarse. Si lo pedido ya salió del
+buffer, o el id es de otro proceso (otro epoch, p. ej. tras un
+reinicio), se manda un evento `reset` y el cliente recarga la lista.
+También se publica un `reset` cuando cambian datos que no se pueden
+expresar como delta de un TODO (p. ej. `reconcile --fix` corrigiendo los
+contadores de stats).
+
+Como la cache "memory", el feed es por proceso: con varios workers cada
+uno sólo ve las escrituras que pasaron por él.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from .config import settings
+from .schemas import TODO_FIELDS
+
+CREATED = "created"
+TOGGLED = "toggled"
+UPDATED = "updated"
+RESET = "reset"
+
+_todo_values = attrgetter(*TODO_FIELDS)
+
+
+def todo_payload(todo: Any) -> dict[str, Any]:
+    """Campos de TodoOut de un objeto o fila."""
+    return dict(zip(TODO_FIELDS, _todo_values(todo)))
+
+
+@dataclass(frozen=True)
+class Change:
+    seq: int
+    kind: str
+    todo: dict[str, Any]
+
+
+class ChangeFeed:
+    """Buffer circular de eventos, seguro entre threads.
+
+    Se publica desde los workers del threadpool (rutas sync) o desde el
+    event loop (rutas async); los suscriptores esperan en su event loop.
+    """
+
+    def __init__(self, max_events: int = 1000):
+        # Igual que en MemoryCache: distingue ids de antes de un reinicio
+        self.epoch = uuid.uuid4().hex[:8]
+        self._events: "deque[Change]" = deque(maxlen=max_events)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}.{seq}"
+
+    def parse_event_id(self, value: str) -> Optional[int]:
+        """Secuencia de un Last-Event-ID. None si no es de este feed."""
+        epoch, _, seq = value.strip().rpartition(".")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, kind: str, todos: Iterable[Any]) -> None:
+        with self._lock:
+            for todo in todos:
+                self._seq += 1
+                self._events.append(Change(self._seq, kind, todo_payload(todo)))
+        self._wake()
+
+    def publish_reset(self) -> None:
+        """Avisa a los clientes que recarguen todo (lista y stats)."""
+        with self._lock:
+            self._seq += 1
+            self._events.append(Change(self._seq, RESET, {}))
+        self._wake()
+
+    def _wake(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop ya cerrado: el suscriptor se fue
+                pass
+
+    def since(self, seq: int) -> Optional[list[Change]]:
+        """Eventos posteriores a `seq`. None si hay un hueco (salieron del buffer)."""
+        with self._lock:
+            oldest = self._events[0].seq if self._events else self._seq + 1
+            if seq > self._seq or seq + 1 < oldest:
+                return None
+            return [change for change in self._events if change.seq > seq]
+
+    async def wait(self, after: int, timeout: float) -> None:
+        """Espera a que haya eventos posteriores a `after`, o hasta `timeout` segundos."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._seq > after:
+                return
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+def format_event(event: str, data: dict[str, Any], event_id: str | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream(
+    feed: ChangeFeed,
+    after: Optional[int],
+    *,
+    resume: bool,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keepalive: float,
+) -> AsyncIterator[str]:
+    """Mensajes SSE del feed a partir de la secuencia `after`.
+
+    Arranca con `ready` (suscripción nueva) o con `reset` si se pidió
+    retomar (`resume`) desde una posición que ya no se puede reconstruir.
+    Sin eventos nuevos, cada `keepalive` segundos manda un comentario para
+    que los proxies no corten la conexión.
+    """
+    # retry: cuánto espera el navegador antes de reconectar (ms)
+    yield "retry: 3000\n\n"
+    if after is None or feed.since(after) is None:
+        after = feed.last_seq
+        kind = "reset" if resume else "ready"
+        yield format_event(kind, {"seq": after}, feed.event_id(after))
+
+    while not await is_disconnected():
+        changes = feed.since(after)
+        if changes is None:
+            # El cliente quedó atrás de lo que guarda el buffer
+            after = feed.last_seq
+            yield format_event("reset", {"seq": after}, feed.event_id(after))
+            continue
+        for change in changes:
+            data = {"seq": change.seq} if change.kind == RESET else {"seq": change.seq, "todo": change.todo}
+            yield format_event(change.kind, data, feed.event_id(change.seq))
+            after = change.seq
+        if not changes:
+            await feed.wait(after, keepalive)
+            if feed.last_seq == after:
+                yield ": keepalive\n\n"
+
+
+_feed = ChangeFeed(settings.CHANGE_FEED_BUFFER)
+
+
+def get_feed() -> ChangeFeed:
+    return _feed
+
+
+def set_feed(feed: ChangeFeed) -> None:
+    """Reemplaza el feed activo (tests)."""
+    global _feed
+    _feed = feed
+
+
+def publish(kind: str, todos: Iterable[Any]) -> None:
+    """Publica un evento por TODO: llamar después de commitear la escritura."""
+    _feed.publish(kind, todos)
+
+
+def publish_reset() -> None:
+    """Publica un `reset`: llamar después de commitear un cambio que no es por TODO."""
+    _feed.publish_reset()
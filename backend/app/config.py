@@ -11,4 +11,44 @@ class Settings(BaseSettings):
     SEED_TOKEN: str = os.getenv("SEED_TOKEN", "")
     SEED_ON_START: str = os.getenv("SEED_ON_START", "false")
 
+    # Cache de respuestas de lectura: "memory", "redis" o "none"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    # Respuestas más grandes que esto no se cachean (p. ej. la lista sin paginar)
+    CACHE_MAX_BODY_BYTES: int = int(os.getenv("CACHE_MAX_BODY_BYTES", str(1024 * 1024)))
+
+    # Pool de conexiones (ver app.pool). pool_size + max_overflow cubre los
+    # 40 workers del threadpool de AnyIO: con menos conexiones que workers,
+    # las rutas sync se traban bajo carga esperando una conexión.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Sólo para servidores de DB (Postgres); en SQLite no aplican
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Perfil de SQLite: "default" o "performance" (WAL, pragmas y cola de
+    # escritura, ver app.sqlite_profile)
+    SQLITE_PROFILE: str = os.getenv("SQLITE_PROFILE", "default")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KIB: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))
+
+    # Feed de cambios (GET /api/todos/changes, ver app.changes): eventos que
+    # se guardan para retomar y cada cuánto se manda un keepalive
+    CHANGE_FEED_BUFFER: int = int(os.getenv("CHANGE_FEED_BUFFER", "1000"))
+    CHANGE_FEED_KEEPALIVE_SECONDS: float = float(os.getenv("CHANGE_FEED_KEEPALIVE_SECONDS", "15"))
+
+    # Métricas de latencia y de consultas en GET /metrics (ver app.metrics)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Auditor de consultas (N+1 y lentas) por request, en GET /admin/debug
+    # (ver app.query_audit). Apagado por default: es para desarrollo y QA
+    QUERY_AUDIT_ENABLED: bool = os.getenv("QUERY_AUDIT_ENABLED", "false").lower() == "true"
+    QUERY_AUDIT_SLOW_MS: float = float(os.getenv("QUERY_AUDIT_SLOW_MS", "100"))
+    QUERY_AUDIT_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_AUDIT_REPEAT_THRESHOLD", "3"))
+    QUERY_AUDIT_HISTORY: int = int(os.getenv("QUERY_AUDIT_HISTORY", "50"))
+
 settings = Settings()
@@ -0,0 +1,279 @@
+"""Contadores materializados para las estadísticas de TODOs.
+
+En lugar de recorrer la tabla en cada request, la tabla `todo_counters`
+guarda los totales y cada escritura del Store (y el seed) aplica su delta
+en la misma transacción. Así /api/todos/stats y /api/todos/stats/advanced
+leen un puñado de filas sin importar el tamaño de `todos`.
+
+`overdue` no se materializa: depende de la hora actual, no sólo de las
+escrituras, así que se sigue resolviendo con una consulta.
+
+La misma tabla guarda `row_version`, la secuencia global de versiones de
+fila (ver Todo.version). No es una estadística: no está en COUNTERS ni la
+toca `reconcile`. Cada escritura la incrementa con un UPDATE, que además
+serializa a los escritores concurrentes: una versión sólo se ve cuando
+todas las anteriores ya están commiteadas.
+
+Si los contadores se desincronizan (p. ej. escrituras hechas a mano en la
+DB), `reconcile` los recalcula desde cero y reporta la diferencia:
+
+    python -m app.counters reconcile [--fix]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import bindparam, case, func, insert, select, update
+
+from . import cache, changes
+from .advanced_stats import classify_title_length, compute_advanced_stats_sql
+from .models import Todo, TodoCounter, TodoPriority, TodoStatus
+from .sqlite_profile import begin_write, write_lock
+
+COUNTERS = (
+    "total",
+    "done_flag",
+    "status_pending",
+    "status_in_progress",
+    "status_done",
+    "with_description",
+    "title_short",
+    "title_medium",
+    "title_long",
+    "high_priority",
+)
+
+ROW_VERSION = "row_version"
+
+_table = TodoCounter.__table__
+
+
+def _field(todo: Any, name: str) -> Any:
+    if isinstance(todo, Mapping):
+        return todo.get(name)
+    return getattr(todo, name, None)
+
+
+def todo_contribution(todo: Any) -> dict[str, int]:
+    """Cuánto suma un TODO (objeto o dict de columnas) a cada contador.
+
+    Los campos todavía sin valor (antes del INSERT) toman el default del modelo.
+    """
+    status = _field(todo, "status") or TodoStatus.pending
+    priority = _field(todo, "priority") or TodoPriority.medium
+    return {
+        "total": 1,
+        "done_flag": 1 if _field(todo, "done") else 0,
+        f"status_{TodoStatus(status).value}": 1,
+        "with_description": 1 if (_field(todo, "description") or "").strip() else 0,
+        f"title_{classify_title_length(_field(todo, 'title') or '')}": 1,
+        "high_priority": 1 if TodoPriority(priority) == TodoPriority.high else 0,
+    }
+
+
+def apply(db, deltas: Mapping[str, int]) -> None:
+    """Suma `deltas` a los contadores, dentro de la transacción de `db`."""
+    params = [{"counter": name, "delta": delta} for name, delta in deltas.items() if delta]
+    if not params:
+        return
+    db.execute(
+        update(_table)
+        .where(_table.c.name == bindparam("counter"))
+        .values(value=_table.c.value + bindparam("delta")),
+        params,
+    )
+
+
+def record_created(db, todos: Iterable[Any]) -> None:
+    """Registra la creación de `todos` (objetos o dicts de columnas)."""
+    total: Counter = Counter()
+    for todo in todos:
+        total.update(todo_contribution(todo))
+    apply(db, total)
+
+
+def record_updated(db, changes: Iterable[tuple[Any, Any]]) -> None:
+    """Registra cambios de TODOs existentes: pares (fila antes, fila después)."""
+    total: Counter = Counter()
+    for before, after in changes:
+        total.update(todo_contribution(after))
+        total.subtract(todo_contribution(before))
+    apply(db, total)
+
+
+def record_done_changed(db, done: bool) -> None:
+    """Registra que un TODO pasó a `done` (o volvió a pendiente)."""
+    apply(db, {"done_flag": 1 if done else -1})
+
+
+def read(db, *, for_update: bool = False) -> dict[str, int]:
+    """Valores actuales de los contadores (bloqueados con FOR UPDATE si `for_update`)."""
+    stmt = select(_table.c.name, _table.c.value).where(_table.c.name.in_(COUNTERS))
+    if for_update:
+        stmt = stmt.with_for_update()
+    rows = db.execute(stmt).all()
+    return {name: int(value) for name, value in rows}
+
+
+def next_row_version(db) -> int:
+    """Reserva la próxima versión de fila, dentro de la transacción de `db` (Session)."""
+    stmt = (
+        update(_table)
+        .where(_table.c.name == ROW_VERSION)
+        .values(value=_table.c.value + 1)
+    )
+    if db.get_bind().dialect.update_returning:
+        return int(db.execute(stmt.returning(_table.c.value)).scalar_one())
+    db.execute(stmt)
+    return current_row_version(db)
+
+
+def current_row_version(db) -> int:
+    """Última versión de fila commiteada (0 si todavía no hubo escrituras)."""
+    value = db.execute(select(_table.c.value).where(_table.c.name == ROW_VERSION)).scalar()
+    return int(value or 0)
+
+
+def recompute(db) -> dict[str, int]:
+    """Recalcula todos los contadores desde la tabla `todos`."""
+    advanced = compute_advanced_stats_sql(db)
+    done_flag = db.execute(
+        select(func.coalesce(func.sum(case((Todo.done.is_(True), 1), else_=0)), 0))
+    ).scalar()
+    return {
+        "total": advanced["total"],
+        "done_flag": int(done_flag),
+        "status_pending": advanced["pending"],
+        "status_in_progress": advanced["in_progress"],
+        "status_done": advanced["done"],
+        "with_description": advanced["with_description"],
+        "title_short": advanced["title_short"],
+        "title_medium": advanced["title_medium"],
+        "title_long": advanced["title_long"],
+        "high_priority": advanced["high_priority"],
+    }
+
+
+def _write(db, values: Mapping[str, int], existing: set[str]) -> None:
+    missing = [{"name": n, "value": v} for n, v in values.items() if n not in existing]
+    present = [{"counter": n, "value": v} for n, v in values.items() if n in existing]
+    if missing:
+        db.execute(insert(_table), missing)
+    if present:
+        db.execute(
+            update(_table)
+            .where(_table.c.name == bindparam("counter"))
+            .values(value=bindparam("value")),
+            present,
+        )
+
+
+def ensure_initialized(conn) -> list[str]:
+    """Crea los contadores que falten con su valor real. Devuelve los creados."""
+    existing = set(conn.execute(select(_table.c.name)).scalars())
+    missing = [name for name in COUNTERS if name not in existing]
+    if missing:
+        actual = recompute(conn)
+        _write(conn, {name: actual[name] for name in missing}, existing)
+    return missing
+
+
+def ensure_row_version(conn) -> bool:
+    """Crea la secuencia de versiones si falta. Devuelve True si la creó.
+
+    Las filas previas a la columna `version` quedan en 1, así un cliente que
+    sincroniza desde 0 las recibe a todas.
+    """
+    if conn.execute(select(_table.c.name).where(_table.c.name == ROW_VERSION)).first():
+        return False
+    conn.execute(update(Todo.__table__).where(Todo.version == 0).values(version=1))
+    latest = conn.execute(select(func.coalesce(func.max(Todo.version), 0))).scalar()
+    conn.execute(insert(_table).values(name=ROW_VERSION, value=int(latest)))
+    return True
+
+
+def reconcile(db, *, fix: bool = False) -> dict:
+    """Compara los contadores con un recálculo completo.
+
+    Devuelve {"ok", "drift", "fixed"}; `drift` tiene, por contador
+    desincronizado, el valor guardado y el real. Con `fix=True` corrige y
+    hace commit.
+
+    Para corregir, el recálculo y la escritura van en una misma
+    transacción de escritura (turno de la cola, BEGIN IMMEDIATE en SQLite,
+    FOR UPDATE sobre los contadores en otros motores): si no, un
+    `value + delta` del Store commiteado entre el recálculo y la escritura
+    se perdería al pisarlo con el valor absoluto.
+    """
+    if not fix:
+        return _compare(read(db), recompute(db))
+
+    with write_lock(db.get_bind()):
+        begin_write(db)
+        stored = read(db, for_update=True)
+        result = _compare(stored, recompute(db))
+        if result["ok"]:
+            db.rollback()
+            return result
+        _write(db, {name: values["actual"] for name, values in result["drift"].items()}, set(stored))
+        db.commit()
+    cache.bump_version()
+    # Los clientes del feed de cambios tienen stats armadas con deltas
+    changes.publish_reset()
+    return {**result, "fixed": True}
+
+
+def _compare(stored: Mapping[str, int], actual: Mapping[str, int]) -> dict:
+    drift = {
+        name: {"stored": stored.get(name), "actual": actual[name]}
+        for name in COUNTERS
+        if stored.get(name) != actual[name]
+    }
+    return {"ok": not drift, "drift": drift, "fixed": False}
+
+
+def basic_stats(values: Mapping[str, int]) -> dict[str, int]:
+    """Mismo formato que logic.compute_stats."""
+    total = values.get("total", 0)
+    done = values.get("done_flag", 0)
+    return {"total": total, "done": done, "pending": total - done}
+
+
+def advanced_stats(values: Mapping[str, int], overdue: int) -> dict[str, int]:
+    """Mismo formato que advanced_stats.compute_advanced_stats."""
+    total = values.get("total", 0)
+    with_description = values.get("with_description", 0)
+    return {
+        "total": total,
+        "pending": values.get("status_pending", 0),
+        "in_progress": values.get("status_in_progress", 0),
+        "done": values.get("status_done", 0),
+        "with_description": with_description,
+        "without_description": total - with_description,
+        "title_short": values.get("title_short", 0),
+        "title_medium": values.get("title_medium", 0),
+        "title_long": values.get("title_long", 0),
+        "high_priority": values.get("high_priority", 0),
+        "overdue": overdue,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.counters")
+    parser.add_argument("command", choices=["reconcile"])
+    parser.add_argument("--fix", action="store_true", help="corrige los contadores desincronizados")
+    args = parser.parse_args(argv)
+
+    from .db import SessionLocal
+
+    with SessionLocal() as db:
+        result = reconcile(db, fix=args.fix)
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] or result["fixed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
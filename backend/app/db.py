@@ -4,6 +4,11 @@ from typing import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from . import query_audit
+from .metrics import instrument_engine
+from .pool import pool_options
+from .sqlite_profile import apply_profile
+
 # Prioridad:
 # 1) DATABASE_URL (nueva)
 # 2) DB_URL       (legacy de TP05)
@@ -32,7 +37,11 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=connect_args,
+    **pool_options(SQLALCHEMY_DATABASE_URL),
 )
+apply_profile(engine)
+instrument_engine(engine)
+query_audit.instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -43,6 +52,58 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+def to_async_url(url: str) -> str:
+    """Traduce la URL sync a su driver async (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    for prefix in ("postgresql+psycopg2:", "postgresql:", "postgres:"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg:", 1)
+    return url
+
+
+# El engine async se crea recién cuando se usa: así la app sync no depende
+# de tener instalados aiosqlite/asyncpg.
+_async_engine = None
+_async_sessionmaker = None
+
+
+def peek_async_engine():
+    """El engine async si ya se creó (para métricas), sin crearlo."""
+    return _async_engine
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            to_async_url(SQLALCHEMY_DATABASE_URL),
+            connect_args=connect_args,
+            **pool_options(SQLALCHEMY_DATABASE_URL, is_async=True),
+        )
+        apply_profile(_async_engine.sync_engine, serialize_writes=False)
+        instrument_engine(_async_engine.sync_engine)
+        query_audit.instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # expire_on_commit=False: en async no se puede hacer lazy-load al
+        # serializar, así que los objetos quedan cargados tras el commit
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_sessionmaker
+
+
 def get_db() -> Generator:
     db = SessionLocal()
     try:
@@ -1,36 +1,383 @@
 from __future__ import annotations
 
-from typing import Generator
+from datetime import datetime
+from typing import Any, Generator, Iterator
+from sqlalchemy import case, exists, insert, literal, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from . import cache, changes, counters
+from .advanced_stats import count_overdue, overdue_condition
 from .db import SessionLocal
-from .models import Todo
+from .logic import as_utc, classify_new_titles, title_key
+from .models import Todo, TodoPriority, TodoStatus
+from . import search
+from .sqlite_profile import begin_write, write_lock
+
+
+_table = Todo.__table__
+
+# done = NOT done, pero NULL cuenta como pendiente (igual que `not bool(done)`)
+_FLIPPED_DONE = case((_table.c.done.is_(True), False), else_=True)
+
+
+def _search_order(sort: str, relevance, *, dated_only: bool) -> list:
+    """ORDER BY de Store.search; siempre desempata por id (como logic.sort_todos)."""
+    if sort == "-id":
+        return [Todo.id.desc()]
+    if sort in ("due_date", "-due_date"):
+        column = Todo.due_date.asc() if sort == "due_date" else Todo.due_date.desc()
+        # Si el filtro ya excluye las filas sin fecha, el índice de
+        # due_date da el orden sin tener que ubicar los NULL al final
+        return [column if dated_only else column.nulls_last(), Todo.id]
+    if sort == "relevance" and relevance is not None:
+        return [relevance, Todo.id]
+    return [Todo.id]
+
+
+def _since(stmt, since: int | None):
+    """Filas escritas después de la versión `since`, ordenadas por (version, id).
+
+    Ese orden es el del índice ix_todos_version_id: el costo depende de
+    cuántas filas cambiaron, no del tamaño de la tabla. Ordenar por id
+    haría que SQLite prefiera recorrer la tabla entera.
+    """
+    if since is None:
+        return stmt
+    return stmt.where(_table.c.version > since).order_by(_table.c.version)
 
 
 class Store:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self):
-        return self.db.query(Todo).order_by(Todo.id).all()
+    def list(self, *, after: int | None = None, limit: int | None = None, since: int | None = None):
+        """Lista TODOs ordenados por id.
+
+        Paginación keyset: `after` es el último id ya visto y `limit` el
+        tamaño de página. Usa el índice de la PK, así que el costo depende
+        del tamaño de página y no del de la tabla.
+
+        Con `since` devuelve sólo las filas escritas después de esa versión
+        (ver Todo.version), en el orden en que se escribieron.
+
+        Es de sólo lectura: devuelve filas de Core (con los atributos de
+        Todo) en lugar de objetos ORM, sin identity map ni hidratación.
+        """
+        stmt = _since(select(*_table.c), since)
+        if after is not None:
+            stmt = stmt.where(_table.c.id > after)
+        stmt = stmt.order_by(_table.c.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self.db.execute(stmt))
+
+    def list_fields(
+        self,
+        fields: list[str],
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+        since: int | None = None,
+    ) -> list[dict]:
+        """Igual que list(), pero trae sólo las columnas pedidas como dicts."""
+        stmt = _since(select(*[getattr(Todo, f) for f in fields]), since)
+        if after is not None:
+            stmt = stmt.where(Todo.id > after)
+        stmt = stmt.order_by(Todo.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+
+    def iter_batches(self, fields: list[str], *, batch_size: int = 1000) -> Iterator[list[dict]]:
+        """Recorre la tabla por lotes de `batch_size` filas (como dicts), ordenada por id.
+
+        Usa una conexión propia con `yield_per`, así sirve para respuestas
+        en streaming que siguen leyendo después de cerrada la sesión del
+        request. La conexión se libera al agotar o cerrar el generador.
+        """
+        stmt = select(*[getattr(Todo, f) for f in fields]).order_by(Todo.id)
+        with self.db.get_bind().connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(stmt)
+            for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+
+    def due(
+        self,
+        before: datetime,
+        *,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+    ):
+        """TODOs no terminados que vencen antes de `before`, por due_date e id.
+
+        Con `before` = ahora son los overdue de advanced_stats. Paginación
+        keyset sobre (due_date, id): `after` es el par de la última fila vista.
+        """
+        stmt = select(Todo).where(overdue_condition(before))
+        if after is not None:
+            due_date, todo_id = after
+            cursor = tuple_(literal(due_date, Todo.due_date.type), literal(todo_id))
+            stmt = stmt.where(tuple_(Todo.due_date, Todo.id) > cursor)
+        stmt = stmt.order_by(Todo.due_date, Todo.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return self.db.scalars(stmt).all()
+
+    def search(
+        self,
+        *,
+        q: str | None = None,
+        done: bool | None = None,
+        status: TodoStatus | None = None,
+        priority: TodoPriority | None = None,
+        due_before: datetime | None = None,
+        due_after: datetime | None = None,
+        sort: str | None = None,
+        mode: str = "fts",
+        limit: int | None = None,
+        offset: int = 0,
+    ):
+        """Busca TODOs con todos los filtros resueltos en una sola consulta.
+
+        - mode="fts": índice de texto (FTS5 / tsvector), por prefijo de
+          palabra.
+        - mode="substring": misma semántica que logic.filter_todos.
+        - status / priority / due_before / due_after: como en
+          logic.filter_todos; usan los índices compuestos de Todo.
+        - sort: uno de logic.SEARCH_SORTS. Por defecto, relevancia si hay
+          búsqueda por índice de texto y id en otro caso.
+
+        Como list(), devuelve filas de Core y no objetos ORM.
+        """
+        stmt = select(*_table.c)
+        if done is True:
+            stmt = stmt.where(Todo.done.is_(True))
+        elif done is False:
+            stmt = stmt.where(or_(Todo.done.is_(False), Todo.done.is_(None)))
+        if status is not None:
+            stmt = stmt.where(Todo.status == status)
+        if priority is not None:
+            stmt = stmt.where(Todo.priority == priority)
+        if due_before is not None:
+            stmt = stmt.where(Todo.due_date < as_utc(due_before))
+        if due_after is not None:
+            stmt = stmt.where(Todo.due_date >= as_utc(due_after))
+
+        relevance = None
+        if q:
+            tokens = search.query_tokens(q)
+            backend = search.search_backend(self.db.connection())
+            if mode == "substring" or not tokens or backend == search.BACKEND_SUBSTRING:
+                stmt = search.apply_substring(stmt, q)
+            elif backend == search.BACKEND_FTS5:
+                stmt = search.apply_fts5(stmt, tokens)
+                relevance = search.fts5_relevance()
+            else:
+                stmt = search.apply_tsvector(stmt, tokens)
+                relevance = search.tsvector_relevance(tokens)
+
+        sort = sort or ("relevance" if relevance is not None else "id")
+        dated_only = due_before is not None or due_after is not None
+        stmt = stmt.order_by(*_search_order(sort, relevance, dated_only=dated_only))
+
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self.db.execute(stmt))
+
+    def row_version(self) -> int:
+        """Última versión de fila commiteada: el `since` de la próxima sincronización."""
+        return counters.current_row_version(self.db)
+
+    def stats(self) -> dict[str, int]:
+        """Mismo resultado que logic.compute_stats, leído de los contadores materializados."""
+        return counters.basic_stats(counters.read(self.db))
+
+    def advanced_stats(self) -> dict[str, int]:
+        """Mismo resultado que advanced_stats.compute_advanced_stats.
+
+        Todo sale de los contadores salvo `overdue`, que depende de la hora
+        y se cuenta con una consulta.
+        """
+        return counters.advanced_stats(counters.read(self.db), count_overdue(self.db))
+
+    def title_exists(self, title: str) -> bool:
+        """Indica si ya hay un TODO con ese título (normalizado, case-insensitive).
+
+        Usa el índice único de `title_normalized`, sin traer la tabla.
+        """
+        key = title_key(title)
+        if not key:
+            return False
+        return bool(self.db.query(exists().where(Todo.title_normalized == key)).scalar())
+
+    def _insert_returning(self, rows: list[dict[str, Any]]) -> list:
+        """INSERT de `rows` en una sola sentencia; devuelve las filas creadas, en orden.
+
+        Son filas de Core: a diferencia de los objetos ORM, no se expiran
+        con el commit, así que leerlas después no hace un SELECT por fila.
+        No se pide `sort_by_parameter_order`: en SQLite eso parte el INSERT
+        en uno por fila. El orden se rearma por title_normalized, que es
+        único.
+        """
+        stmt = insert(_table)
+        if self.db.get_bind().dialect.insert_executemany_returning:
+            inserted = self.db.execute(stmt.returning(*_table.c), rows)
+        else:
+            self.db.execute(stmt, rows)
+            keys = [row["title_normalized"] for row in rows]
+            inserted = self.db.execute(select(*_table.c).where(_table.c.title_normalized.in_(keys)))
+        by_key = {row.title_normalized: row for row in inserted}
+        return [by_key[row["title_normalized"]] for row in rows]
 
     def add(self, title: str, description: str | None = None):
-        todo = Todo(title=title, description=description)
-        self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
+        """Crea un TODO. Levanta ValueError("duplicate") si el índice único lo rechaza.
+
+        Devuelve la fila creada (con los atributos de Todo), leída con el
+        mismo INSERT ... RETURNING: sin el refresh que hacía falta con el
+        objeto ORM.
+        """
+        with write_lock(self.db.get_bind()):
+            row = {
+                "title": title,
+                "title_normalized": title_key(title) or None,
+                "description": description,
+                "version": counters.next_row_version(self.db),
+            }
+            try:
+                [todo] = self._insert_returning([row])
+                counters.record_created(self.db, [todo])
+                self.db.commit()
+            except IntegrityError:
+                # Carrera entre title_exists() y el INSERT: otro request ganó
+                self.db.rollback()
+                raise ValueError("duplicate")
+        cache.bump_version()
+        changes.publish(changes.CREATED, [todo])
         return todo
 
+    def add_many(self, items: list[tuple[str, str | None]]) -> list[tuple[str, Any]]:
+        """Crea varios TODOs en una sola transacción.
+
+        `items` son pares (título ya normalizado, descripción). Los
+        duplicados contra la DB se buscan con un único IN sobre el índice
+        de title_normalized y los válidos se insertan con un solo INSERT
+        ... RETURNING. Devuelve, por item y en orden, (código, fila) con
+        los códigos de logic.classify_new_titles ("ok" -> "created").
+        """
+        titles = [title for title, _ in items]
+        with write_lock(self.db.get_bind()):
+            keys = {title_key(t) for t in titles} - {""}
+            existing = set()
+            if keys:
+                existing = set(
+                    self.db.execute(
+                        select(Todo.title_normalized).where(Todo.title_normalized.in_(keys))
+                    ).scalars()
+                )
+            codes = classify_new_titles(titles, existing)
+
+            rows = [
+                {"title": title, "title_normalized": title_key(title), "description": description}
+                for (title, description), code in zip(items, codes)
+                if code == "ok"
+            ]
+            created: list = []
+            try:
+                if rows:
+                    version = counters.next_row_version(self.db)
+                    for row in rows:
+                        row["version"] = version
+                    created = self._insert_returning(rows)
+                    counters.record_created(self.db, rows)
+                self.db.commit()
+            except IntegrityError:
+                # Otro request insertó alguno de estos títulos en el medio
+                self.db.rollback()
+                raise ValueError("duplicate")
+        if created:
+            cache.bump_version()
+            changes.publish(changes.CREATED, created)
+
+        new_todos = iter(created)
+        return [
+            ("created", next(new_todos)) if code == "ok" else (code, None)
+            for code in codes
+        ]
+
+    def _update_returning(self, stmt, ids: list[int]) -> list:
+        """Ejecuta el UPDATE y devuelve las filas actualizadas (con RETURNING si hay)."""
+        if self.db.get_bind().dialect.update_returning:
+            return list(self.db.execute(stmt.returning(*_table.c)))
+        # Sin RETURNING: el SELECT de la misma transacción ve nuestro cambio
+        self.db.execute(stmt)
+        return list(self.db.execute(select(*_table.c).where(_table.c.id.in_(ids))))
+
     def toggle(self, todo_id: int):
-        """Invierte el estado done de un TODO. Devuelve el TODO actualizado o None si no existe."""
-        todo = self.db.query(Todo).filter(Todo.id == todo_id).first()
-        if not todo:
-            return None
-        todo.done = not bool(todo.done)
-        self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
-        return todo
+        """Invierte el estado done de un TODO. Devuelve el TODO actualizado o None si no existe.
+
+        Es un único UPDATE ... RETURNING: la DB invierte el valor, así que
+        dos toggles concurrentes nunca pisan el cambio del otro. Devuelve
+        la fila (con los atributos de Todo) en lugar del objeto ORM.
+        """
+        with write_lock(self.db.get_bind()):
+            stmt = (
+                update(_table)
+                .where(_table.c.id == todo_id)
+                .values(done=_FLIPPED_DONE, version=counters.next_row_version(self.db))
+            )
+            rows = self._update_returning(stmt, [todo_id])
+            if not rows:
+                self.db.rollback()
+                return None
+            counters.record_done_changed(self.db, rows[0].done)
+            self.db.commit()
+        cache.bump_version()
+        changes.publish(changes.TOGGLED, rows)
+        return rows[0]
+
+    def update_many(
+        self, ids: list[int], *, toggle: bool = False, values: dict[str, Any] | None = None
+    ) -> tuple[list, list[int]]:
+        """Actualiza varios TODOs con un solo UPDATE, en una transacción.
+
+        `toggle=True` invierte `done`; `values` asigna columnas (done,
+        status, priority). Devuelve (filas actualizadas, ids inexistentes),
+        ambas en el orden de `ids`.
+        """
+        ids = list(dict.fromkeys(ids))
+        values = dict(values or {})
+        if toggle:
+            values["done"] = _FLIPPED_DONE
+        if not ids or not values:
+            return [], ids
+
+        with write_lock(self.db.get_bind()):
+            # Los valores anteriores hacen falta para los contadores: se leen
+            # con las filas ya bloqueadas para que nadie las cambie en el medio
+            begin_write(self.db)
+            before = {
+                row.id: row
+                for row in self.db.execute(
+                    select(*_table.c).where(_table.c.id.in_(ids)).with_for_update()
+                )
+            }
+            if not before:
+                self.db.rollback()
+                return [], ids
+            values["version"] = counters.next_row_version(self.db)
+            stmt = update(_table).where(_table.c.id.in_(list(before))).values(**values)
+            after = {row.id: row for row in self._update_returning(stmt, list(before))}
+            counters.record_updated(self.db, [(before[i], after[i]) for i in after])
+            self.db.commit()
+        cache.bump_version()
+
+        updated = [after[i] for i in ids if i in after]
+        changes.publish(changes.TOGGLED if toggle else changes.UPDATED, updated)
+        missing = [i for i in ids if i not in before]
+        return updated, missing
 
     def health(self):
         self.db.execute("SELECT 1")
@@ -0,0 +1,53 @@
+"""Serialización en streaming de TODOs (NDJSON / CSV) para /api/todos/export.
+
+Las funciones reciben lotes de filas (mappings) y devuelven un chunk de
+texto por lote, así la respuesta se arma de a pedazos y la memoria queda
+acotada al tamaño de lote, no al de la tabla.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+EXPORT_FIELDS = ("id", "title", "description", "done", "priority", "status", "due_date")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunks(batches: Iterable[Sequence[Mapping[str, Any]]]) -> Iterator[str]:
+    """Un objeto JSON por línea."""
+    for batch in batches:
+        yield "".join(
+            json.dumps({f: _plain(row[f]) for f in EXPORT_FIELDS}, ensure_ascii=False) + "\n"
+            for row in batch
+        )
+
+
+def csv_chunks(batches: Iterable[Sequence[Mapping[str, Any]]]) -> Iterator[str]:
+    """CSV con encabezado; `description`/`due_date` vacíos si son NULL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            writer.writerow([_plain(row[f]) for f in EXPORT_FIELDS])
+        yield buffer.getvalue()
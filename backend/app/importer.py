@@ -0,0 +1,149 @@
+"""Importación en streaming de TODOs (NDJSON / CSV) para /api/todos/import.
+
+El body se consume de a pedazos: se decodifica incrementalmente, se parte
+en registros, cada registro se valida con las reglas de `logic` y los
+válidos se insertan con Store.add_many en lotes de `chunk_size`, con un
+commit por lote. Nunca se tiene el upload completo en memoria: a lo sumo
+un lote de registros más la línea que se está leyendo.
+
+Mientras se commitea un lote no se lee más del request, así que un cliente
+más rápido que la DB queda frenado por el control de flujo del servidor
+(backpressure).
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Callable, Optional
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from .logic import normalize_title
+from .schemas import TodoIn
+
+# Largo máximo de una línea (o registro CSV multilínea), en caracteres
+MAX_RECORD_CHARS = 64 * 1024
+
+Item = Optional[tuple[str, Optional[str]]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Líneas de texto a partir de chunks de bytes UTF-8 (con o sin BOM)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(pending) > MAX_RECORD_CHARS:
+            raise ValueError("line too long")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _to_item(record: object) -> Item:
+    """Valida un registro contra TodoIn. None si no es válido."""
+    if not isinstance(record, dict):
+        return None
+    try:
+        todo = TodoIn.model_validate(record)
+    except ValidationError:
+        return None
+    return todo.title, todo.description or None
+
+
+async def ndjson_items(lines: AsyncIterator[str]) -> AsyncIterator[Item]:
+    """Un objeto JSON por línea; las líneas en blanco se ignoran."""
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield _to_item(record)
+
+
+async def csv_items(lines: AsyncIterator[str]) -> AsyncIterator[Item]:
+    """CSV con encabezado; debe tener columna `title` y puede tener `description`."""
+    header: list[str] | None = None
+    buffer: list[str] = []
+    async for line in lines:
+        buffer.append(line)
+        text = "\n".join(buffer)
+        # Cantidad impar de comillas: un campo entre comillas sigue en la próxima línea
+        if text.count('"') % 2:
+            if len(text) > MAX_RECORD_CHARS:
+                raise ValueError("line too long")
+            continue
+        buffer = []
+        if not text.strip():
+            continue
+
+        row = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lower() for name in row]
+            if "title" not in header:
+                raise ValueError("csv header must include a title column")
+            continue
+        if len(row) != len(header):
+            yield None
+            continue
+        yield _to_item(dict(zip(header, row)))
+
+    if buffer:
+        # Comillas sin cerrar al final del archivo
+        yield None
+
+
+async def import_items(
+    items: AsyncIterator[Item],
+    add_many: Callable[[list[tuple[str, str | None]]], list],
+    *,
+    chunk_size: int,
+) -> dict:
+    """Inserta los items válidos de a `chunk_size`, con un commit por lote.
+
+    Devuelve los contadores del estilo de seed_if_empty:
+    - inserted:  TODOs creados
+    - duplicate: títulos que ya existían (en la DB o antes en el archivo)
+    - skipped:   registros inválidos o con título vacío
+    - chunks:    lotes commiteados
+    """
+    report = {"inserted": 0, "duplicate": 0, "skipped": 0, "chunks": 0}
+    chunk: list[tuple[str, str | None]] = []
+
+    async def flush() -> None:
+        try:
+            results = await run_in_threadpool(add_many, chunk)
+        except ValueError as e:
+            if str(e) != "duplicate":
+                raise
+            # Carrera con otro alta: al reintentar, esos títulos ya se ven en la DB
+            results = await run_in_threadpool(add_many, chunk)
+        for code, _ in results:
+            if code == "created":
+                report["inserted"] += 1
+            elif code == "duplicate":
+                report["duplicate"] += 1
+            else:
+                report["skipped"] += 1
+        report["chunks"] += 1
+        chunk.clear()
+
+    async for item in items:
+        if item is None:
+            report["skipped"] += 1
+            continue
+        title, description = item
+        chunk.append((normalize_title(title), description))
+        if len(chunk) >= chunk_size:
+            await flush()
+    if chunk:
+        await flush()
+    return report
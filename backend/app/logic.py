@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import Sequence, Protocol
+from datetime import datetime, timezone
+from typing import Collection, Sequence, Protocol
+
+# Órdenes de búsqueda soportados; "-" adelante es descendente.
+# "relevance" sólo aplica a la búsqueda por texto (ver Store.search).
+SEARCH_SORTS = ("relevance", "id", "-id", "due_date", "-due_date")
 
 
 class HasTodoShape(Protocol):
@@ -29,6 +34,15 @@ def normalize_title(title: str) -> str:
     return " ".join(parts)
 
 
+def title_key(title: str) -> str:
+    """Clave de comparación de un título para detectar duplicados.
+
+    Es el título normalizado y en minúsculas. Se persiste en
+    `Todo.title_normalized` para poder chequear duplicados por índice.
+    """
+    return normalize_title(title).lower()
+
+
 def is_empty_title(title: str) -> bool:
     """Indica si un título se considera vacío bajo nuestras reglas.
 
@@ -43,14 +57,13 @@ def is_duplicate_title(title: str, existing: Sequence[HasTodoShape]) -> bool:
     - Comparamos de forma case-insensitive.
     - Usamos el título normalizado tanto para el nuevo como para los existentes.
     """
-    norm_new = normalize_title(title).lower()
+    norm_new = title_key(title)
     if not norm_new:
         # Si ya es vacío, no lo consideramos duplicado aquí; esa es otra regla.
         return False
 
     for item in existing:
-        existing_norm = normalize_title(getattr(item, "title", "")).lower()
-        if existing_norm == norm_new:
+        if title_key(getattr(item, "title", "")) == norm_new:
             return True
     return False
 
@@ -69,6 +82,29 @@ def validate_new_todo(title: str, existing: Sequence[HasTodoShape]) -> None:
         raise ValueError("duplicate")
 
 
+def classify_new_titles(titles: Sequence[str], existing_keys: Collection[str]) -> list[str]:
+    """Aplica las reglas de alta a un lote de títulos, sin tocar la DB.
+
+    `existing_keys` son las claves (ver title_key) que ya están en la DB.
+    Devuelve un código por título, en el mismo orden:
+    - "ok"        -> se puede crear
+    - "empty"     -> título vacío
+    - "duplicate" -> ya existe en la DB o aparece antes en el mismo lote
+    """
+    seen: set[str] = set()
+    codes: list[str] = []
+    for title in titles:
+        key = title_key(title)
+        if not key:
+            codes.append("empty")
+        elif key in existing_keys or key in seen:
+            codes.append("duplicate")
+        else:
+            seen.add(key)
+            codes.append("ok")
+    return codes
+
+
 def compute_stats(todos: Sequence[HasTodoShape]) -> dict[str, int]:
     """Devuelve estadísticas simples sobre la lista de TODOs."""
     total = len(todos)
@@ -77,23 +113,53 @@ def compute_stats(todos: Sequence[HasTodoShape]) -> dict[str, int]:
     return {"total": total, "done": done, "pending": pending}
 
 
+def as_utc(value: datetime) -> datetime:
+    """Fecha en UTC; las fechas sin tz se toman como UTC (así las guarda SQLite)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 def filter_todos(
     todos: Sequence[HasTodoShape],
     *,
     done: bool | None = None,
     text: str | None = None,
+    status: str | None = None,
+    priority: str | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
 ) -> list[HasTodoShape]:
     """Filtra TODOs en memoria por estado `done` y/o texto.
 
     - done: si es True, sólo completados; si es False, sólo pendientes;
       si es None, no filtra por estado.
     - text: se busca (case-insensitive) en título y descripción.
+    - status / priority: igualdad con el valor dado.
+    - due_before / due_after: due_date < due_before y due_date >= due_after
+      (sin tz se toma UTC); los TODOs sin due_date quedan afuera.
+
+    Es la referencia en memoria de Store.search (modo substring).
     """
     result: list[HasTodoShape] = list(todos)
 
     if done is not None:
         result = [t for t in result if bool(getattr(t, "done", False)) is done]
 
+    if status is not None:
+        result = [t for t in result if getattr(t, "status", None) == status]
+
+    if priority is not None:
+        result = [t for t in result if getattr(t, "priority", None) == priority]
+
+    if due_before is not None or due_after is not None:
+        dated = [t for t in result if getattr(t, "due_date", None) is not None]
+        if due_before is not None:
+            dated = [t for t in dated if as_utc(t.due_date) < as_utc(due_before)]
+        if due_after is not None:
+            dated = [t for t in dated if as_utc(t.due_date) >= as_utc(due_after)]
+        result = dated
+
     if text:
         needle = text.lower()
         filtered: list[HasTodoShape] = []
@@ -105,3 +171,22 @@ def filter_todos(
         result = filtered
 
     return result
+
+
+def sort_todos(todos: Sequence[HasTodoShape], sort: str = "id") -> list[HasTodoShape]:
+    """Ordena como Store.search con `sort` (salvo "relevance", que queda por id).
+
+    Desempata siempre por id ascendente; sin due_date van al final.
+    """
+    by_id = sorted(todos, key=lambda t: getattr(t, "id"))
+    if sort == "-id":
+        return by_id[::-1]
+    if sort in ("due_date", "-due_date"):
+        dated = [t for t in by_id if getattr(t, "due_date", None) is not None]
+        undated = [t for t in by_id if getattr(t, "due_date", None) is None]
+        if sort == "due_date":
+            dated = sorted(dated, key=lambda t: (as_utc(t.due_date), t.id))
+        else:
+            dated = sorted(dated, key=lambda t: (-as_utc(t.due_date).timestamp(), t.id))
+        return dated + undated
+    return by_id
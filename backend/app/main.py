@@ -1,23 +1,70 @@
 import os
-from fastapi import FastAPI, Depends, Header, HTTPException
-from fastapi.responses import JSONResponse
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
-from .db import engine, SessionLocal, SQLALCHEMY_DATABASE_URL
-from .models import Base
+from .db import engine, SessionLocal, SQLALCHEMY_DATABASE_URL, peek_async_engine
+from .models import Base, TodoPriority, TodoStatus
 from .config import settings
 from fastapi.middleware.cors import CORSMiddleware
 from .deps import get_store, Store
-from .schemas import TodoIn, TodoOut
-from .logic import normalize_title, validate_new_todo, compute_stats, filter_todos
+from .async_routes import PREFIX as ASYNC_PREFIX, router as async_router
+from .schemas import BatchUpdateIn, BatchUpdateOut, BulkCreateOut, TodoDueOut, TodoIn, TodoOut
+from .logic import normalize_title, is_empty_title
+from .migrations import run_migrations
 from .seed import seed_if_empty
+from .cache import ResponseCacheMiddleware
+from .counters import reconcile
+from .pool import pool_status
+from . import metrics
+from . import query_audit
+from . import changes
+from .export import EXPORT_FIELDS, MEDIA_TYPES, csv_chunks, ndjson_chunks
+from .importer import csv_items, import_items, iter_lines, ndjson_items
+from .api_common import (
+    SearchSort,
+    EXPORT_BATCH_SIZE,
+    IMPORT_CHUNK_SIZE,
+    MAX_BULK_SIZE,
+    MAX_PAGE_SIZE,
+    batch_values,
+    bulk_response,
+    check_bulk_size,
+    check_since,
+    due_cursor,
+    parse_due_cursor,
+    parse_fields,
+    projected_response,
+    projection_columns,
+    split_page,
+    title_error,
+    todos_response,
+)
 from dotenv import load_dotenv
 
 load_dotenv(os.getenv("ENV_FILE", None))
 
 app = FastAPI(title=os.getenv("APP_NAME", "tp05-api"))
 
+# Endpoints de lectura que pasan por la cache de respuestas
+CACHED_PATHS = {
+    "/api/todos",
+    "/api/todos/stats",
+    "/api/todos/search",
+    ASYNC_PREFIX,
+    f"{ASYNC_PREFIX}/stats",
+    f"{ASYNC_PREFIX}/search",
+}
+
+
+# Se registra antes que CORS para quedar "adentro": así no se cachean los
+# headers de CORS, que dependen del Origin de cada request.
+app.add_middleware(ResponseCacheMiddleware, paths=CACHED_PATHS)
+
 origins = os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else ["*"]
 app.add_middleware(
     CORSMiddleware,
@@ -25,9 +72,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Para que el front pueda leer los headers de paginación
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "X-Sync-Version", "ETag"],
 )
+app.add_middleware(query_audit.QueryAuditMiddleware)
+# Último en agregarse = el más externo: mide también la cache y CORS
+app.add_middleware(metrics.MetricsMiddleware)
+
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 # Seed opcional en el primer arranque (no debe tumbar el proceso si falla)
 if settings.SEED_ON_START.lower() == "true":
@@ -47,6 +101,16 @@ def run_seed(x_seed_token: str = Header(default="")):
     return {"ok": True, "env": settings.ENV, **result}
 
 
+@app.post("/admin/reconcile")
+def run_reconcile(fix: bool = False, x_seed_token: str = Header(default="")):
+    """Recalcula los contadores de stats y reporta (o corrige con fix=true) el drift."""
+    if not settings.SEED_TOKEN or x_seed_token != settings.SEED_TOKEN:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    with SessionLocal() as db:
+        result = reconcile(db, fix=fix)
+    return {"env": settings.ENV, **result}
+
+
 @app.get("/")
 def root():
     return {"status": "ok", "message": "tp05-api running"}
@@ -98,8 +162,27 @@ def debug():
         "db_url": db_url,
         "db_path": db_path,
         "db_file_exists": file_exists,
+        "query_audit": query_audit.summary(),
     }
 
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Latencia por ruta y consultas a la DB, en formato Prometheus (ver app.metrics)."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/admin/pool")
+def pool():
+    """Conexiones en uso / libres y esperas del pool, para dimensionarlo bajo carga."""
+    async_engine = peek_async_engine()
+    return {
+        "env": settings.ENV,
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine) if async_engine is not None else None,
+    }
+
+
 @app.get("/admin/touch")
 def touch():
     from .models import Todo
@@ -109,25 +192,191 @@ def touch():
 
 # --- TODOs ---
 @app.get("/api/todos", response_model=list[TodoOut])
-def list_todos(store: Store = Depends(get_store)):
-    return store.list()
+def list_todos(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(default=None, ge=0),
+    since: int | None = Query(default=None, ge=0),
+    fields: str | None = None,
+    store: Store = Depends(get_store),
+):
+    """Lista TODOs ordenados por id.
+
+    - Sin `limit` devuelve todos (compatibilidad con el front actual).
+    - Con `limit` pagina por keyset: si hay más filas, el header
+      `X-Next-Cursor` trae el valor a pasar como `after`.
+    - `fields=id,title` proyecta sólo esas columnas desde la DB.
+    - `since=<versión>` devuelve sólo lo escrito después de esa versión.
+      El header `X-Sync-Version` trae la versión a usar en la próxima
+      sincronización (viene en toda respuesta, también en la lista completa).
+
+    `response_model` queda para el esquema de OpenAPI: las filas de Core se
+    serializan directo (api_common.todos_response), sin validar contra TodoOut.
+    """
+    selected = parse_fields(fields)
+    check_since(since, after, limit)
+    # Se lee antes que las filas: una escritura en el medio, a lo sumo, se
+    # vuelve a mandar en la próxima sincronización (nunca se pierde)
+    sync = {"X-Sync-Version": str(store.row_version())}
+    fetch = limit + 1 if limit is not None else None
+
+    if selected is None:
+        rows, headers = split_page(store.list(after=after, limit=fetch, since=since), limit)
+        return todos_response(rows, {**sync, **headers})
+
+    rows = store.list_fields(projection_columns(selected), after=after, limit=fetch, since=since)
+    rows, headers = split_page(rows, limit)
+    return projected_response(rows, selected, {**sync, **headers})
 
 
 @app.get("/api/todos/stats")
 def todos_stats(store: Store = Depends(get_store)):
-    todos = store.list()
-    return compute_stats(todos)
+    return store.stats()
+
+
+@app.get("/api/todos/stats/advanced")
+def todos_advanced_stats(store: Store = Depends(get_store)):
+    """Mismas métricas que advanced_stats.compute_advanced_stats, resueltas en SQL."""
+    return store.advanced_stats()
+
+
+@app.get("/api/todos/changes")
+async def todo_changes(
+    request: Request,
+    since: int | None = Query(default=None, ge=0),
+    last_event_id: str | None = Header(default=None),
+):
+    """Stream SSE de altas y cambios de TODOs (ver app.changes).
+
+    Eventos `created`, `toggled` y `updated` con {"seq", "todo"}. Para
+    retomar sin perder cambios: `since=<seq>` o el header Last-Event-ID
+    (el navegador lo manda solo al reconectarse). Si no se puede retomar
+    llega un `reset` y hay que recargar /api/todos y /api/todos/stats.
+    """
+    feed = changes.get_feed()
+    after = since
+    if last_event_id:
+        after = feed.parse_event_id(last_event_id)
+    events = changes.stream(
+        feed,
+        after,
+        resume=since is not None or bool(last_event_id),
+        is_disconnected=request.is_disconnected,
+        keepalive=settings.CHANGE_FEED_KEEPALIVE_SECONDS,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Sin buffering en proxies (nginx) para que los eventos lleguen al toque
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/todos/search", response_model=list[TodoOut])
 def search_todos(
     q: str | None = None,
     done: bool | None = None,
+    status: TodoStatus | None = None,
+    priority: TodoPriority | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    sort: SearchSort | None = None,
+    mode: Literal["fts", "substring"] = "substring",
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
     store: Store = Depends(get_store),
 ):
-    todos = store.list()
-    filtered = filter_todos(todos, done=done, text=q)
-    return filtered
+    """Busca por texto (`q`), estado, prioridad y rango de vencimiento, resuelto en la DB.
+
+    - mode=substring (default): semántica de logic.filter_todos, la que
+      espera el frontend (`q=an` encuentra "Comprar pan"), orden por id.
+    - mode=fts: índice de texto por prefijo de palabra, por relevancia.
+    - `due_before` / `due_after` (sin tz se toma UTC) dejan afuera los
+      TODOs sin due_date.
+    - sort: relevance | id | -id | due_date | -due_date.
+    - Con `limit`, si hay más resultados el header `X-Next-Offset` trae
+      el `offset` de la página siguiente.
+    """
+    fetch = limit + 1 if limit is not None else None
+    todos = store.search(
+        q=q,
+        done=done,
+        status=status,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after,
+        sort=sort,
+        mode=mode,
+        limit=fetch,
+        offset=offset,
+    )
+    headers = {}
+    if limit is not None and len(todos) > limit:
+        todos = todos[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    return todos_response(todos, headers)
+
+
+@app.get("/api/todos/overdue", response_model=list[TodoDueOut])
+def list_overdue(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    store: Store = Depends(get_store),
+):
+    """TODOs vencidos (mismo criterio que `overdue` en stats/advanced), por due_date.
+
+    Pagina como /api/todos, pero el cursor de `X-Next-Cursor` es
+    "<due_date>,<id>".
+    """
+    return list_due(response, datetime.now(timezone.utc), limit, after, store)
+
+
+@app.get("/api/todos/due", response_model=list[TodoDueOut])
+def list_due(
+    response: Response,
+    before: datetime,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    store: Store = Depends(get_store),
+):
+    """TODOs no terminados que vencen antes de `before` (sin tz se toma UTC)."""
+    fetch = limit + 1 if limit is not None else None
+    rows = store.due(before, after=parse_due_cursor(after), limit=fetch)
+    rows, headers = split_page(rows, limit, due_cursor)
+    response.headers.update(headers)
+    return rows
+
+
+@app.get("/api/todos/export")
+def export_todos(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    store: Store = Depends(get_store),
+):
+    """Exporta todos los TODOs en streaming (NDJSON o CSV).
+
+    Lee la tabla por lotes con un cursor, así la memoria no crece con la
+    cantidad de filas y el primer byte sale enseguida.
+    """
+    batches = store.iter_batches(list(EXPORT_FIELDS), batch_size=EXPORT_BATCH_SIZE)
+    chunks = csv_chunks(batches) if format == "csv" else ndjson_chunks(batches)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'},
+    )
+
+
+@app.patch("/api/todos/batch", response_model=BatchUpdateOut)
+def update_todos_batch(payload: BatchUpdateIn, store: Store = Depends(get_store)):
+    """Actualiza varios TODOs con un solo UPDATE, en una transacción.
+
+    - op=toggle: invierte `done` de cada uno.
+    - op=set: asigna `done`, `status` y/o `priority`.
+    - Devuelve los TODOs actualizados y los ids que no existen.
+    """
+    values = batch_values(payload)
+    updated, missing = store.update_many(payload.ids, toggle=payload.op == "toggle", values=values)
+    return {"updated": updated, "missing": missing}
 
 
 @app.patch("/api/todos/{todo_id}/toggle", response_model=TodoOut)
@@ -147,19 +396,68 @@ def toggle_todo(todo_id: int, store: Store = Depends(get_store)):
 def create_todo(payload: TodoIn, store: Store = Depends(get_store)):
     normalized = normalize_title(payload.title)
     try:
-        validate_new_todo(normalized, store.list())
+        # Mismas reglas que logic.validate_new_todo, pero el duplicado se
+        # resuelve con el índice de title_normalized en lugar de traer la tabla
+        if is_empty_title(normalized):
+            raise ValueError("empty")
+        if store.title_exists(normalized):
+            raise ValueError("duplicate")
+        todo = store.add(title=normalized, description=payload.description)
     except ValueError as e:
-        code = str(e)
-        if code == "empty":
-            raise HTTPException(status_code=400, detail="title must not be empty")
-        if code == "duplicate":
-            raise HTTPException(status_code=400, detail="title must be unique")
-        raise
-
-    todo = store.add(title=normalized, description=payload.description)
+        raise title_error(e)
+
     return todo
 
 
+@app.post("/api/todos/bulk", response_model=BulkCreateOut)
+def create_todos_bulk(payload: list[TodoIn], store: Store = Depends(get_store)):
+    """Alta de varios TODOs en una sola transacción.
+
+    Aplica las mismas reglas que POST /api/todos (también entre items del
+    mismo lote) y devuelve el resultado de cada item en orden:
+    "created", "empty" o "duplicate".
+    """
+    check_bulk_size(len(payload))
+    items = [(normalize_title(item.title), item.description) for item in payload]
+    try:
+        results = store.add_many(items)
+    except ValueError as e:
+        raise title_error(e)
+    return bulk_response(results)
+
+
+@app.post("/api/todos/import")
+async def import_todos(
+    request: Request,
+    format: Literal["ndjson", "csv"] | None = None,
+    chunk_size: int = Query(default=IMPORT_CHUNK_SIZE, ge=1, le=MAX_BULK_SIZE),
+    store: Store = Depends(get_store),
+):
+    """Importa TODOs desde un body NDJSON o CSV, leído en streaming.
+
+    El formato sale de `format` o, si no viene, del Content-Type
+    (text/csv -> CSV, cualquier otro -> NDJSON). Se commitea cada
+    `chunk_size` registros; si el body es inválido a mitad de camino
+    (p. ej. una línea demasiado larga) los lotes anteriores ya quedaron
+    guardados.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if content_type.startswith("text/csv") else "ndjson"
+
+    lines = iter_lines(request.stream())
+    items = csv_items(lines) if format == "csv" else ndjson_items(lines)
+    try:
+        report = await import_items(items, store.add_many, chunk_size=chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"format": format, **report}
+
+
+# Mismas rutas de TODOs en versión async (ver app.async_routes)
+app.include_router(async_router)
+
+
 if __name__ == "__main__":
     import uvicorn
 
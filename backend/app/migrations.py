@@ -0,0 +1,127 @@
+"""Migraciones livianas e idempotentes sobre la DB.
+
+No usamos Alembic: `Base.metadata.create_all` crea las tablas que faltan,
+pero no agrega columnas ni índices nuevos a una tabla que ya existe (el
+caso de QA/PROD, donde `/home/data/app.db` sobrevive a los redeploys).
+`run_migrations` completa ese hueco y se puede correr en cada arranque.
+"""
+from __future__ import annotations
+
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from . import counters
+from .logic import title_key
+from .models import Base, Todo
+from .search import install_search_index
+
+
+def add_missing_columns(conn: Connection) -> list[str]:
+    """Agrega a `todos` las columnas del modelo que la tabla no tiene."""
+    table = Todo.__table__
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+
+    added: list[str] = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=conn.dialect)}"
+        if column.server_default is not None:
+            default = column.server_default.arg
+            default_sql = default.text if hasattr(default, "text") else f"'{default}'"
+            ddl += f" DEFAULT {default_sql}"
+        conn.execute(text(ddl))
+        added.append(column.name)
+    return added
+
+
+def backfill_title_normalized(conn: Connection) -> int:
+    """Completa `title_normalized` en filas viejas que no lo tienen.
+
+    Si ya hay títulos repetidos (datos previos a la regla de unicidad),
+    sólo el de menor id recibe la clave; el resto queda en NULL para que
+    el índice único se pueda crear igual.
+    """
+    taken = set(
+        conn.execute(
+            select(Todo.title_normalized).where(Todo.title_normalized.is_not(None))
+        ).scalars()
+    )
+    rows = conn.execute(
+        select(Todo.id, Todo.title).where(Todo.title_normalized.is_(None)).order_by(Todo.id)
+    ).all()
+
+    params: list[dict] = []
+    for todo_id, title in rows:
+        key = title_key(title or "")
+        if not key or key in taken:
+            continue
+        taken.add(key)
+        params.append({"todo_id": todo_id, "key": key})
+
+    if params:
+        conn.execute(
+            update(Todo.__table__)
+            .where(Todo.__table__.c.id == bindparam("todo_id"))
+            .values(title_normalized=bindparam("key")),
+            params,
+        )
+    return len(params)
+
+
+def create_missing_indexes(conn: Connection) -> list[str]:
+    """Crea los índices declarados en el modelo que todavía no existen.
+
+    Si creó alguno en SQLite, corre ANALYZE: sin estadísticas el
+    planificador no distingue entre índices parciales parecidos (p. ej. el
+    de due_date y el de due_date de TODOs abiertos).
+    """
+    table = Todo.__table__
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table.name)}
+    created: list[str] = []
+    for index in table.indexes:
+        if index.name in existing:
+            continue
+        try:
+            with conn.begin_nested():
+                index.create(conn)
+            created.append(index.name)
+        except (IntegrityError, OperationalError) as e:
+            # No tumbamos el arranque por un índice; queda registrado en el log
+            print(f"[WARN] could not create index {index.name}: {e.__class__.__name__}")
+    if created and conn.dialect.name == "sqlite":
+        conn.execute(text(f"ANALYZE {table.name}"))
+    return created
+
+
+def migrate(conn: Connection) -> dict:
+    """Deja el esquema de `todos` al día con el modelo. Es idempotente.
+
+    Incluye el índice de búsqueda de texto (ver app.search), los
+    contadores materializados y la secuencia de versiones de fila (ver
+    app.counters). Recibe una conexión
+    para poder correrse también desde un engine async (`run_sync`).
+    """
+    # Tablas nuevas (p. ej. todo_counters) en DBs creadas antes que ellas
+    Base.metadata.create_all(bind=conn)
+    added = add_missing_columns(conn)
+    backfilled = backfill_title_normalized(conn)
+    created_indexes = create_missing_indexes(conn)
+    search_backend = install_search_index(conn)
+    initialized_counters = counters.ensure_initialized(conn)
+    initialized_row_version = counters.ensure_row_version(conn)
+    return {
+        "added_columns": added,
+        "backfilled": backfilled,
+        "created_indexes": created_indexes,
+        "search_backend": search_backend,
+        "initialized_counters": initialized_counters,
+        "initialized_row_version": initialized_row_version,
+    }
+
+
+def run_migrations(engine: Engine) -> dict:
+    """Corre `migrate` en una transacción sobre `engine`."""
+    with engine.begin() as conn:
+        return migrate(conn)
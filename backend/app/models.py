@@ -9,10 +9,14 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum as SAEnum,
+    Index,
     Integer,
     String,
+    text,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, validates
+
+from .logic import title_key
 
 
 class Base(DeclarativeBase):
@@ -43,6 +47,11 @@ class Todo(Base):
     description = Column(String, nullable=True)
     done = Column(Boolean, default=False)
 
+    # Título normalizado + minúsculas (ver logic.title_key). Lo mantiene
+    # el validador de `title`; el índice único permite chequear duplicados
+    # sin traer toda la tabla.
+    title_normalized = Column(String, nullable=True, unique=True, index=True)
+
     # Campos nuevos para estadísticas avanzadas
     priority = Column(
         SAEnum(TodoPriority, name="todo_priority"),
@@ -56,9 +65,53 @@ class Todo(Base):
     )
     due_date = Column(DateTime(timezone=True), nullable=True)
 
+    # Versión de la última escritura sobre la fila, de una secuencia global
+    # (counters.next_row_version). GET /api/todos?since=<versión> devuelve
+    # sólo lo que cambió después.
+    version = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    # Índices para los filtros por done / status / priority / due_date. Los
+    # parciales sólo guardan las filas con due_date; el de "abiertos" es el
+    # que usa overdue (advanced_stats.overdue_condition). Los crea
+    # migrations.create_missing_indexes en DBs existentes.
+    __table_args__ = (
+        Index("ix_todos_done_id", "done", "id"),
+        Index("ix_todos_status_due_date", "status", "due_date"),
+        Index("ix_todos_priority_due_date", "priority", "due_date"),
+        Index(
+            "ix_todos_due_date",
+            "due_date",
+            "id",
+            sqlite_where=text("due_date IS NOT NULL"),
+            postgresql_where=text("due_date IS NOT NULL"),
+        ),
+        Index(
+            "ix_todos_open_due_date",
+            "due_date",
+            "id",
+            sqlite_where=text("due_date IS NOT NULL AND status != 'done'"),
+            postgresql_where=text("due_date IS NOT NULL AND status != 'done'"),
+        ),
+        Index("ix_todos_version_id", "version", "id"),
+    )
+
+    @validates("title")
+    def _sync_title_normalized(self, key: str, value: str) -> str:
+        # Un título vacío no ocupa lugar en el índice único
+        self.title_normalized = title_key(value or "") or None
+        return value
+
     def __repr__(self) -> str:  # opcional, sólo para debug lindo
         return (
             f"Todo(id={self.id!r}, title={self.title!r}, "
             f"done={self.done!r}, priority={self.priority!r}, "
             f"status={self.status!r}, due_date={self.due_date!r})"
         )
+
+
+class TodoCounter(Base):
+    """Contadores materializados de `todos` (ver app.counters)."""
+    __tablename__ = "todo_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
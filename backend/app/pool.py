@@ -0,0 +1,130 @@
+"""Configuración y métricas del pool de conexiones.
+
+`pool_options` arma los kwargs de `create_engine` según la URL y los
+DB_POOL_* de `config.Settings`:
+
+- SQLite en memoria: `StaticPool`. Todos los workers del threadpool tienen
+  que ver la misma DB, que vive en una única conexión. (No usamos
+  `SingletonThreadPool`: daría una DB vacía distinta por thread.)
+- SQLite en archivo: pool con tamaño/overflow/timeout. Pre-ping y recycle
+  no aplican, porque no hay servidor que corte las conexiones.
+- Postgres u otro servidor: todas las opciones.
+
+Los pools son subclases que miden cuánto espera cada checkout y cuántos
+terminan en timeout; `pool_status` lo reporta para /admin/pool.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+
+from .config import settings
+
+
+class PoolStats:
+    """Contadores de espera en el checkout, compartidos entre threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record(self, waited: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """Mide la espera de `_do_get`, que es donde el pool bloquea si está lleno."""
+
+    _stats: PoolStats | None = None
+
+    @property
+    def stats(self) -> PoolStats:
+        if self._stats is None:
+            self._stats = PoolStats()
+        return self._stats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.split("://", 1)[-1] in ("", "/") or ":memory:" in url)
+
+
+def pool_options(url: str, *, is_async: bool = False) -> dict:
+    """kwargs de pool para `create_engine` / `create_async_engine`."""
+    if is_memory_sqlite(url):
+        return {"poolclass": StaticPool}
+
+    options = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if not url.startswith("sqlite"):
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    return options
+
+
+def pool_status(engine: Engine) -> dict:
+    """Estado actual del pool de `engine` más las métricas de espera."""
+    pool = engine.pool
+    status: dict = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "timeout_s": pool.timeout(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        )
+    if isinstance(pool, _TimedPoolMixin):
+        status["waits"] = pool.stats.snapshot()
+    return status
@@ -0,0 +1,197 @@
+"""Auditor de consultas por request: N+1 y consultas lentas.
+
+Con QUERY_AUDIT_ENABLED=true (pensado para desarrollo, QA y tests),
+`QueryAuditMiddleware` anota cada consulta que hace un request y marca:
+
+- formas repetidas: la misma consulta (con los literales y las listas de
+  parámetros colapsados, ver `shape`) ejecutada QUERY_AUDIT_REPEAT_THRESHOLD
+  veces o más en un mismo request. Es la firma de un N+1, p. ej. un
+  refresh por objeto después de un commit;
+- consultas lentas: las que tardan más de QUERY_AUDIT_SLOW_MS.
+
+Los últimos QUERY_AUDIT_HISTORY requests quedan en GET /admin/debug. En
+los tests, el fixture `max_queries` (conftest) usa lo mismo para fijar un
+máximo de consultas por endpoint.
+
+Los hooks se registran siempre en el engine (db.py), pero sólo miden si
+hay un `audit()` activo en el contexto: apagado, el costo por consulta es
+leer un ContextVar.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .metrics import route_label
+
+_enabled = settings.QUERY_AUDIT_ENABLED
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    """Prende / apaga el auditor en caliente (tests)."""
+    global _enabled
+    _enabled = value
+
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROW_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def shape(statement: str) -> str:
+    """Forma de una consulta: sin literales y con las listas de parámetros colapsadas.
+
+    `IN (?, ?, ?)` y `IN (?)` dan la misma forma, igual que los VALUES
+    de un INSERT de varias filas, así que sólo se repite la forma cuando
+    se repite la consulta.
+    """
+    text = _STRING.sub("?", statement)
+    text = _PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _PARAM_LIST.sub("(?)", text)
+    text = _ROW_LIST.sub("(?)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+@dataclass(frozen=True)
+class Query:
+    statement: str
+    ms: float
+
+
+class QueryAudit:
+    """Consultas ejecutadas dentro de un `audit()`."""
+
+    def __init__(self, *, slow_ms: float, repeat_threshold: int):
+        self.slow_ms = slow_ms
+        self.repeat_threshold = repeat_threshold
+        self.queries: list[Query] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def shapes(self) -> Counter:
+        return Counter(shape(query.statement) for query in self.queries)
+
+    def repeated(self) -> dict[str, int]:
+        """Formas ejecutadas `repeat_threshold` veces o más."""
+        return {s: n for s, n in self.shapes().items() if n >= self.repeat_threshold}
+
+    def slow(self) -> list[Query]:
+        return [query for query in self.queries if query.ms >= self.slow_ms]
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "queries": self.count,
+            "total_ms": round(sum(query.ms for query in self.queries), 3),
+            "statements": [{"shape": s, "count": n} for s, n in self.shapes().items()],
+            "repeated": [{"shape": s, "count": n} for s, n in self.repeated().items()],
+            "slow": [
+                {"statement": query.statement, "ms": round(query.ms, 3)} for query in self.slow()
+            ],
+        }
+
+
+_current: ContextVar[Optional[QueryAudit]] = ContextVar("query_audit", default=None)
+
+
+@contextmanager
+def audit(
+    *, slow_ms: float | None = None, repeat_threshold: int | None = None
+) -> Iterator[QueryAudit]:
+    """Anota las consultas que se ejecuten en este contexto (y en los workers que lo copien)."""
+    current = QueryAudit(
+        slow_ms=settings.QUERY_AUDIT_SLOW_MS if slow_ms is None else slow_ms,
+        repeat_threshold=(
+            settings.QUERY_AUDIT_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        ),
+    )
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        context._audit_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_audit_started", None)
+    current = _current.get()
+    if started is None or current is None:
+        return
+    current.queries.append(Query(statement, (time.perf_counter() - started) * 1000))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra los hooks del auditor en `engine` (para uno async, su `sync_engine`)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Requests HTTP ---
+
+_history: "deque[dict[str, Any]]" = deque(maxlen=settings.QUERY_AUDIT_HISTORY)
+
+
+def recent() -> list[dict[str, Any]]:
+    """Reportes de los últimos requests auditados, del más reciente al más viejo."""
+    return list(reversed(_history))
+
+
+def clear() -> None:
+    _history.clear()
+
+
+def summary() -> dict[str, Any]:
+    """Estado del auditor para GET /admin/debug."""
+    return {
+        "enabled": _enabled,
+        "slow_ms": settings.QUERY_AUDIT_SLOW_MS,
+        "repeat_threshold": settings.QUERY_AUDIT_REPEAT_THRESHOLD,
+        "requests": recent(),
+    }
+
+
+class QueryAuditMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with audit() as current:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _history.append(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route_label(scope),
+                        **current.report(),
+                    }
+                )
@@ -1,4 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from .advanced_stats import as_utc
+from .models import TodoPriority, TodoStatus
 
 class TodoOut(BaseModel):
     id: int
@@ -7,6 +13,43 @@ class TodoOut(BaseModel):
     done: bool
     model_config = ConfigDict(from_attributes=True)  
 
+class TodoDueOut(TodoOut):
+    """TodoOut con los campos de vencimiento, para /api/todos/overdue y /due."""
+    due_date: datetime
+    status: TodoStatus
+    priority: TodoPriority
+
+    @field_validator("due_date")
+    @classmethod
+    def _utc(cls, value: datetime) -> datetime:
+        return as_utc(value)
+
+# Campos públicos de un TODO, en el orden en que se serializan
+TODO_FIELDS = tuple(TodoOut.model_fields)
+
 class TodoIn(BaseModel):
     title: str
     description: str | None = None
+
+
+class BulkItemOut(BaseModel):
+    index: int
+    status: Literal["created", "empty", "duplicate"]
+    todo: TodoOut | None = None
+
+class BulkCreateOut(BaseModel):
+    created: int
+    results: list[BulkItemOut]
+
+
+class BatchUpdateIn(BaseModel):
+    ids: list[int]
+    # toggle: invierte done; set: asigna los campos que vengan
+    op: Literal["toggle", "set"]
+    done: bool | None = None
+    status: TodoStatus | None = None
+    priority: TodoPriority | None = None
+
+class BatchUpdateOut(BaseModel):
+    updated: list[TodoOut]
+    missing: list[int]
@@ -0,0 +1,196 @@
+"""Índice de búsqueda de texto para /api/todos/search.
+
+- SQLite: tabla virtual FTS5 `todos_fts` (external content sobre `todos`),
+  sincronizada con triggers de INSERT/UPDATE/DELETE.
+- Postgres: índice GIN sobre un `tsvector` de título + descripción, más
+  índices trigram (pg_trgm) para el modo substring.
+- Cualquier otro caso (o SQLite sin FTS5): modo substring en SQL.
+
+El modo "substring" reproduce la semántica de logic.filter_todos (texto
+contenido en título o descripción, case-insensitive) y queda disponible
+como modo de compatibilidad.
+"""
+from __future__ import annotations
+
+import re
+import weakref
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from .models import Todo
+
+BACKEND_FTS5 = "fts5"
+BACKEND_TSVECTOR = "tsvector"
+BACKEND_SUBSTRING = "substring"
+
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        title, description,
+        content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_ai AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_ad AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_au AFTER UPDATE OF title, description ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+# Debe coincidir textualmente con el índice para que Postgres lo use
+_PG_TSVECTOR_SQL = (
+    "to_tsvector('simple', coalesce(todos.title, '') || ' ' || coalesce(todos.description, ''))"
+)
+
+_PG_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_todos_search_tsv ON todos USING gin ({_PG_TSVECTOR_SQL.replace('todos.', '')})",
+]
+
+# Las expresiones tienen que ser las de apply_substring
+_PG_TRGM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_todos_title_trgm ON todos USING gin (lower(title) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_todos_description_trgm ON todos USING gin (lower(description) gin_trgm_ops)",
+]
+
+_fts_table = table("todos_fts", column("rowid"), column("rank"))
+
+# Backend detectado por engine, para no consultar el catálogo en cada request
+_backends: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+
+def _install_sqlite(conn: Connection) -> str:
+    existed = _has_fts_table(conn)
+    try:
+        with conn.begin_nested():
+            for ddl in _SQLITE_FTS_DDL:
+                conn.execute(text(ddl))
+            if not existed:
+                # Indexa las filas que ya estaban antes de crear la tabla FTS
+                conn.execute(text("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')"))
+    except OperationalError as e:
+        # SQLite compilado sin FTS5
+        print(f"[WARN] FTS5 not available, search falls back to substring: {e.__class__.__name__}")
+        return BACKEND_SUBSTRING
+    return BACKEND_FTS5
+
+
+def _install_postgres(conn: Connection) -> str:
+    for ddl in _PG_DDL:
+        conn.execute(text(ddl))
+    try:
+        with conn.begin_nested():
+            for ddl in _PG_TRGM_DDL:
+                conn.execute(text(ddl))
+    except (OperationalError, ProgrammingError) as e:
+        # Sin permisos para la extensión: el modo substring anda, pero sin índice
+        print(f"[WARN] pg_trgm not available: {e.__class__.__name__}")
+    return BACKEND_TSVECTOR
+
+
+def install_search_index(conn: Connection) -> str:
+    """Crea (si falta) el índice de búsqueda del dialecto. Devuelve el backend."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        backend = _install_sqlite(conn)
+    elif dialect == "postgresql":
+        backend = _install_postgres(conn)
+    else:
+        backend = BACKEND_SUBSTRING
+    _backends[conn.engine] = backend
+    return backend
+
+
+def _has_fts_table(conn: Connection) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'todos_fts'")
+    ).first() is not None
+
+
+def search_backend(bind: Engine | Connection) -> str:
+    """Backend de búsqueda disponible para `bind`.
+
+    Con una Connection la detección usa esa misma conexión: pedir otra al
+    pool mientras se tiene una puede trabarse si el pool está agotado.
+    """
+    engine = bind if isinstance(bind, Engine) else bind.engine
+    backend = _backends.get(engine)
+    if backend is None:
+        if engine.dialect.name == "postgresql":
+            backend = BACKEND_TSVECTOR
+        elif engine.dialect.name == "sqlite":
+            if isinstance(bind, Engine):
+                with bind.connect() as conn:
+                    has_fts = _has_fts_table(conn)
+            else:
+                has_fts = _has_fts_table(bind)
+            backend = BACKEND_FTS5 if has_fts else BACKEND_SUBSTRING
+        else:
+            backend = BACKEND_SUBSTRING
+        _backends[engine] = backend
+    return backend
+
+
+def query_tokens(q: str) -> list[str]:
+    """Palabras de la búsqueda, sin operadores ni puntuación."""
+    return re.findall(r"\w+", q.lower())
+
+
+def apply_substring(stmt, q: str):
+    """Filtro equivalente al de logic.filter_todos, resuelto en SQL."""
+    needle = q.lower()
+    # Las mismas expresiones que los índices trigram de Postgres (_PG_TRGM_DDL),
+    # para que los use. Sin coalesce: una descripción NULL da NULL y la fila
+    # queda afuera, igual que con "" (`q` nunca llega vacío)
+    return stmt.where(
+        or_(
+            func.lower(Todo.title).contains(needle, autoescape=True),
+            func.lower(Todo.description).contains(needle, autoescape=True),
+        )
+    )
+
+
+def apply_fts5(stmt, tokens: list[str]):
+    """MATCH por prefijo de cada palabra (AND). Ordenar con `fts5_relevance`."""
+    match = " ".join(f'"{token}"*' for token in tokens)
+    return (
+        stmt.join(_fts_table, _fts_table.c.rowid == Todo.id)
+        .where(text("todos_fts MATCH :match").bindparams(match=match))
+    )
+
+
+def fts5_relevance():
+    """Orden por relevancia (bm25) de apply_fts5: mejor primero."""
+    return _fts_table.c.rank
+
+
+def _tsquery(tokens: list[str]):
+    return func.to_tsquery(literal_column("'simple'"), " & ".join(f"{t}:*" for t in tokens))
+
+
+def apply_tsvector(stmt, tokens: list[str]):
+    """Equivalente Postgres de apply_fts5. Ordenar con `tsvector_relevance`."""
+    return stmt.where(literal_column(_PG_TSVECTOR_SQL).op("@@")(_tsquery(tokens)))
+
+
+def tsvector_relevance(tokens: list[str]):
+    """Orden por ts_rank de apply_tsvector: mejor primero."""
+    return func.ts_rank(literal_column(_PG_TSVECTOR_SQL), _tsquery(tokens)).desc()
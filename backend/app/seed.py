@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
+from . import cache, changes, counters
 from .models import Todo
+from .sqlite_profile import begin_write, write_lock
 
 DEFAULT_TODOS = [
     {"title": "Seed General", "description": "TP05 ADO", "done": False},
@@ -8,11 +10,23 @@ DEFAULT_TODOS = [
 ]
 
 def seed_if_empty(db: Session) -> dict:
-    count = db.query(Todo).count()
-    if count > 0:
-        return {"inserted": 0, "skipped": True, "existing": count}
+    # Como las escrituras del Store: turno en la cola de escritura y la
+    # transacción abierta antes del conteo, así dos seeds (o un seed y un
+    # alta) no se cruzan en la secuencia de versiones ni en los contadores
+    with write_lock(db.get_bind()):
+        begin_write(db)
+        count = db.query(Todo).count()
+        if count > 0:
+            db.rollback()
+            return {"inserted": 0, "skipped": True, "existing": count}
 
-    for item in DEFAULT_TODOS:
-        db.add(Todo(**item))
-    db.commit()
+        version = counters.next_row_version(db)
+        todos = [Todo(**item, version=version) for item in DEFAULT_TODOS]
+        for todo in todos:
+            db.add(todo)
+        # Los contadores se actualizan en la misma transacción que los inserts
+        counters.record_created(db, todos)
+        db.commit()
+    cache.bump_version()
+    changes.publish(changes.CREATED, todos)
     return {"inserted": len(DEFAULT_TODOS), "skipped": False, "existing": 0}
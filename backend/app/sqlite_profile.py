@@ -0,0 +1,121 @@
+"""Perfil de performance para SQLite (opt-in con SQLITE_PROFILE=performance).
+
+Al abrir cada conexión se aplican:
+
+- journal_mode=WAL: los lectores no bloquean al escritor ni al revés.
+- synchronous=NORMAL: con WAL sigue siendo consistente ante un corte; sólo
+  se pueden perder las últimas transacciones, no corromper la DB.
+- busy_timeout: si otra conexión tiene el lock, esperar en lugar de fallar
+  en el acto con "database is locked".
+- mmap_size / cache_size: lecturas desde memoria en lugar de syscalls.
+
+SQLite admite un solo escritor a la vez. Además, las escrituras del Store
+pasan por una cola FIFO en proceso (`write_lock`): un request escribe
+mientras el resto espera su turno sin reintentar contra el lock de la DB,
+y las lecturas siguen en paralelo.
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+PROFILE_DEFAULT = "default"
+PROFILE_PERFORMANCE = "performance"
+
+
+class WriterQueue:
+    """Lock de escritura que atiende en orden de llegada."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while ticket != self._serving:
+                self._cond.wait()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._serving += 1
+                self._cond.notify_all()
+
+    def waiting(self) -> int:
+        """Escritores en la cola, incluido el que está escribiendo."""
+        with self._cond:
+            return self._next_ticket - self._serving
+
+
+# Cola de escritura por engine (sólo los que tienen el perfil aplicado)
+_writers: "weakref.WeakKeyDictionary[Engine, WriterQueue]" = weakref.WeakKeyDictionary()
+
+
+def performance_pragmas() -> dict[str, object]:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        # Negativo: en KiB en lugar de páginas
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+    }
+
+
+def _set_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in performance_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def apply_profile(engine: Engine, profile: str | None = None, *, serialize_writes: bool = True) -> bool:
+    """Aplica el perfil a `engine` si es SQLite y el perfil es "performance".
+
+    `serialize_writes=False` para el engine async: la cola bloquea el
+    thread, y en el event loop eso frenaría a todos los requests; ahí
+    alcanza con busy_timeout.
+    """
+    profile = (profile or settings.SQLITE_PROFILE).lower()
+    if engine.dialect.name != "sqlite" or profile != PROFILE_PERFORMANCE:
+        return False
+    if not event.contains(engine, "connect", _set_pragmas):
+        event.listen(engine, "connect", _set_pragmas)
+    if serialize_writes and engine not in _writers:
+        _writers[engine] = WriterQueue()
+    return True
+
+
+def begin_write(db) -> None:
+    """En SQLite, abre ya la transacción de escritura (BEGIN IMMEDIATE).
+
+    El driver sólo abre la transacción antes del primer INSERT/UPDATE, así
+    que un SELECT previo lee sin lock y otro escritor puede cambiar esas
+    filas antes de nuestro UPDATE. Es el equivalente a SELECT ... FOR
+    UPDATE, que SQLite no tiene. No hace nada si ya hay una transacción
+    abierta o si la DB no es SQLite.
+    """
+    conn = db.connection()
+    if conn.dialect.name != "sqlite":
+        return
+    if not conn.connection.driver_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def write_lock(engine: Engine) -> ContextManager[None]:
+    """Turno de escritura en la cola de `engine` (no-op si no tiene perfil)."""
+    writer = _writers.get(engine)
+    return writer.hold() if writer is not None else nullcontext()
@@ -0,0 +1,155 @@
+"""Utilidades compartidas por los benchmarks.
+
+Los benchmarks se corren desde `backend/`, por ejemplo:
+
+    python -m benchmarks.bench_stats --rows 1000 100000
+"""
+from __future__ import annotations
+
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import counters
+from app.logic import title_key
+from app.migrations import run_migrations
+from app.models import Base, Todo, TodoPriority, TodoStatus
+
+SEED_BATCH = 10_000
+
+
+def generate_rows(count: int, *, seed: int = 42, start: int = 0) -> Iterator[dict]:
+    """Genera filas de `todos` reproducibles, con una mezcla realista de campos."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    statuses = list(TodoStatus)
+    priorities = list(TodoPriority)
+    for i in range(start, start + count):
+        # Títulos de distintas longitudes para cubrir los tres buckets
+        title = f"Tarea {i}" + " detalle" * rng.randint(0, 4)
+        has_due = rng.random() < 0.5
+        yield {
+            "title": title,
+            "title_normalized": title_key(title),
+            "description": f"Descripción {i}" if rng.random() < 0.6 else None,
+            "done": rng.random() < 0.3,
+            "priority": rng.choice(priorities),
+            "status": rng.choice(statuses),
+            "due_date": now + timedelta(days=rng.randint(-30, 30)) if has_due else None,
+        }
+
+
+def create_sqlite_engine(path: str | None = None) -> Engine:
+    """Engine sobre un archivo SQLite temporal con el esquema de la app."""
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="todos-bench-", suffix=".db")
+        os.close(fd)
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return engine
+
+
+def seed(engine: Engine, count: int, *, seed: int = 42) -> None:
+    """Inserta `count` filas con executemany en lotes, en una sola transacción.
+
+    Como las altas del Store (add_many), cada lote toma la próxima versión
+    de fila de la secuencia `row_version` y suma su delta a los contadores
+    de stats: si no, /api/todos/stats leería ceros y todas las filas
+    quedarían en la versión 0.
+    """
+    batch: list[dict] = []
+    with Session(engine) as db, db.begin():
+        for row in generate_rows(count, seed=seed):
+            batch.append(row)
+            if len(batch) >= SEED_BATCH:
+                _insert(db, batch)
+                batch = []
+        if batch:
+            _insert(db, batch)
+
+
+def _insert(db: Session, batch: list[dict]) -> None:
+    version = counters.next_row_version(db)
+    for row in batch:
+        row["version"] = version
+    db.execute(insert(Todo.__table__), batch)
+    counters.record_created(db, batch)
+
+
+def session_factory(engine: Engine) -> Callable[[], Session]:
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def time_call(fn: Callable[[], object], *, repeat: int = 5) -> dict:
+    """Corre `fn` `repeat` veces y devuelve mediana/min/max en milisegundos."""
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def dispose(engine: Engine) -> None:
+    path = engine.url.database
+    engine.dispose()
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(db_path: str, port: int, **env: str) -> subprocess.Popen:
+    """Levanta uvicorn sobre `db_path`, sin cache de respuestas ni seed; espera a /healthz."""
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "CACHE_BACKEND": "none",
+        "SEED_ON_START": "false",
+        **env,
+    }
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/healthz").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        # Con el pool agotado quedan threads bloqueados que no dejan salir
+        proc.kill()
@@ -0,0 +1,282 @@
+"""Latencia y throughput de las rutas de la API, reproducible entre commits.
+
+    python -m benchmarks.bench_api --rows 1000 100000 1000000
+    python -m benchmarks.bench_api --rows 10000 --mode uvicorn --output antes.json
+    python -m benchmarks.bench_api --rows 10000 --compare antes.json
+
+Por cada cantidad de filas siembra una DB SQLite con INSERTs en lote
+(`_common.seed`, siempre con la misma semilla) y le pega a cada escenario
+de SCENARIOS (list, stats, search, create, toggle, readyz) con
+`--concurrency` clientes durante `--duration` segundos:
+
+- inprocess: la app importada en este proceso, vía ASGI (httpx +
+  ASGITransport), sin red ni servidor. Mide la app sola.
+- uvicorn: la app en un subproceso de uvicorn, por HTTP local. Suma el
+  servidor, el parseo HTTP y el loopback.
+
+La DB se vuelve a sembrar antes de cada modo, porque create y toggle la
+modifican. La cache de respuestas está apagada (CACHE_BACKEND=none): con
+la cache, list y stats medirían hits.
+
+Imprime una línea JSON por (filas, modo, escenario) con p50/p95/p99 en
+milisegundos y req/s. `--output` guarda la corrida completa junto con el
+commit y las versiones; `--compare` la contrasta con una corrida guardada.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+
+# La app resuelve la DB y la cache al importarse: el modo inprocess usa
+# un archivo propio, que se vuelve a sembrar para cada corrida
+DB_PATH = os.path.join(tempfile.gettempdir(), f"todos-bench-api-{os.getpid()}.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["SEED_ON_START"] = "false"
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import itertools  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import random  # noqa: E402
+import sqlite3  # noqa: E402
+import subprocess  # noqa: E402
+import time  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
+from typing import Any, Callable, Iterator  # noqa: E402
+
+import httpx  # noqa: E402
+
+from app.db import engine as app_engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+from ._common import create_sqlite_engine, free_port, seed, start_server, stop_server  # noqa: E402
+
+MODES = ("inprocess", "uvicorn")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Un endpoint a medir. `request(n, rng, rows)` arma (método, url, body) del request n."""
+
+    name: str
+    request: Callable[[int, random.Random, int], tuple[str, str, Any]]
+
+
+def _create(n: int, rng: random.Random, rows: int) -> tuple[str, str, Any]:
+    # Títulos únicos: los duplicados responden 400 sin insertar
+    return "POST", "/api/todos", {"title": f"Bench {n}", "description": "benchmark"}
+
+
+def _toggle(n: int, rng: random.Random, rows: int) -> tuple[str, str, Any]:
+    return "PATCH", f"/api/todos/{rng.randint(1, rows)}/toggle", None
+
+
+SCENARIOS = (
+    Scenario("list", lambda n, rng, rows: ("GET", "/api/todos?limit=50", None)),
+    Scenario("stats", lambda n, rng, rows: ("GET", "/api/todos/stats", None)),
+    Scenario("search", lambda n, rng, rows: ("GET", "/api/todos/search?q=tarea&limit=20", None)),
+    Scenario("create", _create),
+    Scenario("toggle", _toggle),
+    Scenario("readyz", lambda n, rng, rows: ("GET", "/readyz", None)),
+)
+
+
+def percentile(sorted_ms: list[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre muestras ya ordenadas."""
+    index = max(0, min(len(sorted_ms) - 1, round(pct / 100 * len(sorted_ms)) - 1))
+    return round(sorted_ms[index], 3)
+
+
+async def load(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    *,
+    rows: int,
+    concurrency: int,
+    duration: float,
+    seed: int,
+    counter: Iterator[int],
+) -> dict:
+    """`concurrency` clientes repitiendo el escenario durante `duration` segundos.
+
+    `counter` numera los requests (compartido con el calentamiento, para
+    que los títulos de create no se repitan).
+    """
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            method, url, body = scenario.request(next(counter), rng, rows)
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, url, json=body)
+                ok = resp.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    result = {"requests": len(latencies), "errors": errors, "req_per_s": round(len(latencies) / elapsed, 1)}
+    if latencies:
+        for pct in (50, 95, 99):
+            result[f"p{pct}_ms"] = percentile(latencies, pct)
+    return result
+
+
+async def run_scenarios(client: httpx.AsyncClient, args: argparse.Namespace, rows: int) -> list[dict]:
+    results = []
+    for scenario in SCENARIOS:
+        if scenario.name not in args.scenarios:
+            continue
+        counter = itertools.count()
+        # Calentamiento: conexiones del pool, caches de SQLite, imports perezosos
+        await load(
+            client, scenario,
+            rows=rows, concurrency=1, duration=args.warmup, seed=args.seed + 1, counter=counter,
+        )
+        stats = await load(
+            client, scenario,
+            rows=rows, concurrency=args.concurrency, duration=args.duration, seed=args.seed, counter=counter,
+        )
+        results.append({"scenario": scenario.name, "concurrency": args.concurrency, **stats})
+    return results
+
+
+def prepare_db(rows: int, seed_value: int) -> None:
+    """Deja en DB_PATH una DB nueva con `rows` filas."""
+    app_engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    engine = create_sqlite_engine(DB_PATH)
+    try:
+        seed(engine, rows, seed=seed_value)
+    finally:
+        engine.dispose()
+
+
+def run_inprocess(args: argparse.Namespace, rows: int) -> list[dict]:
+    async def run() -> list[dict]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_scenarios(client, args, rows)
+
+    return asyncio.run(run())
+
+
+def run_uvicorn(args: argparse.Namespace, rows: int) -> list[dict]:
+    port = free_port()
+    proc = start_server(DB_PATH, port)
+    try:
+        async def run() -> list[dict]:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+            ) as client:
+                return await run_scenarios(client, args, rows)
+
+        return asyncio.run(run())
+    finally:
+        stop_server(proc)
+
+
+RUNNERS = {"inprocess": run_inprocess, "uvicorn": run_uvicorn}
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def metadata(args: argparse.Namespace) -> dict:
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "sqlite_profile": os.getenv("SQLITE_PROFILE", "default"),
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "seed": args.seed,
+    }
+
+
+def compare(baseline: list[dict], results: list[dict]) -> list[dict]:
+    """Cambio de cada resultado contra la corrida base (misma combinación de filas/modo/escenario)."""
+    key = ("rows", "mode", "scenario")
+    base = {tuple(r[k] for k in key): r for r in baseline}
+    rows = []
+    for result in results:
+        before = base.get(tuple(result[k] for k in key))
+        if before is None:
+            continue
+        row = {k: result[k] for k in key}
+        for metric in ("req_per_s", "p50_ms", "p95_ms", "p99_ms"):
+            if before.get(metric) and metric in result:
+                row[f"{metric}_change_pct"] = round((result[metric] - before[metric]) * 100 / before[metric], 1)
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--mode", choices=(*MODES, "both"), default="both")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=[s.name for s in SCENARIOS], default=[s.name for s in SCENARIOS]
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=5.0, help="segundos por escenario")
+    parser.add_argument("--warmup", type=float, default=0.5, help="segundos de calentamiento por escenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="guarda la corrida (metadatos + resultados) en este JSON")
+    parser.add_argument("--compare", help="JSON de una corrida anterior (--output) contra el cual comparar")
+    args = parser.parse_args()
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    results: list[dict] = []
+    try:
+        for rows in args.rows:
+            for mode in modes:
+                prepare_db(rows, args.seed)
+                for result in RUNNERS[mode](args, rows):
+                    row = {"rows": rows, "mode": mode, **result}
+                    print(json.dumps(row), flush=True)
+                    results.append(row)
+    finally:
+        app_engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(DB_PATH + suffix):
+                os.remove(DB_PATH + suffix)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(args), "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(json.dumps({"compare": args.compare, "baseline_commit": baseline["meta"].get("commit")}))
+        for row in compare(baseline["results"], results):
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
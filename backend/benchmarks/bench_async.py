@@ -0,0 +1,88 @@
+"""Requests/s de las rutas sync (/api/todos) vs. async (/api/async/todos).
+
+Levanta uvicorn en un subproceso sobre una DB temporal sembrada (con la
+cache de respuestas apagada, para medir la DB) y le pega con N clientes
+concurrentes durante unos segundos por combinación:
+
+    python -m benchmarks.bench_async --rows 10000 --concurrency 50 200 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from ._common import create_sqlite_engine, dispose, free_port, seed, start_server, stop_server
+
+# Endpoints que se alternan en cada request; {prefix} es la ruta sync o async
+PATHS = ("{prefix}?limit=50", "{prefix}/stats", "{prefix}/search?q=tarea&limit=20")
+PREFIXES = {"sync": "/api/todos", "async": "/api/async/todos"}
+
+
+async def load(base_url: str, prefix: str, concurrency: int, duration: float) -> dict:
+    """`concurrency` clientes pidiendo en loop durante `duration` segundos."""
+    paths = [p.format(prefix=prefix) for p in PATHS]
+    done = 0
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(offset: int) -> None:
+            nonlocal done, errors
+            i = offset
+            while time.perf_counter() < deadline:
+                try:
+                    resp = await client.get(paths[i % len(paths)])
+                    if resp.status_code == 200:
+                        done += 1
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                i += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {"requests": done, "errors": errors, "req_per_s": round(done / elapsed, 1)}
+
+
+def run(rows: int, concurrency: list[int], duration: float) -> list[dict]:
+    engine = create_sqlite_engine()
+    db_path = engine.url.database
+    port = free_port()
+    try:
+        seed(engine, rows)
+        engine.dispose()
+        proc = start_server(db_path, port)
+        try:
+            results = []
+            for clients in concurrency:
+                row = {"rows": rows, "concurrency": clients}
+                for mode, prefix in PREFIXES.items():
+                    row[mode] = asyncio.run(load(f"http://127.0.0.1:{port}", prefix, clients, duration))
+                results.append(row)
+            return results
+        finally:
+            stop_server(proc)
+    finally:
+        dispose(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for result in run(args.rows, args.concurrency, args.duration):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Estadísticas avanzadas en memoria: loop por objeto vs. motor columnar (NumPy).
+
+    python -m benchmarks.bench_columnar_stats --rows 100000 1000000
+
+Por cada tamaño reporta:
+- per_object: compute_advanced_stats sobre los objetos
+- to_columns: convertir los objetos a columnas (una vez por snapshot)
+- columnar:   compute_advanced_stats_columnar sobre las columnas ya armadas
+
+Antes de medir verifica que ambos motores den exactamente lo mismo.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.advanced_stats import compute_advanced_stats
+from app.columnar_stats import columns_from_todos, compute_advanced_stats_columnar
+from app.models import TodoPriority, TodoStatus
+
+from ._common import generate_rows, time_call
+
+
+@dataclass(slots=True)
+class TodoRow:
+    """Fila liviana con la forma de Todo: 1M de objetos ORM no entran cómodos en memoria."""
+
+    title: str
+    description: Optional[str]
+    status: TodoStatus
+    priority: TodoPriority
+    due_date: Optional[datetime]
+
+
+def snapshot(rows: int) -> list[TodoRow]:
+    return [
+        TodoRow(r["title"], r["description"], r["status"], r["priority"], r["due_date"])
+        for r in generate_rows(rows)
+    ]
+
+
+def run(rows: int, repeat: int) -> dict:
+    todos = snapshot(rows)
+    now = datetime.now(timezone.utc)
+    columns = columns_from_todos(todos)
+
+    expected = compute_advanced_stats(todos, now=now)
+    assert compute_advanced_stats_columnar(columns, now=now) == expected
+
+    per_object = time_call(lambda: compute_advanced_stats(todos, now=now), repeat=repeat)
+    columnar = time_call(lambda: compute_advanced_stats_columnar(columns, now=now), repeat=repeat)
+    return {
+        "rows": rows,
+        "per_object": per_object,
+        "to_columns": time_call(lambda: columns_from_todos(todos), repeat=repeat),
+        "columnar": columnar,
+        "speedup": round(per_object["median_ms"] / columnar["median_ms"], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        print(json.dumps(run(rows, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Costo del middleware de métricas y de los hooks de la DB.
+
+    python -m benchmarks.bench_metrics --rows 1000 --requests 4000
+
+Pide GET /api/todos?limit=50 en proceso (ASGI, sin red) sobre una DB
+temporal sembrada, con la cache de respuestas apagada, alternando
+METRICS on/off por rondas para que el ruido afecte a los dos por igual.
+Reporta la mediana por request de cada modo y el overhead en %.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from app import metrics
+from app.cache import NullCache, get_cache, set_cache
+from app.deps import Store, get_store
+from app.main import app
+
+from ._common import create_sqlite_engine, dispose, seed, session_factory
+
+PATH = "/api/todos?limit=50"
+
+
+async def measure(client: httpx.AsyncClient, requests: int) -> float:
+    """Microsegundos por request (promedio de la ronda)."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        resp = await client.get(PATH)
+        assert resp.status_code == 200
+    return (time.perf_counter() - start) * 1_000_000 / requests
+
+
+async def compare(requests: int, rounds: int) -> dict:
+    samples: dict[str, list[float]] = {"off": [], "on": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await measure(client, 50)  # calentamiento
+        for _ in range(rounds):
+            for mode in ("off", "on"):
+                metrics.set_enabled(mode == "on")
+                samples[mode].append(await measure(client, requests // rounds))
+    off = statistics.median(samples["off"])
+    on = statistics.median(samples["on"])
+    return {
+        "off_us_per_request": round(off, 1),
+        "on_us_per_request": round(on, 1),
+        "overhead_pct": round((on - off) * 100 / off, 2),
+    }
+
+
+def run(rows: int, requests: int, rounds: int) -> dict:
+    engine = create_sqlite_engine()
+    previous_cache, previous_enabled = get_cache(), metrics.enabled()
+    try:
+        seed(engine, rows)
+        metrics.instrument_engine(engine)
+        make_session = session_factory(engine)
+
+        def bench_store():
+            db = make_session()
+            try:
+                yield Store(db)
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_store] = bench_store
+        set_cache(NullCache())
+        return {"rows": rows, "requests": requests, **asyncio.run(compare(requests, rounds))}
+    finally:
+        app.dependency_overrides.clear()
+        set_cache(previous_cache)
+        metrics.set_enabled(previous_enabled)
+        metrics.reset()
+        dispose(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000])
+    parser.add_argument("--requests", type=int, default=4_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        print(json.dumps(run(rows, args.requests, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Camino de lectura de /api/todos: ORM -> Pydantic -> JSON vs. Core -> orjson.
+
+    python -m benchmarks.bench_read_path --rows 1000 10000 100000
+
+Por cada tamaño lee la tabla completa y la serializa como lo hace cada
+camino, sin HTTP en el medio:
+
+- orm_pydantic: Query(Todo).all(), validación contra list[TodoOut]
+  (from_attributes) y json.dumps, como hace FastAPI con response_model.
+- core_orjson: Store.list() (select de Core) y api_common.todos_response.
+
+Reporta la mediana de tiempo, el costo por fila en microsegundos y el pico
+de memoria asignada (tracemalloc) de una corrida.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tracemalloc
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from app.api_common import todos_response
+from app.deps import Store
+from app.models import Todo
+from app.schemas import TodoOut
+
+from ._common import create_sqlite_engine, dispose, seed, session_factory, time_call
+
+_adapter = TypeAdapter(list[TodoOut])
+
+
+def peak_kib(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows: int, repeat: int) -> dict:
+    engine = create_sqlite_engine()
+    try:
+        seed(engine, rows)
+        make_session = session_factory(engine)
+
+        def orm_pydantic() -> bytes:
+            with make_session() as db:
+                todos = db.query(Todo).order_by(Todo.id).all()
+                validated = _adapter.validate_python(todos, from_attributes=True)
+                body = _adapter.dump_python(validated, mode="json")
+                return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+
+        def core_orjson() -> bytes:
+            with make_session() as db:
+                return todos_response(Store(db).list()).body
+
+        assert json.loads(orm_pydantic()) == json.loads(core_orjson())
+
+        result: dict = {"rows": rows}
+        for name, fn in (("orm_pydantic", orm_pydantic), ("core_orjson", core_orjson)):
+            timing = time_call(fn, repeat=repeat)
+            timing["us_per_row"] = round(timing["median_ms"] * 1000 / rows, 2)
+            timing["peak_kib"] = peak_kib(fn)
+            result[name] = timing
+        result["speedup"] = round(result["orm_pydantic"]["median_ms"] / result["core_orjson"]["median_ms"], 2)
+        return result
+    finally:
+        dispose(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        print(json.dumps(run(rows, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
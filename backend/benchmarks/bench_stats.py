@@ -0,0 +1,54 @@
+"""Latencia de /api/todos/stats: agregado SQL vs. hidratar todas las filas.
+
+    python -m benchmarks.bench_stats --rows 1000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+from app.deps import Store
+from app.logic import compute_stats
+from app.models import Todo
+
+from ._common import create_sqlite_engine, dispose, seed, session_factory, time_call
+
+
+def run(rows: int, repeat: int) -> dict:
+    engine = create_sqlite_engine()
+    try:
+        seed(engine, rows)
+        make_session = session_factory(engine)
+
+        def legacy() -> dict:
+            # Camino anterior: hidratar todos los Todo y contar en Python. Se
+            # arma acá y no con Store.list(), que ya no devuelve objetos ORM
+            with make_session() as db:
+                return compute_stats(db.query(Todo).all())
+
+        def aggregated() -> dict:
+            with make_session() as db:
+                return Store(db).stats()
+
+        assert legacy() == aggregated()
+        return {
+            "rows": rows,
+            "legacy": time_call(legacy, repeat=repeat),
+            "sql_aggregate": time_call(aggregated, repeat=repeat),
+        }
+    finally:
+        dispose(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        print(json.dumps(run(rows, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
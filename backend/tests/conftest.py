@@ -1,5 +1,6 @@
 import os
 import sys
+from contextlib import contextmanager
 
 # BASE_DIR = carpeta 'backend'
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -7,3 +8,146 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Aseguramos que 'backend' esté en sys.path
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app import query_audit  # noqa: E402
+from app.cache import get_cache  # noqa: E402
+from app.deps import Store, get_store  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import Base, TodoPriority, TodoStatus  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Cada test arranca con la cache de respuestas vacía.
+
+    Los tests cambian el Store con dependency_overrides, cosa que la cache
+    no puede detectar.
+    """
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+@pytest.fixture
+def db_engine():
+    """Engine SQLite en memoria, aislado por test, con el esquema completo."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def legacy_engine():
+    """DB con el esquema previo a title_normalized (como QA/PROD), sin migrar."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE todos ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " title VARCHAR NOT NULL,"
+            " description VARCHAR,"
+            " done BOOLEAN,"
+            " priority VARCHAR(6) NOT NULL DEFAULT 'medium',"
+            " status VARCHAR(11) NOT NULL DEFAULT 'pending',"
+            " due_date DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO todos (title, done) VALUES"
+            " ('Comprar pan', 0), ('  comprar   PAN ', 0), ('Pagar luz', 1)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def query_plan(db_engine):
+    """query_plan(stmt): detalle de EXPLAIN QUERY PLAN de `stmt` en `db_engine`."""
+
+    def plan(stmt) -> list[str]:
+        compiled = stmt.compile(dialect=db_engine.dialect)
+        params = compiled.construct_params()
+        values = tuple(params[name] for name in compiled.positiontup)
+        # Los Enum se bindean por nombre, como lo haría SQLAlchemy al ejecutar
+        values = tuple(v.name if isinstance(v, (TodoStatus, TodoPriority)) else v for v in values)
+        with db_engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", values).all()
+        return [row[3] for row in rows]
+
+    return plan
+
+
+@pytest.fixture
+def db_session(db_engine):
+    session = sessionmaker(bind=db_engine, autocommit=False, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def store(db_session):
+    """Store real sobre la DB en memoria."""
+    return Store(db_session)
+
+
+@pytest.fixture
+def client(store):
+    """TestClient de la app con get_store apuntando a `store`.
+
+    Los módulos que necesitan datos lo envuelven con su propio `client`,
+    que siembra `store` y devuelve este.
+    """
+    app.dependency_overrides[get_store] = lambda: store
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def max_queries(db_engine):
+    """Falla si algún request del bloque hace más de `limit` consultas a la DB.
+
+        with max_queries(3):
+            client.post("/api/todos", json={"title": "Comprar pan"})
+
+    Usa el auditor de consultas (app.query_audit), así que el mensaje de
+    error lista las consultas del request agrupadas por forma.
+    """
+    query_audit.instrument_engine(db_engine)
+    previous = query_audit.enabled()
+    query_audit.set_enabled(True)
+
+    @contextmanager
+    def check(limit: int):
+        query_audit.clear()
+        yield
+        reports = query_audit.recent()
+        assert reports, "ningún request pasó por el auditor de consultas"
+        for report in reports:
+            statements = "\n".join(f"  {s['count']} x {s['shape']}" for s in report["statements"])
+            assert report["queries"] <= limit, (
+                f"{report['method']} {report['path']} hizo {report['queries']} consultas"
+                f" (máximo {limit}):\n{statements}"
+            )
+
+    yield check
+    query_audit.set_enabled(previous)
+    query_audit.clear()
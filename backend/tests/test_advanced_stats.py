@@ -4,7 +4,11 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from app.advanced_stats import classify_title_length, compute_advanced_stats
+from app.advanced_stats import (
+    classify_title_length,
+    compute_advanced_stats,
+    compute_advanced_stats_sql,
+)
 from app.models import Todo, TodoPriority, TodoStatus
 
 
@@ -208,3 +212,111 @@ def test_compute_advanced_stats_mixed_everything() -> None:
     assert stats["high_priority"] == 2
     # overdue: los dos primeros (no done y due_date pasada)
     assert stats["overdue"] == 2
+
+
+# --- Versión SQL (compute_advanced_stats_sql) contra la referencia en Python ---
+
+
+def _db_stats_match_python(store, db_session) -> dict:
+    python_stats = compute_advanced_stats(db_session.query(Todo).all())
+    sql_stats = compute_advanced_stats_sql(db_session)
+    assert sql_stats == python_stats
+    return sql_stats
+
+
+def test_sql_advanced_stats_empty_table(store, db_session) -> None:
+    stats = _db_stats_match_python(store, db_session)
+    assert all(value == 0 for value in stats.values())
+
+
+def test_sql_advanced_stats_matches_python_edge_cases(store, db_session) -> None:
+    now = datetime.now(timezone.utc)
+    titles = [
+        "",
+        "abcd",
+        "abcdefghij",
+        "abcdefghijk",
+        "a" * 25,
+        "a" * 26,
+        "   con espacios   ",
+        "\tcon tab\n",
+        "uno dos tres cuatro cinco seis",
+        "ñandú acentuado más largo que diez",
+    ]
+    descriptions = [None, "", " ", "\n\t", "algo", "  algo  "]
+    due_dates = [
+        None,
+        now - timedelta(days=1),
+        now + timedelta(days=1),
+        # con otra tz: se guarda sin offset y ambas versiones la leen como UTC
+        datetime(2000, 1, 1, tzinfo=timezone(timedelta(hours=-3))),
+    ]
+    statuses = list(TodoStatus)
+    priorities = list(TodoPriority)
+
+    for i, title in enumerate(titles):
+        db_session.add(
+            make_todo(
+                title=title,
+                description=descriptions[i % len(descriptions)],
+                status=statuses[i % len(statuses)],
+                priority=priorities[i % len(priorities)],
+                due_date=due_dates[i % len(due_dates)],
+            )
+        )
+    db_session.commit()
+
+    stats = _db_stats_match_python(store, db_session)
+    assert stats["total"] == len(titles)
+
+
+def test_sql_advanced_stats_matches_python_random_dataset(store, db_session) -> None:
+    import random
+
+    rng = random.Random(1234)
+    now = datetime.now(timezone.utc)
+    for i in range(300):
+        title = f"t{i}" + " x" * rng.randint(0, 15) + "y" * rng.randint(0, 20)
+        db_session.add(
+            make_todo(
+                title=title,
+                description=rng.choice([None, "", "desc", "  "]),
+                status=rng.choice(list(TodoStatus)),
+                priority=rng.choice(list(TodoPriority)),
+                due_date=rng.choice([None, now + timedelta(hours=rng.randint(-500, 500))]),
+            )
+        )
+    db_session.commit()
+
+    _db_stats_match_python(store, db_session)
+
+
+def test_advanced_stats_endpoint(store, db_session) -> None:
+    from fastapi.testclient import TestClient
+
+    from app.deps import get_store
+    from app.main import app
+
+    from app import counters
+
+    todos = [
+        make_todo(title="A", priority=TodoPriority.high),
+        make_todo(title="B", status=TodoStatus.done),
+    ]
+    db_session.add_all(todos)
+    counters.record_created(db_session, todos)
+    db_session.commit()
+
+    app.dependency_overrides[get_store] = lambda: store
+    try:
+        with TestClient(app) as client:
+            resp = client.get("/api/todos/stats/advanced")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body == compute_advanced_stats(db_session.query(Todo).all())
+    assert body["total"] == 2
+    assert body["high_priority"] == 1
+    assert body["done"] == 1
@@ -0,0 +1,114 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import counters
+from app.async_store import AsyncStore, get_async_store
+from app.db import to_async_url
+from app.deps import Store, get_store
+from app.main import app
+from app.migrations import run_migrations
+from app.models import Base
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """DB en archivo: el engine sync y el async tienen que ver los mismos datos."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with sessionmaker(bind=engine)() as db:
+        Store(db).add(title="Comprar pan", description="integral")
+        Store(db).add(title="Pagar luz")
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def client(db_url):
+    sync_engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    # NullPool: TestClient puede usar un event loop distinto en cada request
+    async_engine = create_async_engine(to_async_url(db_url), poolclass=NullPool)
+    make_session = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def sync_store():
+        with sessionmaker(bind=sync_engine)() as db:
+            yield Store(db)
+
+    async def async_store():
+        async with make_session() as db:
+            yield AsyncStore(db)
+
+    app.dependency_overrides[get_store] = sync_store
+    app.dependency_overrides[get_async_store] = async_store
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+    sync_engine.dispose()
+
+
+def test_to_async_url_picks_async_drivers():
+    assert to_async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "?limit=1", "?limit=1&after=1", "?fields=id,title"],
+)
+def test_list_matches_sync_route(client, query):
+    sync = client.get(f"/api/todos{query}")
+    async_ = client.get(f"/api/async/todos{query}")
+
+    assert async_.status_code == 200
+    assert async_.json() == sync.json()
+    assert async_.headers.get("X-Next-Cursor") == sync.headers.get("X-Next-Cursor")
+
+
+def test_stats_and_search_match_sync_routes(client):
+    for path in ("/stats", "/stats/advanced", "/search?q=pan", "/search?q=luz&mode=substring", "/overdue"):
+        assert client.get(f"/api/async/todos{path}").json() == client.get(f"/api/todos{path}").json()
+
+
+def test_create_toggle_and_bulk(client):
+    created = client.post("/api/async/todos", json={"title": "  Lavar   auto "})
+    assert created.status_code == 201
+    assert created.json()["title"] == "Lavar auto"
+
+    dup = client.post("/api/async/todos", json={"title": "lavar AUTO"})
+    assert dup.status_code == 400
+    assert dup.json()["detail"] == "title must be unique"
+
+    toggled = client.patch(f"/api/async/todos/{created.json()['id']}/toggle")
+    assert toggled.json()["done"] is True
+    assert client.patch("/api/async/todos/999/toggle").status_code == 404
+
+    bulk = client.post("/api/async/todos/bulk", json=[{"title": "X"}, {"title": "x"}, {"title": " "}])
+    assert [r["status"] for r in bulk.json()["results"]] == ["created", "duplicate", "empty"]
+
+    assert client.get("/api/todos/stats").json() == {"total": 4, "done": 1, "pending": 3}
+
+
+def test_async_writes_keep_counters_in_sync(client, db_url):
+    client.post("/api/async/todos/bulk", json=[{"title": "A", "description": "d"}, {"title": "B"}])
+    client.patch("/api/async/todos/1/toggle")
+
+    engine = create_engine(db_url)
+    with sessionmaker(bind=engine)() as db:
+        assert counters.reconcile(db)["ok"] is True
+    engine.dispose()
+
+
+def test_batch_update(client):
+    body = client.patch(
+        "/api/async/todos/batch", json={"ids": [2, 1, 9], "op": "set", "done": True, "priority": "high"}
+    ).json()
+
+    assert [t["id"] for t in body["updated"]] == [2, 1]
+    assert body["missing"] == [9]
+    assert client.get("/api/todos/stats/advanced").json()["high_priority"] == 2
@@ -0,0 +1,82 @@
+import pytest
+
+from app import counters
+from app.main import MAX_BULK_SIZE
+from app.models import Todo, TodoPriority, TodoStatus
+
+
+@pytest.fixture
+def seeded(store):
+    store.add_many([("A", None), ("B", "desc"), ("C", None)])
+    store.toggle(2)
+    return store
+
+
+@pytest.fixture
+def client(client, seeded):
+    return client
+
+
+def test_update_many_toggles_and_reports_missing(seeded, db_session):
+    updated, missing = seeded.update_many([3, 99, 2, 3], toggle=True)
+
+    assert [(row.id, row.done) for row in updated] == [(3, True), (2, False)]
+    assert missing == [99]
+    assert counters.reconcile(db_session)["ok"] is True
+
+
+def test_update_many_sets_status_and_priority(seeded, db_session):
+    updated, missing = seeded.update_many(
+        [1, 2], values={"status": TodoStatus.in_progress, "priority": TodoPriority.high}
+    )
+
+    assert missing == []
+    assert {(t.status, t.priority) for t in db_session.query(Todo).filter(Todo.id.in_([1, 2]))} == {
+        (TodoStatus.in_progress, TodoPriority.high)
+    }
+    assert seeded.advanced_stats()["in_progress"] == 2
+    assert seeded.advanced_stats()["high_priority"] == 2
+    assert counters.reconcile(db_session)["ok"] is True
+
+
+def test_update_many_with_only_missing_ids_changes_nothing(seeded, db_session):
+    assert seeded.update_many([98, 99], values={"done": True}) == ([], [98, 99])
+    assert seeded.stats() == {"total": 3, "done": 1, "pending": 2}
+
+
+def test_batch_endpoint_sets_done(client):
+    resp = client.patch("/api/todos/batch", json={"ids": [1, 2, 3, 7], "op": "set", "done": True})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [t["id"] for t in body["updated"]] == [1, 2, 3]
+    assert all(t["done"] for t in body["updated"])
+    assert body["missing"] == [7]
+    assert client.get("/api/todos/stats").json() == {"total": 3, "done": 3, "pending": 0}
+
+
+def test_batch_endpoint_toggle(client):
+    body = client.patch("/api/todos/batch", json={"ids": [1, 2], "op": "toggle"}).json()
+
+    assert [(t["id"], t["done"]) for t in body["updated"]] == [(1, True), (2, False)]
+
+
+@pytest.mark.parametrize(
+    "payload, detail",
+    [
+        ({"ids": [1], "op": "set"}, "nothing to update"),
+        ({"ids": [1], "op": "toggle", "done": True}, "toggle does not take values"),
+        ({"ids": list(range(MAX_BULK_SIZE + 1)), "op": "toggle"}, f"at most {MAX_BULK_SIZE} todos per request"),
+    ],
+)
+def test_batch_endpoint_rejects_invalid_payloads(client, payload, detail):
+    resp = client.patch("/api/todos/batch", json=payload)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == detail
+
+
+def test_batch_endpoint_validates_enums(client):
+    resp = client.patch("/api/todos/batch", json={"ids": [1], "op": "set", "status": "archived"})
+
+    assert resp.status_code == 422
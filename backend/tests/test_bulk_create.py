@@ -0,0 +1,74 @@
+import pytest
+
+from app import counters
+from app.main import MAX_BULK_SIZE
+from app.models import Todo
+
+
+@pytest.fixture
+def client(client, store):
+    store.add(title="Comprar pan")
+    return client
+
+
+def test_add_many_inserts_in_order_and_reports_per_item(store, db_session):
+    results = store.add_many([("A", "desc a"), ("", None), ("B", None), ("a", None)])
+
+    assert [code for code, _ in results] == ["created", "empty", "created", "duplicate"]
+    created = [todo for _, todo in results if todo is not None]
+    assert [t.title for t in created] == ["A", "B"]
+    assert created[0].id < created[1].id
+    assert created[0].description == "desc a"
+    assert created[0].done is False
+    assert {t.title_normalized for t in db_session.query(Todo)} == {"a", "b"}
+
+
+def test_add_many_updates_counters(store, db_session):
+    store.add_many([("A", None), ("B", "desc")])
+
+    assert counters.reconcile(db_session)["ok"] is True
+    assert store.stats() == {"total": 2, "done": 0, "pending": 2}
+
+
+def test_add_many_with_nothing_valid_creates_nothing(store, db_session):
+    results = store.add_many([("", None), ("  ", None)])
+
+    assert [code for code, _ in results] == ["empty", "empty"]
+    assert db_session.query(Todo).count() == 0
+
+
+def test_bulk_endpoint_normalizes_and_reports_results(client):
+    resp = client.post(
+        "/api/todos/bulk",
+        json=[
+            {"title": "  Pagar   luz  ", "description": "antes del 10"},
+            {"title": "   "},
+            {"title": "COMPRAR pan"},
+            {"title": "pagar luz"},
+            {"title": "Lavar auto"},
+        ],
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 2
+    assert [r["status"] for r in body["results"]] == [
+        "created",
+        "empty",
+        "duplicate",
+        "duplicate",
+        "created",
+    ]
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3, 4]
+    assert body["results"][0]["todo"]["title"] == "Pagar luz"
+    assert body["results"][0]["todo"]["description"] == "antes del 10"
+    assert body["results"][1]["todo"] is None
+
+    titles = [t["title"] for t in client.get("/api/todos").json()]
+    assert titles == ["Comprar pan", "Pagar luz", "Lavar auto"]
+
+
+def test_bulk_endpoint_rejects_oversized_batches(client):
+    resp = client.post("/api/todos/bulk", json=[{"title": f"t{i}"} for i in range(MAX_BULK_SIZE + 1)])
+
+    assert resp.status_code == 400
@@ -0,0 +1,201 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app import cache
+from app.cache import (
+    CachedResponse,
+    MemoryCache,
+    NullCache,
+    ResponseCacheMiddleware,
+    cache_key,
+    etag_matches,
+)
+
+
+def entry(body: bytes = b"[]") -> CachedResponse:
+    return CachedResponse(body=body, etag=cache.make_etag(body))
+
+
+# --- MemoryCache ---
+
+
+def test_memory_cache_evicts_least_recently_used():
+    c = MemoryCache(max_entries=2, ttl=60)
+    c.set("a", entry(b"a"))
+    c.set("b", entry(b"b"))
+    c.get("a")  # "a" pasa a ser la más reciente
+    c.set("c", entry(b"c"))
+
+    assert c.get("b") is None
+    assert c.get("a").body == b"a"
+    assert c.get("c").body == b"c"
+
+
+def test_memory_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    c = MemoryCache(max_entries=10, ttl=5)
+    c.set("a", entry())
+
+    now[0] += 4
+    assert c.get("a") is not None
+    now[0] += 2
+    assert c.get("a") is None
+
+
+def test_memory_cache_bump_changes_version():
+    c = MemoryCache()
+    before = c.version()
+    c.bump()
+    assert c.version() != before
+
+
+def test_cache_key_ignores_param_order():
+    assert cache_key("1", "/api/todos", "b=2&a=1") == cache_key("1", "/api/todos", "a=1&b=2")
+    assert cache_key("1", "/api/todos", "") != cache_key("2", "/api/todos", "")
+
+
+def test_cache_key_only_uses_declared_params():
+    params = {"limit", "after"}
+
+    assert cache_key("1", "/api/todos", "limit=5&x=1", params) == cache_key("1", "/api/todos", "limit=5", params)
+    assert cache_key("1", "/api/todos", "limit=5", params) != cache_key("1", "/api/todos", "limit=6", params)
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"x"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+# --- Middleware ---
+
+
+@pytest.fixture
+def client(client, store):
+    store.add(title="Comprar pan")
+    return client
+
+
+def test_second_read_is_served_from_cache(client):
+    first = client.get("/api/todos")
+    second = client.get("/api/todos")
+
+    assert first.headers["X-Cache"] == "miss"
+    assert second.headers["X-Cache"] == "hit"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get("/api/todos/stats").headers["ETag"]
+
+    resp = client.get("/api/todos/stats", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+    assert resp.headers["Cache-Control"] == "no-cache"
+
+
+def test_writes_invalidate_cached_reads(client):
+    stats_before = client.get("/api/todos/stats")
+    list_before = client.get("/api/todos")
+    assert client.get("/api/todos").headers["X-Cache"] == "hit"
+
+    client.post("/api/todos", json={"title": "Pagar luz"})
+    stats_after = client.get("/api/todos/stats", headers={"If-None-Match": stats_before.headers["ETag"]})
+    list_after = client.get("/api/todos")
+
+    assert stats_after.status_code == 200
+    assert stats_after.json()["total"] == 2
+    assert list_before.headers["X-Cache"] == "miss"
+    assert list_after.headers["X-Cache"] == "miss"
+    assert len(list_after.json()) == 2
+
+    client.patch("/api/todos/1/toggle")
+    assert client.get("/api/todos/stats").json()["done"] == 1
+
+
+def test_pagination_headers_are_cached_too(client):
+    client.post("/api/todos", json={"title": "Pagar luz"})
+    client.get("/api/todos", params={"limit": 1})
+
+    resp = client.get("/api/todos", params={"limit": 1})
+
+    assert resp.headers["X-Cache"] == "hit"
+    assert resp.headers["X-Next-Cursor"] == "1"
+
+
+def test_errors_are_not_cached(client):
+    client.get("/api/todos", params={"fields": "nope"})
+
+    resp = client.get("/api/todos", params={"fields": "nope"})
+
+    assert resp.status_code == 400
+    assert "X-Cache" not in resp.headers
+
+
+def test_null_cache_still_sends_etags(client):
+    previous = cache.get_cache()
+    cache.set_cache(NullCache())
+    try:
+        first = client.get("/api/todos")
+        second = client.get("/api/todos", headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        cache.set_cache(previous)
+
+    assert first.headers["X-Cache"] == "miss"
+    assert second.status_code == 304
+
+
+def test_undeclared_params_share_one_entry(client):
+    responses = [client.get("/api/todos", params={"junk": i}) for i in range(5)]
+
+    assert [r.headers["X-Cache"] for r in responses] == ["miss", "hit", "hit", "hit", "hit"]
+    assert len(cache.get_cache()) == 1
+
+
+def test_declared_params_get_their_own_entry(client):
+    client.get("/api/todos", params={"limit": 1})
+
+    assert client.get("/api/todos", params={"limit": 2}).headers["X-Cache"] == "miss"
+    assert client.get("/api/todos", params={"limit": 1, "junk": "x"}).headers["X-Cache"] == "hit"
+
+
+def test_large_bodies_are_not_cached():
+    small = FastAPI()
+
+    @small.get("/big")
+    def big(size: int = 100):
+        return PlainTextResponse("x" * size)
+
+    small.add_middleware(ResponseCacheMiddleware, paths={"/big"}, max_body_bytes=50)
+    with TestClient(small) as c:
+        first = c.get("/big")
+        second = c.get("/big")
+        fits = [c.get("/big", params={"size": 10}) for _ in range(2)]
+
+    assert first.text == "x" * 100
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("skip", "skip")
+    assert "ETag" not in second.headers
+    assert [r.headers["X-Cache"] for r in fits] == ["miss", "hit"]
+
+
+def test_streams_pass_through_untouched(client):
+    resp = client.get("/api/todos/export")
+
+    assert resp.status_code == 200
+    assert "X-Cache" not in resp.headers
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app import changes, counters
+from app.changes import ChangeFeed
+from app.main import todo_changes
+from app.seed import DEFAULT_TODOS, seed_if_empty
+
+
+@pytest.fixture
+def feed():
+    """Feed propio por test, para que los números de secuencia arranquen en 0."""
+    previous = changes.get_feed()
+    fresh = ChangeFeed(max_events=100)
+    changes.set_feed(fresh)
+    yield fresh
+    changes.set_feed(previous)
+
+
+class Row:
+    def __init__(self, todo_id: int, title: str = "t", done: bool = False):
+        self.id = todo_id
+        self.title = title
+        self.description = None
+        self.done = done
+
+
+def disconnect_after(polls: int):
+    """is_disconnected que devuelve True a partir de la consulta número `polls`."""
+    calls = {"n": 0}
+
+    async def is_disconnected() -> bool:
+        calls["n"] += 1
+        return calls["n"] > polls
+
+    return is_disconnected
+
+
+def collect(feed, after, *, resume=False, polls=1, keepalive=0.01) -> list[str]:
+    async def run() -> list[str]:
+        events = changes.stream(
+            feed, after, resume=resume, is_disconnected=disconnect_after(polls), keepalive=keepalive
+        )
+        return [message async for message in events]
+
+    return asyncio.run(run())
+
+
+def parse(messages: list[str]) -> list[tuple[str, dict]]:
+    """(event, data) de cada mensaje SSE con datos, en orden."""
+    parsed = []
+    for message in messages:
+        fields = dict(line.split(": ", 1) for line in message.strip().split("\n") if ": " in line)
+        if "event" in fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def test_store_writes_publish_changes_in_order(store, feed):
+    first = store.add("Comprar pan")
+    store.add_many([("Pagar luz", None), ("Comprar pan", None), ("Lavar auto", "hoy")])
+    store.toggle(first.id)
+    store.update_many([2, 3], toggle=False, values={"done": True})
+    store.update_many([2], toggle=True)
+
+    published = feed.since(0)
+
+    assert [(c.seq, c.kind, c.todo["id"]) for c in published] == [
+        (1, "created", 1),
+        (2, "created", 2),
+        (3, "created", 3),
+        (4, "toggled", 1),
+        (5, "updated", 2),
+        (6, "updated", 3),
+        (7, "toggled", 2),
+    ]
+    assert published[2].todo == {"id": 3, "title": "Lavar auto", "description": "hoy", "done": False}
+    assert published[3].todo["done"] is True
+    assert published[6].todo["done"] is False
+
+
+def test_failed_writes_publish_nothing(store, feed):
+    store.add("Comprar pan")
+    with pytest.raises(ValueError):
+        store.add("comprar PAN")
+    store.toggle(999)
+    store.add_many([("Comprar pan", None)])
+
+    assert feed.last_seq == 1
+
+
+def test_seed_publishes_created_rows(db_session, feed):
+    seed_if_empty(db_session)
+
+    published = feed.since(0)
+
+    assert [c.kind for c in published] == ["created"] * len(DEFAULT_TODOS)
+    assert [c.todo["title"] for c in published] == [item["title"] for item in DEFAULT_TODOS]
+    assert all(c.todo["id"] for c in published)
+
+
+def test_reconcile_fix_publishes_reset(store, db_session, feed):
+    store.add("Comprar pan")
+    db_session.execute(text("UPDATE todo_counters SET value = 7 WHERE name = 'total'"))
+    db_session.commit()
+
+    counters.reconcile(db_session)
+    assert feed.last_seq == 1
+    counters.reconcile(db_session, fix=True)
+
+    assert parse(collect(feed, 1, resume=True)) == [("reset", {"seq": 2})]
+
+
+def test_since_detects_gaps_outside_the_buffer():
+    feed = ChangeFeed(max_events=3)
+    feed.publish("created", [Row(i) for i in range(1, 6)])
+
+    assert [c.seq for c in feed.since(2)] == [3, 4, 5]
+    assert feed.since(5) == []
+    assert feed.since(1) is None
+    assert feed.since(6) is None
+
+
+def test_event_ids_belong_to_their_feed():
+    feed = ChangeFeed()
+
+    assert feed.parse_event_id(feed.event_id(42)) == 42
+    assert feed.parse_event_id(ChangeFeed().event_id(42)) is None
+    assert feed.parse_event_id("basura") is None
+
+
+def test_stream_starts_with_ready_then_keepalive(feed):
+    feed.publish("created", [Row(1)])
+
+    messages = collect(feed, None)
+
+    assert messages[0] == "retry: 3000\n\n"
+    assert parse(messages) == [("ready", {"seq": 1})]
+    assert f"id: {feed.event_id(1)}" in messages[1]
+    assert messages[-1] == ": keepalive\n\n"
+
+
+def test_stream_resumes_after_sequence(feed):
+    feed.publish("created", [Row(1), Row(2, "dos")])
+    feed.publish("toggled", [Row(1, done=True)])
+
+    messages = collect(feed, 1, resume=True)
+
+    assert parse(messages) == [
+        ("created", {"seq": 2, "todo": {"id": 2, "title": "dos", "description": None, "done": False}}),
+        ("toggled", {"seq": 3, "todo": {"id": 1, "title": "t", "description": None, "done": True}}),
+    ]
+    assert f"id: {feed.event_id(3)}" in messages[-1]
+
+
+def test_stream_sends_reset_when_it_cannot_resume():
+    feed = ChangeFeed(max_events=2)
+    feed.publish("created", [Row(i) for i in range(1, 5)])
+
+    assert parse(collect(feed, 0, resume=True)) == [("reset", {"seq": 4})]
+    assert parse(collect(feed, None, resume=True)) == [("reset", {"seq": 4})]
+
+
+def test_stream_wakes_up_on_publish_from_another_thread(feed):
+    async def run() -> tuple[list[str], float]:
+        events = changes.stream(
+            feed, None, resume=False, is_disconnected=disconnect_after(2), keepalive=30
+        )
+        received = [await events.__anext__(), await events.__anext__()]
+        start = time.monotonic()
+        threading.Timer(0.05, feed.publish, args=("created", [Row(7)])).start()
+        received.append(await events.__anext__())
+        await events.aclose()
+        return received, time.monotonic() - start
+
+    received, waited = asyncio.run(run())
+
+    assert parse(received)[-1] == (
+        "created",
+        {"seq": 1, "todo": {"id": 7, "title": "t", "description": None, "done": False}},
+    )
+    assert waited < 5
+
+
+def test_changes_endpoint_resumes_from_last_event_id(feed):
+    feed.publish("created", [Row(1), Row(2)])
+
+    class FakeRequest:
+        is_disconnected = staticmethod(disconnect_after(1))
+
+    async def run():
+        response = await todo_changes(FakeRequest(), since=0, last_event_id=feed.event_id(1))
+        return response, [chunk async for chunk in response.body_iterator]
+
+    response, messages = asyncio.run(run())
+
+    assert response.media_type == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    # Last-Event-ID (lo que manda el navegador al reconectar) manda sobre `since`
+    assert [data["seq"] for _, data in parse(messages)] == [2]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.advanced_stats import compute_advanced_stats
+from app.models import Todo, TodoPriority, TodoStatus
+
+np = pytest.importorskip("numpy")
+
+from app.columnar_stats import (  # noqa: E402
+    columns_from_todos,
+    compute_advanced_stats_columnar,
+    load_columns,
+)
+
+NOW = datetime(2025, 6, 1, 12, tzinfo=timezone.utc)
+
+TITLES = [
+    "",
+    "abcd",
+    "abcdefghij",
+    "abcdefghijk",
+    "a" * 25,
+    "a" * 26,
+    "   con espacios   ",
+    "\tcon tab\n",
+    "uno dos tres cuatro cinco seis",
+    "ñandú acentuado más largo que diez",
+    "doce letras x",
+]
+DESCRIPTIONS = [None, "", " ", "\n\t", "algo", "  algo  "]
+DUE_DATES = [
+    None,
+    NOW - timedelta(days=1),
+    NOW + timedelta(days=1),
+    # sin tz: se toma como UTC
+    datetime(2025, 6, 1, 11, 59),
+    # con otra tz: 2025-06-01 12:30 UTC, todavía no venció
+    datetime(2025, 6, 1, 9, 30, tzinfo=timezone(timedelta(hours=-3))),
+]
+
+
+def edge_case_todos(repeat: int = 3) -> list[Todo]:
+    statuses = list(TodoStatus)
+    priorities = list(TodoPriority)
+    return [
+        Todo(
+            title=title,
+            description=DESCRIPTIONS[i % len(DESCRIPTIONS)],
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+            due_date=DUE_DATES[i % len(DUE_DATES)],
+        )
+        for i, title in enumerate(TITLES * repeat)
+    ]
+
+
+def random_todos(count: int, seed: int = 99) -> list[Todo]:
+    rng = random.Random(seed)
+    return [
+        Todo(
+            title=f"t{i}" + " x" * rng.randint(0, 15) + "y" * rng.randint(0, 20),
+            description=rng.choice([None, "", "desc", "  "]),
+            status=rng.choice(list(TodoStatus)),
+            priority=rng.choice(list(TodoPriority)),
+            due_date=rng.choice([None, NOW + timedelta(hours=rng.randint(-500, 500))]),
+        )
+        for i in range(count)
+    ]
+
+
+def test_columnar_stats_empty() -> None:
+    stats = compute_advanced_stats_columnar(columns_from_todos([]), now=NOW)
+    assert stats == compute_advanced_stats([], now=NOW)
+    assert all(value == 0 for value in stats.values())
+
+
+@pytest.mark.parametrize("todos", [edge_case_todos(), random_todos(2000)], ids=["edge", "random"])
+def test_columnar_stats_match_per_object_loop(todos) -> None:
+    columns = columns_from_todos(todos)
+
+    assert len(columns) == len(todos)
+    assert compute_advanced_stats_columnar(columns, now=NOW) == compute_advanced_stats(todos, now=NOW)
+
+
+def test_columnar_stats_count_unsaved_todos_without_status() -> None:
+    # Recién instanciado, sin status ni priority: no suma a ningún estado
+    todos = [Todo(title="sin guardar", due_date=NOW - timedelta(hours=1))]
+
+    stats = compute_advanced_stats_columnar(columns_from_todos(todos), now=NOW)
+
+    assert stats == compute_advanced_stats(todos, now=NOW)
+    assert stats["pending"] + stats["in_progress"] + stats["done"] == 0
+    assert stats["overdue"] == 1
+
+
+def test_load_columns_from_db_matches_per_object_loop(db_session) -> None:
+    # En la DB los títulos son únicos: una sola vuelta de los casos borde
+    db_session.add_all(edge_case_todos(repeat=1) + random_todos(300))
+    db_session.commit()
+
+    columns = load_columns(db_session)
+
+    todos = db_session.query(Todo).all()
+    assert compute_advanced_stats_columnar(columns, now=NOW) == compute_advanced_stats(todos, now=NOW)
+    assert columns.due.dtype == np.dtype("datetime64[us]")
+
+
+def test_load_columns_empty_table(db_session) -> None:
+    assert len(load_columns(db_session)) == 0
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import counters
+from app.advanced_stats import compute_advanced_stats
+from app.deps import Store
+from app.logic import compute_stats
+from app.migrations import run_migrations
+from app.models import Base, Todo
+from app.seed import seed_if_empty
+
+
+def assert_counters_match_recomputation(store, db_session):
+    todos = db_session.query(Todo).all()
+    assert store.stats() == compute_stats(todos)
+    assert store.advanced_stats() == compute_advanced_stats(todos)
+    assert counters.reconcile(db_session)["ok"] is True
+
+
+def test_counters_start_at_zero(store, db_session):
+    assert counters.read(db_session) == {name: 0 for name in counters.COUNTERS}
+    assert_counters_match_recomputation(store, db_session)
+
+
+def test_counters_follow_interleaved_creates_and_toggles(store, db_session):
+    rng = random.Random(7)
+    seed_if_empty(db_session)
+    created = 3
+
+    for step in range(200):
+        if rng.random() < 0.5:
+            created += 1
+            title = f"Tarea {created}" + " larga" * rng.randint(0, 6)
+            store.add(title=title, description=rng.choice([None, "", "  ", "desc"]))
+        else:
+            store.toggle(rng.randint(1, created))
+        if step % 25 == 0:
+            assert_counters_match_recomputation(store, db_session)
+
+    assert_counters_match_recomputation(store, db_session)
+
+
+def test_failed_duplicate_insert_does_not_move_counters(store, db_session):
+    store.add(title="Comprar pan")
+    before = counters.read(db_session)
+
+    try:
+        store.add(title="comprar pan")
+    except ValueError:
+        pass
+
+    assert counters.read(db_session) == before
+
+
+def test_toggle_of_missing_todo_does_not_move_counters(store, db_session):
+    store.add(title="A")
+    before = counters.read(db_session)
+
+    assert store.toggle(999) is None
+    assert counters.read(db_session) == before
+
+
+def test_reconcile_reports_and_fixes_drift(store, db_session):
+    store.add(title="A")
+    store.add(title="B")
+    # Escritura por fuera del Store: los contadores quedan desfasados
+    db_session.execute(text("DELETE FROM todos WHERE title = 'B'"))
+    db_session.commit()
+
+    result = counters.reconcile(db_session)
+    assert result["ok"] is False
+    assert result["drift"]["total"] == {"stored": 2, "actual": 1}
+    assert result["fixed"] is False
+
+    result = counters.reconcile(db_session, fix=True)
+    assert result["fixed"] is True
+    assert counters.reconcile(db_session)["ok"] is True
+    assert store.stats()["total"] == 1
+
+
+def test_migrations_initialize_counters_from_existing_rows(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(text("DELETE FROM todo_counters"))
+        conn.execute(text(
+            "INSERT INTO todos (title, done, priority, status) VALUES"
+            " ('A', 1, 'high', 'done'), ('B', 0, 'low', 'pending')"
+        ))
+
+    result = run_migrations(db_engine)
+
+    assert sorted(result["initialized_counters"]) == sorted(counters.COUNTERS)
+    with db_engine.connect() as conn:
+        values = counters.read(conn)
+    assert values["total"] == 2
+    assert values["done_flag"] == 1
+    assert values["high_priority"] == 1
+    assert values["status_done"] == 1
+
+
+def test_reconcile_fix_does_not_lose_concurrent_writes(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    make_session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with make_session() as db:
+        Store(db).add(title="A")
+        # Drift a corregir, para que reconcile(fix=True) escriba
+        db.execute(text("UPDATE todo_counters SET value = 99 WHERE name = 'total'"))
+        db.commit()
+
+    writer = threading.Thread(target=lambda: Store(make_session()).add(title="B"))
+    original = counters.recompute
+
+    def recompute_then_interleave(db):
+        actual = original(db)
+        # Otro request escribe entre el recálculo y la corrección
+        writer.start()
+        time.sleep(0.2)
+        return actual
+
+    monkeypatch.setattr(counters, "recompute", recompute_then_interleave)
+    with make_session() as db:
+        assert counters.reconcile(db, fix=True)["fixed"] is True
+    writer.join()
+    monkeypatch.undo()
+
+    with make_session() as db:
+        assert counters.reconcile(db)["ok"] is True
+        assert counters.read(db)["total"] == 2
+    engine.dispose()
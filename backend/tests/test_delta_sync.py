@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import event, select, text
+
+from app import counters
+from app.migrations import run_migrations
+from app.models import Todo
+
+
+def versions(db_session) -> dict[int, int]:
+    return dict(db_session.execute(select(Todo.id, Todo.version)).all())
+
+
+def test_every_write_takes_the_next_version(store, db_session):
+    assert store.row_version() == 0
+
+    store.add("Comprar pan")
+    store.add_many([("Pagar luz", None), ("Lavar auto", None)])
+    store.toggle(1)
+    store.update_many([2, 3], values={"priority": "high"})
+
+    assert versions(db_session) == {1: 3, 2: 4, 3: 4}
+    assert store.row_version() == 4
+
+
+def test_failed_writes_do_not_consume_versions(store):
+    store.add("Comprar pan")
+    with pytest.raises(ValueError):
+        store.add("comprar  PAN")
+    store.toggle(999)
+    store.update_many([999], toggle=True)
+
+    assert store.row_version() == 1
+
+
+def test_since_returns_only_rows_written_after_the_version(client, store):
+    store.add_many([(f"Tarea {i}", None) for i in range(1, 6)])
+
+    full = client.get("/api/todos")
+    version = full.headers["X-Sync-Version"]
+    assert version == "1"
+    assert len(full.json()) == 5
+
+    store.toggle(4)
+    store.add("Tarea nueva")
+    store.toggle(2)
+
+    delta = client.get("/api/todos", params={"since": version})
+
+    assert delta.status_code == 200
+    # En el orden en que se escribieron
+    assert [(t["id"], t["done"]) for t in delta.json()] == [(4, True), (6, False), (2, True)]
+    assert delta.headers["X-Sync-Version"] == "4"
+
+    nothing = client.get("/api/todos", params={"since": "4"})
+    assert nothing.json() == []
+    assert nothing.headers["X-Sync-Version"] == "4"
+
+
+def test_since_with_projection(client, store):
+    store.add_many([("Comprar pan", None), ("Pagar luz", None)])
+    store.toggle(2)
+
+    resp = client.get("/api/todos", params={"since": 1, "fields": "done"})
+
+    assert resp.json() == [{"done": True}]
+    assert resp.headers["X-Sync-Version"] == "2"
+
+
+@pytest.mark.parametrize("params", [{"since": 0, "limit": 10}, {"since": 0, "after": 3}])
+def test_since_cannot_be_paginated(client, params):
+    resp = client.get("/api/todos", params=params)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "since cannot be combined with after or limit"
+
+
+def test_since_query_uses_version_index(db_engine, store, query_plan):
+    store.add_many([(f"Tarea {i}", None) for i in range(50)])
+
+    sql = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        sql.append(context.compiled.statement)
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        store.list(since=1)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+
+    plan = query_plan(sql[-1])
+    assert any("USING INDEX ix_todos_version_id" in step for step in plan), plan
+
+
+def test_migration_puts_existing_rows_at_version_one(legacy_engine):
+    result = run_migrations(legacy_engine)
+
+    assert "version" in result["added_columns"]
+    assert result["initialized_row_version"] is True
+    with legacy_engine.connect() as conn:
+        assert conn.execute(text("SELECT DISTINCT version FROM todos")).scalars().all() == [1]
+        assert counters.current_row_version(conn) == 1
+        # Los contadores de stats no incluyen la secuencia
+        assert "row_version" not in counters.read(conn)
+
+    assert run_migrations(legacy_engine)["initialized_row_version"] is False
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.models import Todo, TodoStatus
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+@pytest.fixture
+def client(client, store, db_session):
+    # (título, due_date, status); las fechas se guardan sin tz, en UTC
+    rows = [
+        ("vencida hace 2d", NOW - timedelta(days=2), TodoStatus.pending),
+        ("vencida hace 1d", NOW - timedelta(days=1), TodoStatus.in_progress),
+        ("terminada vencida", NOW - timedelta(days=3), TodoStatus.done),
+        ("vence en 1h", NOW + timedelta(hours=1), TodoStatus.pending),
+        ("vence en 3d", NOW + timedelta(days=3), TodoStatus.pending),
+        ("sin fecha", None, TodoStatus.pending),
+        ("empate hace 2d", NOW - timedelta(days=2), TodoStatus.pending),
+    ]
+    for title, due_date, status in rows:
+        todo = store.add(title=title)
+        db_session.execute(
+            update(Todo)
+            .where(Todo.id == todo.id)
+            .values(due_date=due_date.replace(tzinfo=None) if due_date else None, status=status)
+        )
+    db_session.commit()
+    return client
+
+
+def titles(resp):
+    return [t["title"] for t in resp.json()]
+
+
+def test_overdue_lists_open_past_due_todos_by_due_date(client):
+    resp = client.get("/api/todos/overdue")
+
+    assert resp.status_code == 200
+    assert titles(resp) == ["vencida hace 2d", "empate hace 2d", "vencida hace 1d"]
+    first = resp.json()[0]
+    assert first["status"] == "pending"
+    assert datetime.fromisoformat(first["due_date"]) == NOW - timedelta(days=2)
+
+
+def test_overdue_matches_advanced_stats_count(client):
+    overdue = client.get("/api/todos/stats/advanced").json()["overdue"]
+
+    assert len(client.get("/api/todos/overdue").json()) == overdue
+
+
+def test_due_before_includes_upcoming(client):
+    before = (NOW + timedelta(days=1)).replace(tzinfo=None).isoformat()
+
+    resp = client.get("/api/todos/due", params={"before": before})
+
+    assert titles(resp) == ["vencida hace 2d", "empate hace 2d", "vencida hace 1d", "vence en 1h"]
+
+
+def test_due_before_converts_timezones_to_utc(client):
+    # NOW + 2h expresado en UTC-03:00: incluye "vence en 1h"
+    before = (NOW + timedelta(hours=2)).astimezone(timezone(timedelta(hours=-3))).isoformat()
+
+    assert "vence en 1h" in titles(client.get("/api/todos/due", params={"before": before}))
+
+
+def test_due_paginates_by_due_date_cursor(client):
+    before = (NOW + timedelta(days=7)).isoformat()
+    seen = []
+    cursor = None
+    while True:
+        params = {"before": before, "limit": 2}
+        if cursor:
+            params["after"] = cursor
+        resp = client.get("/api/todos/due", params=params)
+        seen += titles(resp)
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert seen == titles(client.get("/api/todos/due", params={"before": before}))
+    assert len(seen) == 5
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/todos/overdue", params={"after": "nope"}).status_code == 400
+
+
+def test_due_requires_before(client):
+    assert client.get("/api/todos/due").status_code == 422
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, select
+
+from app.export import EXPORT_FIELDS, ndjson_chunks
+from app.logic import title_key
+from app.models import Todo, TodoPriority, TodoStatus
+
+
+def _seed(db_engine, count: int) -> None:
+    with db_engine.connect() as conn:
+        start = conn.execute(select(func.count()).select_from(Todo)).scalar()
+    rows = [
+        {
+            "title": f"Tarea {i}",
+            "title_normalized": title_key(f"Tarea {i}"),
+            "description": f"Descripción bastante más larga de la tarea {i}" if i % 2 else None,
+            "done": i % 3 == 0,
+        }
+        for i in range(start, start + count)
+    ]
+    with db_engine.begin() as conn:
+        conn.execute(insert(Todo.__table__), rows)
+
+
+def test_export_ndjson_streams_every_row(client, store, db_session):
+    store.add(title="Comprar pan", description="integral")
+    store.add(title="Pagar luz")
+    todo = db_session.get(Todo, 2)
+    todo.priority = TodoPriority.high
+    todo.status = TodoStatus.in_progress
+    todo.due_date = datetime(2030, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    db_session.commit()
+
+    resp = client.get("/api/todos/export")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [tuple(line) for line in lines] == [EXPORT_FIELDS, EXPORT_FIELDS]
+    assert lines[0]["title"] == "Comprar pan"
+    assert lines[0]["description"] == "integral"
+    assert lines[0]["status"] == "pending"
+    assert lines[1]["priority"] == "high"
+    assert lines[1]["due_date"].startswith("2030-01-02T03:04:05")
+
+
+def test_export_csv_has_header_and_rows(client, store):
+    store.add(title="Comprar, pan", description='con "comillas"')
+    store.add(title="Pagar luz")
+
+    resp = client.get("/api/todos/export", params={"format": "csv"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="todos.csv"' in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["title"] for r in rows] == ["Comprar, pan", "Pagar luz"]
+    assert rows[0]["description"] == 'con "comillas"'
+    assert rows[1]["description"] == ""
+    assert rows[0]["done"] == "False"
+
+
+def test_export_of_empty_table(client):
+    assert client.get("/api/todos/export").text == ""
+    assert client.get("/api/todos/export", params={"format": "csv"}).text.strip() == ",".join(EXPORT_FIELDS)
+
+
+def _export_peak_memory(store) -> tuple[int, int, int]:
+    """Exporta toda la tabla a NDJSON y devuelve (filas, bytes, memoria pico)."""
+    tracemalloc.start()
+    try:
+        total_bytes = 0
+        rows = 0
+        for chunk in ndjson_chunks(store.iter_batches(list(EXPORT_FIELDS), batch_size=500)):
+            total_bytes += len(chunk)
+            rows += chunk.count("\n")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return rows, total_bytes, peak
+
+
+def test_export_memory_stays_bounded_by_batch_size(store, db_engine):
+    """La memoria pico depende del tamaño de lote, no del de la tabla."""
+    _seed(db_engine, 1_000)
+    small_rows, _, small_peak = _export_peak_memory(store)
+
+    _seed(db_engine, 9_000)
+    rows, _, peak = _export_peak_memory(store)
+
+    assert small_rows == 1_000
+    assert rows == 10_000
+    # 10x más filas, misma memoria (con margen para ruido del allocator)
+    assert peak < small_peak * 1.5
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from app import counters
+from app.importer import MAX_RECORD_CHARS
+
+
+@pytest.fixture
+def client(client, store):
+    store.add(title="Comprar pan")
+    return client
+
+
+def titles(client) -> list[str]:
+    return [t["title"] for t in client.get("/api/todos").json()]
+
+
+def test_import_ndjson_reports_counts(client, store, db_session):
+    body = "\n".join(
+        [
+            json.dumps({"title": "  Pagar   luz ", "description": "antes del 10"}),
+            json.dumps({"title": "comprar PAN"}),
+            json.dumps({"title": "   "}),
+            "{no es json",
+            json.dumps({"description": "sin título"}),
+            "",
+            json.dumps({"title": "Lavar auto"}),
+            json.dumps({"title": "pagar luz"}),
+        ]
+    )
+
+    resp = client.post("/api/todos/import", content=body)
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "format": "ndjson",
+        "inserted": 2,
+        "duplicate": 2,
+        "skipped": 3,
+        "chunks": 1,
+    }
+    assert titles(client) == ["Comprar pan", "Pagar luz", "Lavar auto"]
+    assert counters.reconcile(db_session)["ok"] is True
+
+
+def test_import_commits_in_chunks_and_dedupes_across_them(client):
+    body = "\n".join(json.dumps({"title": f"Tarea {i % 4}"}) for i in range(7))
+
+    resp = client.post("/api/todos/import", params={"chunk_size": 2}, content=body)
+
+    assert resp.json()["chunks"] == 4
+    assert resp.json()["inserted"] == 4
+    assert resp.json()["duplicate"] == 3
+
+
+def test_import_reads_body_split_at_arbitrary_bytes(client):
+    payload = (json.dumps({"title": "Café con leche"}, ensure_ascii=False) + "\n").encode()
+    payload += (json.dumps({"title": "Ñandú"}, ensure_ascii=False)).encode()
+
+    def body():
+        # De a 3 bytes: parte líneas y caracteres multibyte
+        for i in range(0, len(payload), 3):
+            yield payload[i:i + 3]
+
+    resp = client.post("/api/todos/import", content=body())
+
+    assert resp.json()["inserted"] == 2
+    assert titles(client)[-2:] == ["Café con leche", "Ñandú"]
+
+
+def test_import_csv_by_content_type(client):
+    body = (
+        "title,description\r\n"
+        "Pagar luz,antes del 10\r\n"
+        '"Lavar, auto","con\r\nvarias líneas"\r\n'
+        "Sin descripción,\r\n"
+        "fila,con,columnas,de más\r\n"
+        "comprar pan,\r\n"
+    )
+
+    resp = client.post("/api/todos/import", content=body, headers={"Content-Type": "text/csv"})
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "format": "csv",
+        "inserted": 3,
+        "duplicate": 1,
+        "skipped": 1,
+        "chunks": 1,
+    }
+    todos = client.get("/api/todos").json()
+    assert todos[2]["title"] == "Lavar, auto"
+    assert todos[2]["description"] == "con\nvarias líneas"
+    assert todos[3]["description"] is None
+
+
+def test_import_csv_requires_title_column(client):
+    resp = client.post("/api/todos/import", params={"format": "csv"}, content="name\nA\n")
+
+    assert resp.status_code == 400
+    assert "title" in resp.json()["detail"]
+
+
+def test_import_rejects_overlong_lines(client):
+    resp = client.post("/api/todos/import", content="x" * (MAX_RECORD_CHARS + 10))
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "line too long"
@@ -0,0 +1,71 @@
+"""Los filtros por done / status / priority / due_date usan los índices de Todo."""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, insert, or_, select
+
+from app.advanced_stats import overdue_condition
+from app.models import Todo, TodoPriority, TodoStatus
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "stmt, index",
+    [
+        (select(Todo).where(Todo.due_date < NOW).order_by(Todo.due_date, Todo.id), "ix_todos_due_date"),
+        (select(Todo).where(Todo.done.is_(True)).order_by(Todo.id).limit(20), "ix_todos_done_id"),
+        (
+            select(Todo).where(Todo.status == TodoStatus.pending).order_by(Todo.due_date),
+            "ix_todos_status_due_date",
+        ),
+        (
+            select(Todo).where(Todo.priority == TodoPriority.high).order_by(Todo.due_date),
+            "ix_todos_priority_due_date",
+        ),
+    ],
+)
+def test_filtered_queries_use_index(db_engine, query_plan, stmt, index):
+    plan = query_plan(stmt)
+
+    assert any(f"USING INDEX {index}" in step for step in plan), plan
+    assert not any(step.startswith("SCAN todos") for step in plan), plan
+
+
+@pytest.mark.parametrize(
+    "stmt",
+    [
+        select(func.count()).select_from(Todo).where(overdue_condition(NOW)),
+        select(Todo).where(overdue_condition(NOW)).order_by(Todo.due_date, Todo.id).limit(20),
+    ],
+)
+def test_overdue_queries_use_open_todos_index(db_engine, query_plan, stmt):
+    # Con estadísticas (ANALYZE), el índice parcial de abiertos le gana al
+    # de todas las due_date cuando hay TODOs terminados con fecha pasada
+    rows = [
+        {
+            "title": f"t{i}",
+            "title_normalized": f"t{i}",
+            "status": TodoStatus.done if i % 4 else TodoStatus.pending,
+            "priority": TodoPriority.medium,
+            "due_date": datetime(2024, 1 + i % 12, 1, tzinfo=timezone.utc),
+        }
+        for i in range(2000)
+    ]
+    with db_engine.begin() as conn:
+        conn.execute(insert(Todo.__table__), rows)
+        conn.exec_driver_sql("ANALYZE")
+
+    plan = query_plan(stmt)
+
+    assert any("USING INDEX ix_todos_open_due_date" in step for step in plan), plan
+
+
+def test_pending_filter_includes_null_done_without_scan(db_engine, query_plan):
+    # done=false también cuenta NULL: OR de dos búsquedas en el mismo índice
+    stmt = select(Todo).where(or_(Todo.done.is_(False), Todo.done.is_(None))).order_by(Todo.id)
+
+    plan = query_plan(stmt)
+
+    assert "MULTI-INDEX OR" in plan
+    assert not any(step.startswith("SCAN todos") for step in plan), plan
@@ -7,6 +7,7 @@ from app.logic import (
     validate_new_todo,
     compute_stats,
     filter_todos,
+    classify_new_titles,
 )
 
 
@@ -140,3 +141,20 @@ def test_filter_todos_by_done_and_text_combined():
     result = filter_todos(todos, done=True, text="pan")
     titles = {t.title for t in result}
     assert titles == {"B"}
+
+
+# --- Tests para classify_new_titles ---
+
+
+def test_classify_new_titles_ok_when_all_new():
+    assert classify_new_titles(["A", "B"], set()) == ["ok", "ok"]
+
+
+def test_classify_new_titles_detects_empty_and_existing():
+    codes = classify_new_titles(["  ", "Comprar pan", "Pagar luz"], {"comprar pan"})
+    assert codes == ["empty", "duplicate", "ok"]
+
+
+def test_classify_new_titles_detects_duplicates_within_batch():
+    codes = classify_new_titles(["Comprar pan", " comprar   PAN ", "Otra"], set())
+    assert codes == ["ok", "duplicate", "ok"]
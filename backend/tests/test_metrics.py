@@ -0,0 +1,94 @@
+import pytest
+
+from app import metrics
+from app.metrics import Counter, Histogram
+
+
+@pytest.fixture
+def client(client, store, db_engine):
+    metrics.instrument_engine(db_engine)
+    metrics.reset()
+    store.add_many([("Comprar pan", None), ("Pagar luz", None), ("Lavar auto", None)])
+    yield client
+    metrics.set_enabled(True)
+    metrics.reset()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latencia.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, ('/a"b',))
+
+    assert list(histogram.render()) == [
+        "# HELP latency_seconds Latencia.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a\\"b"} 3.65',
+        'latency_seconds_count{route="/a\\"b"} 4',
+    ]
+
+
+def test_counter_renders_without_labels():
+    counter = Counter("queries_total", "Consultas.")
+    counter.inc()
+    counter.inc(2)
+
+    assert list(counter.render())[-1] == "queries_total 3"
+
+
+def test_requests_are_labeled_by_route_template_and_status(client):
+    client.get("/api/todos", params={"limit": 2})
+    client.patch("/api/todos/2/toggle")
+    client.patch("/api/todos/999/toggle")
+    client.get("/no-existe")
+
+    duration = metrics.REQUEST_DURATION
+    assert duration.count(("GET", "/api/todos", "200")) == 1
+    assert duration.count(("PATCH", "/api/todos/{todo_id}/toggle", "200")) == 1
+    assert duration.count(("PATCH", "/api/todos/{todo_id}/toggle", "404")) == 1
+    assert duration.count(("GET", "<unmatched>", "404")) == 1
+
+
+def test_cache_hits_keep_their_route_label(client):
+    client.get("/api/todos")
+    hit = client.get("/api/todos")
+
+    assert hit.headers["X-Cache"] == "hit"
+    assert metrics.REQUEST_DURATION.count(("GET", "/api/todos", "200")) == 2
+
+
+def test_db_queries_are_counted_per_request(client):
+    before = metrics.DB_QUERIES.value()
+
+    client.get("/api/todos", params={"limit": 2})
+
+    # X-Sync-Version + la página
+    series = metrics.REQUEST_DB_QUERIES._series[("GET", "/api/todos")]
+    assert series[1] == 2
+    assert metrics.DB_QUERIES.value() - before == 2
+    assert metrics.REQUEST_DB_DURATION.count(("GET", "/api/todos")) == 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client):
+    client.get("/api/todos/stats")
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == metrics.CONTENT_TYPE
+    body = resp.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/todos/stats",status="200"} 1' in body
+    assert "# TYPE db_queries_total counter" in body
+
+
+def test_disabled_metrics_record_nothing(client):
+    metrics.set_enabled(False)
+    before = metrics.DB_QUERIES.value()
+
+    client.get("/api/todos")
+
+    assert metrics.REQUEST_DURATION.count(("GET", "/api/todos", "200")) == 0
+    assert metrics.DB_QUERIES.value() == before
@@ -0,0 +1,28 @@
+from sqlalchemy import inspect, text
+
+from app.migrations import run_migrations
+
+
+def test_run_migrations_adds_column_backfills_and_indexes(legacy_engine):
+    result = run_migrations(legacy_engine)
+
+    assert "title_normalized" in result["added_columns"]
+    with legacy_engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, title_normalized FROM todos ORDER BY id")).all()
+    # El duplicado histórico queda en NULL para no bloquear el índice único
+    assert [r[1] for r in rows] == ["comprar pan", None, "pagar luz"]
+
+    indexes = {ix["name"]: ix for ix in inspect(legacy_engine).get_indexes("todos")}
+    assert indexes["ix_todos_title_normalized"]["unique"]
+    assert {"ix_todos_done_id", "ix_todos_status_due_date", "ix_todos_open_due_date"} <= set(indexes)
+    assert "ix_todos_open_due_date" in result["created_indexes"]
+
+
+def test_run_migrations_is_idempotent(legacy_engine):
+    run_migrations(legacy_engine)
+
+    result = run_migrations(legacy_engine)
+
+    assert result["added_columns"] == []
+    assert result["backfilled"] == 0
+    assert result["created_indexes"] == []
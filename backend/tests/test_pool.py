@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.main import app
+from app.pool import TimedAsyncQueuePool, TimedQueuePool, pool_options, pool_status
+
+
+def test_memory_sqlite_uses_static_pool():
+    assert pool_options("sqlite://") == {"poolclass": StaticPool}
+    assert pool_options("sqlite:///:memory:") == {"poolclass": StaticPool}
+
+
+def test_file_sqlite_uses_sized_pool_without_server_options():
+    options = pool_options("sqlite:///./app.db")
+
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert "pool_pre_ping" not in options
+    assert "pool_recycle" not in options
+
+
+def test_server_db_gets_recycle_and_pre_ping():
+    options = pool_options("postgresql+asyncpg://u:p@h/db", is_async=True)
+
+    assert options["poolclass"] is TimedAsyncQueuePool
+    assert options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE
+
+
+def test_pool_status_reports_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    held = engine.connect()
+    assert pool_status(engine)["checked_out"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    held.close()
+
+    status = pool_status(engine)
+    assert status["pool_class"] == "TimedQueuePool"
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+    assert status["waits"]["checkouts"] == 1
+    assert status["waits"]["timeouts"] == 1
+    assert status["waits"]["wait_max_ms"] >= 50
+    engine.dispose()
+
+
+def test_admin_pool_endpoint():
+    with TestClient(app) as client:
+        body = client.get("/admin/pool").json()
+
+    assert body["sync"]["pool_class"]
+    assert "async" in body
@@ -0,0 +1,120 @@
+import pytest
+
+from app import query_audit
+from app.query_audit import audit, shape
+
+
+@pytest.fixture
+def client(client, store, db_engine):
+    query_audit.instrument_engine(db_engine)
+    previous = query_audit.enabled()
+    query_audit.set_enabled(False)
+    store.add_many([(f"Tarea {i}", None) for i in range(1, 11)])
+    yield client
+    query_audit.set_enabled(previous)
+    query_audit.clear()
+
+
+def test_shape_collapses_literals_and_parameter_lists():
+    assert shape("SELECT * FROM todos\n  WHERE id IN (?, ?, ?) AND title = 'pan'") == (
+        "SELECT * FROM todos WHERE id IN (?) AND title = ?"
+    )
+    assert shape("INSERT INTO todos (title) VALUES (?), (?), (?)") == shape(
+        "INSERT INTO todos (title) VALUES (?)"
+    )
+    assert shape("SELECT * FROM todos LIMIT 10 OFFSET 20") == "SELECT * FROM todos LIMIT ? OFFSET ?"
+    assert shape("SELECT * FROM todos WHERE id = %(id_1)s") == "SELECT * FROM todos WHERE id = ?"
+
+
+def test_audit_flags_repeated_shapes_and_slow_queries(store, db_engine):
+    query_audit.instrument_engine(db_engine)
+    store.add_many([("Comprar pan", None), ("Pagar luz", None)])
+
+    with audit(slow_ms=0, repeat_threshold=2) as current:
+        store.toggle(1)
+        store.toggle(2)
+
+    repeated = current.repeated()
+    assert any(s.startswith("UPDATE todos SET done=") for s in repeated)
+    assert all(count == 2 for count in repeated.values())
+    assert len(current.slow()) == current.count
+
+
+def test_audit_only_sees_its_own_context(store, db_engine):
+    query_audit.instrument_engine(db_engine)
+
+    store.add("Afuera")
+    with audit() as current:
+        store.add("Adentro")
+
+    # Versión de fila, INSERT ... RETURNING y contadores: sin refresh
+    assert current.count == 3
+
+
+def test_bulk_create_does_not_refetch_each_row(store, db_engine):
+    query_audit.instrument_engine(db_engine)
+
+    with audit(repeat_threshold=2) as current:
+        results = store.add_many([(f"Tarea {i}", None) for i in range(50)])
+
+    assert current.repeated() == {}
+    assert current.count == 4
+    # Las filas devueltas se leen después del commit sin tocar la DB
+    with audit() as after_commit:
+        assert [todo.title for _, todo in results] == [f"Tarea {i}" for i in range(50)]
+    assert after_commit.count == 0
+
+
+# Máximo de consultas por endpoint: si un cambio agrega consultas (un
+# refresh, un N+1, un list() de más), el test falla con la lista
+ENDPOINT_BUDGETS = [
+    ("post", "/api/todos", {"json": {"title": "Nueva"}}, 4),
+    ("post", "/api/todos/bulk", {"json": [{"title": f"Lote {i}"} for i in range(20)]}, 4),
+    ("get", "/api/todos", {"params": {"limit": 5}}, 2),
+    ("get", "/api/todos/search", {"params": {"q": "tarea"}}, 1),
+    ("get", "/api/todos/stats", {}, 1),
+    ("get", "/api/todos/stats/advanced", {}, 2),
+    ("patch", "/api/todos/3/toggle", {}, 3),
+    ("patch", "/api/todos/batch", {"json": {"ids": [1, 2, 3], "op": "toggle"}}, 5),
+    ("get", "/readyz", {}, 1),
+]
+
+
+@pytest.mark.parametrize("method, path, kwargs, limit", ENDPOINT_BUDGETS)
+def test_endpoint_query_budget(client, max_queries, method, path, kwargs, limit):
+    with max_queries(limit):
+        resp = getattr(client, method)(path, **kwargs)
+
+    assert resp.status_code < 400
+
+
+def test_max_queries_reports_the_statements(client, max_queries):
+    with pytest.raises(AssertionError) as excinfo:
+        with max_queries(1):
+            client.post("/api/todos", json={"title": "Nueva"})
+
+    message = str(excinfo.value)
+    assert "POST /api/todos hizo 4 consultas (máximo 1)" in message
+    assert "1 x INSERT INTO todos" in message
+
+
+def test_debug_lists_audited_requests(client):
+    query_audit.set_enabled(True)
+
+    client.patch("/api/todos/3/toggle")
+    info = client.get("/admin/debug").json()["query_audit"]
+
+    assert info["enabled"] is True
+    [report] = info["requests"]
+    assert (report["method"], report["path"], report["route"]) == (
+        "PATCH", "/api/todos/3/toggle", "/api/todos/{todo_id}/toggle"
+    )
+    assert report["queries"] == 3
+    assert report["repeated"] == []
+    assert sum(s["count"] for s in report["statements"]) == 3
+
+
+def test_disabled_audit_records_nothing(client):
+    client.get("/api/todos")
+
+    assert query_audit.recent() == []
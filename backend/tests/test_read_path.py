@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app import api_common
+from app.schemas import TodoOut
+
+TITLES = [
+    ("Comprar pan", None),
+    ('Comillas "dobles" y \\barra', "línea 1\nlínea 2\ttab"),
+    ("Ñandú 🐦 emoji", ""),
+    ("Control \x01 char", "  "),
+]
+
+
+@pytest.fixture
+def client(client, store):
+    for title, description in TITLES:
+        store.add(title=title, description=description)
+    store.toggle(2)
+    return client
+
+
+def expected_body(todos) -> list[dict]:
+    """Lo que devolvía el camino anterior: validar contra TodoOut y serializar."""
+    adapter = TypeAdapter(list[TodoOut])
+    return adapter.dump_python(adapter.validate_python(todos, from_attributes=True), mode="json")
+
+
+def test_store_reads_do_not_hydrate_orm_objects(store, db_session):
+    for title, description in TITLES:
+        store.add(title=title, description=description)
+    db_session.expunge_all()
+
+    listed = store.list()
+    found = store.search(q="pan")
+
+    assert [t.title for t in listed] == [title for title, _ in TITLES]
+    assert [t.title for t in found] == ["Comprar pan"]
+    assert len(db_session.identity_map) == 0
+
+
+def test_list_matches_todo_out_serialization(client, store):
+    resp = client.get("/api/todos")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == expected_body(store.list())
+
+
+def test_search_matches_todo_out_serialization(client, store):
+    resp = client.get("/api/todos/search", params={"q": "a", "mode": "substring", "limit": 2})
+
+    assert resp.status_code == 200
+    assert resp.json() == expected_body(store.search(q="a", mode="substring", limit=2))
+    assert resp.headers["X-Next-Offset"] == "2"
+
+
+def test_todos_response_without_orjson_gives_same_json(store, monkeypatch):
+    for title, description in TITLES:
+        store.add(title=title, description=description)
+    rows = store.list()
+
+    fast = api_common.todos_response(rows, {"X-Next-Cursor": "4"})
+    monkeypatch.setattr(api_common, "FastJSONResponse", JSONResponse)
+    plain = api_common.todos_response(rows, {"X-Next-Cursor": "4"})
+
+    assert json.loads(fast.body) == json.loads(plain.body) == expected_body(rows)
+    assert fast.headers["X-Next-Cursor"] == plain.headers["X-Next-Cursor"] == "4"
@@ -0,0 +1,223 @@
+import itertools
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+
+from app.deps import get_store
+from app.logic import SEARCH_SORTS, filter_todos, sort_todos
+from app.main import app
+from app.models import Todo, TodoPriority, TodoStatus
+from app.search import _PG_TRGM_DDL, BACKEND_FTS5, apply_substring, search_backend
+
+
+@pytest.fixture
+def seeded_store(store):
+    store.add(title="Comprar pan", description="en la panadería")
+    store.add(title="Pagar luz")
+    store.add(title="Otra cosa", description="algo de pan")
+    store.add(title="Café con leche", description="desayuno")
+    store.add(title="Empanadas", description="para la cena")
+    store.toggle(2)
+    return store
+
+
+def titles(todos) -> list[str]:
+    return [t.title for t in todos]
+
+
+def test_sqlite_engine_uses_fts5(store, db_engine):
+    assert search_backend(db_engine) == BACKEND_FTS5
+
+
+def test_fts_matches_words_by_prefix(seeded_store):
+    found = titles(seeded_store.search(q="pan"))
+
+    # "panadería" matchea por prefijo; "Empanadas" no (no es inicio de palabra)
+    assert set(found) == {"Comprar pan", "Otra cosa"}
+
+
+def test_fts_ranks_more_relevant_first(seeded_store):
+    seeded_store.add(title="pan pan pan", description="pan")
+
+    found = titles(seeded_store.search(q="pan"))
+
+    assert found[0] == "pan pan pan"
+
+
+def test_fts_ignores_case_and_accents(seeded_store):
+    assert titles(seeded_store.search(q="CAFE")) == ["Café con leche"]
+
+
+def test_fts_combines_words_and_done(seeded_store):
+    assert titles(seeded_store.search(q="pagar", done=True)) == ["Pagar luz"]
+    assert titles(seeded_store.search(q="pagar", done=False)) == []
+    assert titles(seeded_store.search(q="comprar pan")) == ["Comprar pan"]
+
+
+def test_fts_index_follows_inserts_and_updates(seeded_store, db_session):
+    seeded_store.add(title="Lavar auto")
+    assert titles(seeded_store.search(q="lavar")) == ["Lavar auto"]
+
+    todo = db_session.query(Todo).filter(Todo.title == "Lavar auto").one()
+    todo.title = "Lavar moto"
+    db_session.commit()
+    assert titles(seeded_store.search(q="auto")) == []
+    assert titles(seeded_store.search(q="moto")) == ["Lavar moto"]
+
+    db_session.delete(todo)
+    db_session.commit()
+    assert titles(seeded_store.search(q="moto")) == []
+
+
+def test_substring_mode_matches_filter_todos(seeded_store):
+    everything = seeded_store.list()
+    for q in ["pan", "PAN", "a", "mpra", "%", "zzz"]:
+        for done in [None, True, False]:
+            expected = titles(filter_todos(everything, done=done, text=q))
+            got = titles(seeded_store.search(q=q, done=done, mode="substring"))
+            assert got == expected, (q, done)
+
+
+def test_substring_filter_matches_postgres_trigram_indexes():
+    sql = str(apply_substring(select(Todo.id), "pan").compile(dialect=postgresql.dialect()))
+
+    # Postgres sólo usa un índice de expresión si el filtro repite la expresión
+    for column in ("title", "description"):
+        assert any(f"(lower({column}) gin_trgm_ops)" in ddl for ddl in _PG_TRGM_DDL)
+        assert f"lower(todos.{column}) LIKE" in sql
+
+
+def test_query_without_words_falls_back_to_substring(seeded_store):
+    assert seeded_store.search(q="!!!") == []
+
+
+def test_search_endpoint_paginates_with_offset(seeded_store):
+    app.dependency_overrides[get_store] = lambda: seeded_store
+    try:
+        with TestClient(app) as client:
+            first = client.get("/api/todos/search", params={"q": "a", "mode": "substring", "limit": 3})
+            second = client.get(
+                "/api/todos/search",
+                params={"q": "a", "mode": "substring", "limit": 3, "offset": first.headers["X-Next-Offset"]},
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert len(first.json()) == 3
+    assert second.status_code == 200
+    assert "X-Next-Offset" not in second.headers
+    ids = [t["id"] for t in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_search_endpoint_defaults_to_substring(seeded_store, client):
+    # Lo que manda el frontend: sólo q / done, sin mode
+    resp = client.get("/api/todos/search", params={"q": "an"})
+    fts = client.get("/api/todos/search", params={"q": "an", "mode": "fts"})
+
+    assert [t["title"] for t in resp.json()] == ["Comprar pan", "Otra cosa", "Empanadas"]
+    assert fts.json() == []
+
+
+@pytest.fixture
+def random_store(store, db_session):
+    """200 TODOs con status / prioridad / done / due_date al azar (reproducible)."""
+    rng = random.Random(7)
+    words = ["pan", "luz", "auto", "cena", "banco", "informe"]
+    base = datetime(2025, 6, 1)
+    store.add_many([(f"{rng.choice(words)} {i}", rng.choice([None, rng.choice(words)])) for i in range(200)])
+    for todo_id in range(1, 201):
+        db_session.execute(
+            update(Todo)
+            .where(Todo.id == todo_id)
+            .values(
+                done=rng.random() < 0.4,
+                status=rng.choice(list(TodoStatus)),
+                priority=rng.choice(list(TodoPriority)),
+                # Fechas repetidas a propósito, para probar el desempate por id
+                due_date=base + timedelta(days=rng.randint(0, 20)) if rng.random() < 0.7 else None,
+            )
+        )
+    db_session.commit()
+    return store
+
+
+FILTERS = [
+    {},
+    {"done": True},
+    {"done": False, "status": TodoStatus.pending},
+    {"priority": TodoPriority.high},
+    {"status": TodoStatus.in_progress, "priority": TodoPriority.low},
+    {"due_before": datetime(2025, 6, 10)},
+    {"due_after": datetime(2025, 6, 10, tzinfo=timezone.utc), "done": False},
+    {"due_after": datetime(2025, 6, 5), "due_before": datetime(2025, 6, 15, tzinfo=timezone.utc)},
+    # Mismo instante en otra zona horaria: 2025-06-10 00:00 UTC
+    {"due_before": datetime(2025, 6, 9, 21, tzinfo=timezone(timedelta(hours=-3)))},
+]
+
+
+def ids(todos) -> list[int]:
+    return [t.id for t in todos]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("q", [None, "pan", "a"])
+def test_query_builder_matches_filter_todos(random_store, filters, q):
+    everything = random_store.list()
+    for sort in SEARCH_SORTS[1:]:
+        expected = sort_todos(filter_todos(everything, text=q, **filters), sort)
+        got = random_store.search(q=q, mode="substring", sort=sort, **filters)
+        assert ids(got) == ids(expected), sort
+
+
+def test_query_builder_paginates_in_sort_order(random_store):
+    filters = {"done": False, "due_after": datetime(2025, 6, 3)}
+    full = ids(random_store.search(sort="-due_date", **filters))
+
+    pages = [
+        ids(random_store.search(sort="-due_date", limit=7, offset=offset, **filters))
+        for offset in range(0, len(full), 7)
+    ]
+
+    assert list(itertools.chain.from_iterable(pages)) == full
+
+
+def test_fts_results_respect_structured_filters(random_store):
+    everything = random_store.list()
+    filters = {"status": TodoStatus.pending, "due_before": datetime(2025, 6, 15)}
+
+    found = random_store.search(q="banco", sort="id", **filters)
+
+    # "banco" es una palabra entera: FTS y substring coinciden
+    assert ids(found) == ids(filter_todos(everything, text="banco", **filters))
+
+
+def test_search_endpoint_accepts_structured_filters(random_store):
+    app.dependency_overrides[get_store] = lambda: random_store
+    try:
+        with TestClient(app) as client:
+            resp = client.get(
+                "/api/todos/search",
+                params={"status": "done", "priority": "high", "due_before": "2025-06-12", "sort": "-due_date"},
+            )
+            bad = client.get("/api/todos/search", params={"sort": "title"})
+    finally:
+        app.dependency_overrides.clear()
+
+    expected = sort_todos(
+        filter_todos(
+            random_store.list(),
+            status=TodoStatus.done,
+            priority=TodoPriority.high,
+            due_before=datetime(2025, 6, 12),
+        ),
+        "-due_date",
+    )
+    assert resp.status_code == 200
+    assert [t["id"] for t in resp.json()] == ids(expected)
+    assert bad.status_code == 422
@@ -12,7 +12,9 @@ class DummyDb:
         self._count = count
         self.queried = False
         self.added: list[Todo] = []
+        self.executed: list = []
         self.committed = False
+        self.rolled_back = False
 
     def query(self, model):
         assert model is Todo
@@ -30,9 +32,36 @@ class DummyDb:
     def add(self, obj):
         self.added.append(obj)
 
+    def execute(self, statement, params=None):
+        # seed_if_empty reserva una versión de fila y actualiza los
+        # contadores, cada cosa con un UPDATE
+        self.executed.append((statement, params))
+        return DummyResult()
+
+    def get_bind(self):
+        return DummyBind()
+
+    def connection(self):
+        # begin_write sólo abre BEGIN IMMEDIATE en SQLite
+        return DummyBind()
+
     def commit(self):
         self.committed = True
 
+    def rollback(self):
+        self.rolled_back = True
+
+
+class DummyResult:
+    def scalar_one(self) -> int:
+        return 1
+
+
+class DummyBind:
+    class dialect:
+        name = "dummy"
+        update_returning = True
+
 
 def test_seed_if_empty_skips_when_table_not_empty():
     db = DummyDb(count=3)
@@ -45,7 +74,9 @@ def test_seed_if_empty_skips_when_table_not_empty():
     # no inserta nada ni hace commit
     assert result == {"inserted": 0, "skipped": True, "existing": 3}
     assert db.added == []
+    assert db.executed == []
     assert not db.committed
+    assert db.rolled_back
 
 
 def test_seed_if_empty_inserts_when_table_empty():
@@ -61,3 +92,12 @@ def test_seed_if_empty_inserts_when_table_empty():
     assert len(db.added) == len(DEFAULT_TODOS)
     assert all(isinstance(t, Todo) for t in db.added)
     assert db.committed
+
+    # Todas las filas del seed comparten la versión reservada
+    assert {t.version for t in db.added} == {1}
+
+    # Los contadores se actualizan junto con los inserts
+    assert len(db.executed) == 2
+    deltas = {p["counter"]: p["delta"] for p in db.executed[1][1]}
+    assert deltas["total"] == len(DEFAULT_TODOS)
+    assert deltas["done_flag"] == sum(1 for t in DEFAULT_TODOS if t["done"])
@@ -0,0 +1,139 @@
+import threading
+import time
+from contextlib import nullcontext
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import counters
+from app.deps import Store
+from app.migrations import run_migrations
+from app.models import Base, Todo
+from app.seed import DEFAULT_TODOS, seed_if_empty
+from app.sqlite_profile import WriterQueue, apply_profile, write_lock
+
+
+def make_engine(path, profile="performance"):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    apply_profile(engine, profile)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return engine
+
+
+def test_performance_profile_sets_pragmas(tmp_path):
+    engine = make_engine(tmp_path / "perf.db")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64 * 1024
+    engine.dispose()
+
+
+def test_default_profile_changes_nothing(tmp_path):
+    engine = make_engine(tmp_path / "plain.db", profile="default")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    assert isinstance(write_lock(engine), nullcontext)
+    engine.dispose()
+
+
+def test_writer_queue_serves_in_arrival_order():
+    queue = WriterQueue()
+    order: list[int] = []
+
+    def writer(n: int) -> None:
+        with queue.hold():
+            order.append(n)
+
+    with queue.hold():
+        threads = []
+        for n in range(5):
+            t = threading.Thread(target=writer, args=(n,))
+            t.start()
+            threads.append(t)
+            # Espera a que el thread tome su número antes de lanzar el siguiente
+            while queue.waiting() < n + 2:
+                time.sleep(0.001)
+    for t in threads:
+        t.join()
+
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_concurrent_writers_do_not_hit_lock_errors(tmp_path):
+    engine = make_engine(tmp_path / "stress.db")
+    make_session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with make_session() as db:
+        shared_id = Store(db).add(title="Compartido").id
+
+    threads_count, ops = 8, 25
+    errors: list[Exception] = []
+    barrier = threading.Barrier(threads_count)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        try:
+            with make_session() as db:
+                store = Store(db)
+                for i in range(ops):
+                    store.add(title=f"t{n}-{i}")
+                    store.toggle(shared_id)
+                    # Lecturas intercaladas con las escrituras de otros threads
+                    store.stats()
+                store.add_many([(f"b{n}-{i}", None) for i in range(10)])
+        except Exception as e:  # pragma: no cover - lo reporta el assert
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with make_session() as db:
+        assert db.query(Todo).count() == 1 + threads_count * (ops + 10)
+        # Cantidad par de toggles: vuelve al estado inicial
+        assert db.get(Todo, shared_id).done is False
+        assert counters.reconcile(db)["ok"] is True
+    engine.dispose()
+
+
+def test_concurrent_seeds_insert_once(tmp_path):
+    engine = make_engine(tmp_path / "seed.db")
+    make_session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    threads_count = 6
+    results: list[dict] = []
+    errors: list[Exception] = []
+    barrier = threading.Barrier(threads_count)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        try:
+            with make_session() as db:
+                if n % 2:
+                    Store(db).add(title=f"Alta {n}")
+                else:
+                    results.append(seed_if_empty(db))
+        except Exception as e:  # pragma: no cover - lo reporta el assert
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    # El conteo y los inserts van en el mismo turno: a lo sumo un seed inserta
+    assert sum(r["inserted"] for r in results) in (0, len(DEFAULT_TODOS))
+    with make_session() as db:
+        versions = [v for (v,) in db.query(Todo.version).distinct()]
+        assert len(versions) == counters.current_row_version(db)
+        assert counters.reconcile(db)["ok"] is True
+    engine.dispose()
@@ -0,0 +1,45 @@
+import pytest
+
+from app.logic import compute_stats
+from app.models import Todo
+
+
+def test_add_persists_normalized_title_key(store):
+    todo = store.add(title="Comprar pan")
+    assert todo.title_normalized == "comprar pan"
+
+
+def test_title_exists_is_case_insensitive_and_normalized(store):
+    store.add(title="Comprar pan")
+
+    assert store.title_exists("  COMPRAR   pan ") is True
+    assert store.title_exists("Pagar luz") is False
+
+
+def test_title_exists_false_for_empty_title(store):
+    assert store.title_exists("   ") is False
+
+
+def test_add_duplicate_raises_duplicate_code(store, db_session):
+    store.add(title="Comprar pan")
+
+    with pytest.raises(ValueError) as exc:
+        store.add(title="comprar PAN")
+    assert str(exc.value) == "duplicate"
+
+    # La sesión queda usable después del rollback
+    assert db_session.query(Todo).count() == 1
+
+
+def test_stats_on_empty_table(store):
+    assert store.stats() == {"total": 0, "done": 0, "pending": 0}
+
+
+def test_stats_matches_compute_stats(store):
+    for title in ["A", "B", "C", "D"]:
+        store.add(title=title)
+    store.toggle(1)
+    store.toggle(3)
+
+    assert store.stats() == compute_stats(store.list())
+    assert store.stats() == {"total": 4, "done": 2, "pending": 2}
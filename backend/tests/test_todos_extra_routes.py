@@ -4,6 +4,7 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.deps import get_store
+from app.logic import compute_stats, filter_todos, is_duplicate_title
 
 
 class DummyTodo:
@@ -21,8 +22,23 @@ class FakeStore:
         self._todos: List[DummyTodo] = initial or []
         self.add_calls: list[dict] = []
 
-    def list(self) -> List[DummyTodo]:
-        return list(self._todos)
+    def list(self, *, after: int | None = None, limit: int | None = None, since: int | None = None) -> List[DummyTodo]:
+        todos = [t for t in self._todos if after is None or t.id > after]
+        return todos[:limit] if limit is not None else todos
+
+    def row_version(self) -> int:
+        return 0
+
+    def search(self, *, q=None, mode="fts", sort=None, limit=None, offset=0, **filters) -> List[DummyTodo]:
+        found = filter_todos(self._todos, text=q, **filters)
+        end = offset + limit if limit is not None else None
+        return found[offset:end]
+
+    def stats(self) -> dict:
+        return compute_stats(self._todos)
+
+    def title_exists(self, title: str) -> bool:
+        return is_duplicate_title(title, self._todos)
 
     def add(self, title: str, description: str | None = None) -> DummyTodo:
         new_id = (max([t.id for t in self._todos]) + 1) if self._todos else 1
@@ -0,0 +1,73 @@
+import pytest
+
+
+@pytest.fixture
+def client(client, store):
+    """Client sobre el Store real con SQLite en memoria."""
+    for i in range(1, 6):
+        store.add(title=f"Tarea {i}", description=f"desc {i}")
+    return client
+
+
+def test_list_without_limit_returns_everything(client):
+    resp = client.get("/api/todos")
+
+    assert resp.status_code == 200
+    assert [t["title"] for t in resp.json()] == [f"Tarea {i}" for i in range(1, 6)]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_paginates_by_cursor_until_exhausted(client):
+    seen: list[int] = []
+    after = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if after is not None:
+            params["after"] = after
+        resp = client.get("/api/todos", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page) <= 2
+        seen.extend(t["id"] for t in page)
+        pages += 1
+        after = resp.headers.get("X-Next-Cursor")
+        if after is None:
+            break
+
+    assert pages == 3
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+def test_list_exact_page_has_no_next_cursor(client):
+    resp = client.get("/api/todos", params={"limit": 5})
+
+    assert len(resp.json()) == 5
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_projects_requested_fields(client):
+    resp = client.get("/api/todos", params={"fields": "title,done", "limit": 2})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body == [
+        {"title": "Tarea 1", "done": False},
+        {"title": "Tarea 2", "done": False},
+    ]
+    # El cursor sale del id aunque no se haya pedido
+    assert resp.headers["X-Next-Cursor"] == "2"
+
+
+def test_list_rejects_unknown_fields(client):
+    resp = client.get("/api/todos", params={"fields": "title,password"})
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "unknown fields: password"
+
+
+def test_list_rejects_limit_above_max(client):
+    resp = client.get("/api/todos", params={"limit": 100000})
+
+    assert resp.status_code == 422
@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 
 from app.main import app, settings
 from app.deps import get_store
+from app.logic import is_duplicate_title
 
 
 class DummyTodo:
@@ -18,7 +19,7 @@ class DummyTodo:
 class FakeStore:
     """Store fake en memoria para no usar la DB real.
 
-    Implementa solo lo que los endpoints necesitan: list() y add().
+    Implementa solo lo que los endpoints necesitan: list(), title_exists() y add().
     Además guarda un registro de llamadas a add() para las aserciones.
     """
 
@@ -26,8 +27,15 @@ class FakeStore:
         self._todos: List[DummyTodo] = initial or []
         self.add_calls: list[dict] = []
 
-    def list(self) -> List[DummyTodo]:
-        return list(self._todos)
+    def list(self, *, after: int | None = None, limit: int | None = None, since: int | None = None) -> List[DummyTodo]:
+        todos = [t for t in self._todos if after is None or t.id > after]
+        return todos[:limit] if limit is not None else todos
+
+    def row_version(self) -> int:
+        return 0
+
+    def title_exists(self, title: str) -> bool:
+        return is_duplicate_title(title, self._todos)
 
     def add(self, title: str, description: str | None = None) -> DummyTodo:
         new_id = (max([t.id for t in self._todos]) + 1) if self._todos else 1
@@ -176,3 +184,33 @@ def test_admin_seed_ok(monkeypatch):
     # Verificamos que nuestro fake fue invocado
     assert called.get("ok") is True
 
+
+def test_admin_reconcile_unauthorized():
+    """/admin/reconcile usa el mismo token que /admin/seed."""
+    settings.SEED_TOKEN = "SECRET"
+
+    with TestClient(app) as c:
+        resp = c.post("/admin/reconcile", headers={"X-Seed-Token": "WRONG"})
+
+    assert resp.status_code == 401
+
+
+def test_admin_reconcile_ok(monkeypatch):
+    """/admin/reconcile con token correcto delega en counters.reconcile."""
+    from app import main as main_module
+
+    calls = []
+
+    def fake_reconcile(db, *, fix=False):
+        calls.append(fix)
+        return {"ok": False, "drift": {"total": {"stored": 1, "actual": 2}}, "fixed": fix}
+
+    settings.SEED_TOKEN = "SECRET"
+    monkeypatch.setattr(main_module, "reconcile", fake_reconcile)
+
+    with TestClient(app) as c:
+        resp = c.post("/admin/reconcile", params={"fix": True}, headers={"X-Seed-Token": "SECRET"})
+
+    assert resp.status_code == 200
+    assert resp.json()["fixed"] is True
+    assert calls == [True]
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app import counters
+from app.deps import Store
+from app.migrations import run_migrations
+from app.models import Base, Todo
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    # Perfil por defecto (sin cola de escritura): la atomicidad sale del UPDATE
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'toggle.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("toggles", [200, 201])
+def test_parallel_toggles_keep_parity(file_engine, toggles):
+    make_session = sessionmaker(bind=file_engine, autocommit=False, autoflush=False)
+    with make_session() as db:
+        todo_id = Store(db).add(title="Compartido").id
+
+    threads_count = 8
+    per_thread = [toggles // threads_count + (1 if n < toggles % threads_count else 0) for n in range(threads_count)]
+    barrier = threading.Barrier(threads_count)
+    errors: list[Exception] = []
+
+    def worker(count: int) -> None:
+        barrier.wait()
+        try:
+            with make_session() as db:
+                store = Store(db)
+                for _ in range(count):
+                    store.toggle(todo_id)
+        except Exception as e:  # pragma: no cover - lo reporta el assert
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(count,)) for count in per_thread]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with make_session() as db:
+        assert db.get(Todo, todo_id).done is (toggles % 2 == 1)
+        assert counters.reconcile(db)["ok"] is True
+
+
+def test_toggle_returns_updated_row(store):
+    todo = store.add(title="Pagar luz", description="antes del 10")
+
+    row = store.toggle(todo.id)
+
+    assert (row.id, row.title, row.description, row.done) == (todo.id, "Pagar luz", "antes del 10", True)
+    assert store.toggle(todo.id).done is False
+
+
+def test_toggle_treats_null_done_as_pending(store, db_session):
+    todo = store.add(title="Sin estado")
+    db_session.execute(update(Todo).where(Todo.id == todo.id).values(done=None))
+    db_session.commit()
+
+    assert store.toggle(todo.id).done is True
+
+
+def test_toggle_without_returning_support(store, db_session, monkeypatch):
+    todo = store.add(title="Comprar pan")
+    monkeypatch.setattr(db_session.get_bind().dialect, "update_returning", False)
+
+    assert store.toggle(todo.id).done is True
+    assert store.toggle(999) is None
+    assert store.stats() == {"total": 1, "done": 1, "pending": 0}